@@ -1,28 +1,43 @@
 from __future__ import annotations
 
-import pkgutil
+import os
+import time
+import zlib
 from collections.abc import Generator, Iterable
 from functools import lru_cache
-from importlib import import_module, reload
+from importlib import import_module
 from pathlib import Path
 from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
 from django.apps import AppConfig, apps
 from django.conf import settings
-from django.core.checks import Error, Tags, register
+from django.core.checks import Error
+from django.core.exceptions import ImproperlyConfigured
 from django.core.signals import setting_changed
-from django.db.migrations.loader import MigrationLoader
 from django.dispatch import receiver
 from django.utils.functional import cached_property
 
+if TYPE_CHECKING:
+    from django_linear_migrations.snapshot import GraphSummary
+
+# This module is imported by every process using Django, so heavier imports,
+# like the migration loader, are deferred until they are needed.
+
 
 class DjangoLinearMigrationsAppConfig(AppConfig):
     name = "django_linear_migrations"
     verbose_name = "django-linear-migrations"
 
     def ready(self) -> None:
+        from django.core.checks import Tags, register
+
         register(Tags.models)(check_max_migration_files)
 
+        from django_linear_migrations.prefork import maybe_install_fork_hook
+
+        maybe_install_fork_hook()
+
 
 @lru_cache(maxsize=1)
 def get_first_party_app_labels() -> set[str] | None:
@@ -53,11 +68,44 @@ def first_party_app_configs() -> Generator[AppConfig]:
             yield app_config
 
 
+def parse_shard(value: str) -> tuple[int, int]:
+    index, sep, count = value.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = (0, 0)
+    if not sep or not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"Invalid shard {value!r}, should be in the form 'i/n'.")
+    return shard
+
+
+def get_shard() -> tuple[int, int] | None:
+    value = getattr(settings, "LINEAR_MIGRATIONS_SHARD", None) or os.environ.get(
+        "LINEAR_MIGRATIONS_SHARD"
+    )
+    if not value:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise ImproperlyConfigured(str(exc)) from None
+
+
+def in_shard(app_label: str, shard: tuple[int, int] | None) -> bool:
+    # A stable hash, so apps stay in the same shard as others are added.
+    if shard is None:
+        return True
+    index, count = shard
+    return zlib.crc32(app_label.encode()) % count == index - 1
+
+
 class MigrationDetails:
     migrations_module_name: str | None
     migrations_module: ModuleType | None
 
-    def __init__(self, app_label: str, do_reload: bool = False) -> None:
+    def __init__(self, app_label: str) -> None:
+        from django.db.migrations.loader import MigrationLoader
+
         self.app_label = app_label
 
         # Some logic duplicated from MigrationLoader.load_disk, but avoiding
@@ -74,9 +122,6 @@ class MigrationDetails:
             except ModuleNotFoundError:
                 # Unmigrated app
                 self.migrations_module = None
-            else:
-                if do_reload:
-                    reload(self.migrations_module)
 
     @property
     def has_migrations(self) -> bool:
@@ -98,52 +143,184 @@ class MigrationDetails:
 
     @cached_property
     def names(self) -> set[str]:
+        from django_linear_migrations.discovery import find_module_names
+
         assert self.migrations_module is not None
-        path = self.migrations_module.__path__
         return {
             name
-            for _, name, is_pkg in pkgutil.iter_modules(path)
-            if not is_pkg and name[0] not in "_~"
+            for name in find_module_names(self.migrations_module)
+            if name[0] not in "_~"
         }
 
 
-def get_graph_plan(
-    loader: MigrationLoader, app_labels: Iterable[str] | None = None
-) -> list[tuple[str, str]]:
-    nodes = loader.graph.leaf_nodes()
-    if app_labels:
-        nodes = [
-            (app_label, name)
-            for app_label, name in loader.graph.leaf_nodes()
-            if app_label in app_labels
-        ]
-    plan: list[tuple[str, str]] = loader.graph._generate_plan(nodes, at_end=True)
-    return plan
+class LinearMigrationsError(Error):
+    # Error with structured details, for machine-readable output.
+    def __init__(
+        self,
+        msg: str,
+        hint: str | None = None,
+        obj: object = None,
+        id: str | None = None,
+        *,
+        app_label: str | None = None,
+        max_migration_name: str | None = None,
+        real_max_migration_name: str | None = None,
+        conflicts: dict[str, list[str]] | None = None,
+    ) -> None:
+        super().__init__(msg, hint=hint, obj=obj, id=id)
+        self.app_label = app_label
+        self.max_migration_name = max_migration_name
+        self.real_max_migration_name = real_max_migration_name
+        self.conflicts = conflicts
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LinearMigrationsError:
+        return cls(
+            data["msg"],
+            hint=data["hint"],
+            id=data["id"],
+            app_label=data["app_label"],
+            max_migration_name=data["max_migration_name"],
+            real_max_migration_name=data["real_max_migration_name"],
+            conflicts=data["conflicts"],
+        )
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "id": self.id,
+            "app_label": self.app_label,
+            "msg": self.msg,
+            "hint": self.hint,
+            "max_migration_name": self.max_migration_name,
+            "real_max_migration_name": self.real_max_migration_name,
+            "conflicts": self.conflicts,
+        }
+
+
+def get_graph_summary(app_labels: list[str], stats: dict[str, float]) -> GraphSummary:
+    from django.db.migrations.loader import MigrationLoader
+
+    from django_linear_migrations.graph import CompactGraph
+    from django_linear_migrations.snapshot import (
+        GraphSummary,
+        get_snapshot_path,
+        load_snapshot,
+    )
+
+    snapshot_path = get_snapshot_path()
+    if snapshot_path is not None:
+        summary = load_snapshot(snapshot_path, app_labels)
+        stats["snapshot_used"] = float(summary is not None)
+        if summary is not None:
+            return summary
+
+    from django_linear_migrations.chunked import chunked_summary, get_memory_budget
+
+    budget = get_memory_budget()
+    if budget is not None:
+        summary = chunked_summary(app_labels, budget, stats)
+        stats["chunked"] = float(summary is not None)
+        if summary is not None:
+            return summary
+
+    migration_loader = MigrationLoader(None, ignore_no_migrations=True)
+    graph = CompactGraph.from_loader(migration_loader)
+    return GraphSummary.from_graph(graph, app_labels)
+
+
+# A result shared from another process, such as by the pytest plugin, used
+# instead of running the checks.
+_cached_result: list[LinearMigrationsError] | None = None
+
+
+def get_cached_result() -> list[LinearMigrationsError] | None:
+    return _cached_result
+
+
+def set_cached_result(errors: list[LinearMigrationsError] | None) -> None:
+    global _cached_result
+    _cached_result = errors
+
+
+@receiver(setting_changed)
+def reset_cached_result(*, setting: str, **kwargs: object) -> None:
+    if setting in (
+        "FIRST_PARTY_APPS",
+        "INSTALLED_APPS",
+        "MIGRATION_MODULES",
+    ) or setting.startswith("LINEAR_MIGRATIONS_"):
+        set_cached_result(None)
 
 
 def check_max_migration_files(
-    *, app_configs: Iterable[AppConfig] | None = None, **kwargs: object
-) -> list[Error]:
-    errors = []
+    *,
+    app_configs: Iterable[AppConfig] | None = None,
+    stats: dict[str, float] | None = None,
+    shard: tuple[int, int] | None = None,
+    full: bool = False,
+    **kwargs: object,
+) -> list[LinearMigrationsError]:
+    from django_linear_migrations.storage import get_max_migration_store
+
+    if (
+        _cached_result is not None
+        and app_configs is None
+        and shard is None
+        and not full
+    ):
+        return list(_cached_result)
+
+    errors: list[LinearMigrationsError] = []
     if app_configs is not None:
         app_config_set = set(app_configs)
     else:
         app_config_set = set()
+    if stats is None:
+        stats = {}
+    if shard is None:
+        shard = get_shard()
 
-    migration_loader = MigrationLoader(None, ignore_no_migrations=True)
     app_labels = [a.label for a in first_party_app_configs()]
+    if not full:
+        from django_linear_migrations.manifest import check_manifest, get_manifest_path
+
+        manifest_path = get_manifest_path()
+        if manifest_path is not None:
+            # Production mode, only checking nothing changed since the build.
+            stats["manifest_used"] = 1.0
+            return check_manifest(manifest_path, app_labels)
+
+        from django_linear_migrations.stamp import get_stamp_path, stamp_matches
+
+        stamp_path = get_stamp_path()
+        if stamp_path is not None:
+            # Skip the checks if the migration files look unchanged since
+            # they were last verified.
+            matched = stamp_matches(stamp_path)
+            stats["stamp_matched"] = float(matched)
+            if matched:
+                return []
+
+    start = time.perf_counter()
+    summary = get_graph_summary(app_labels, stats)
+    stats["graph_seconds"] = time.perf_counter() - start
+    stats["migrations"] = summary.migrations
+    stats["apps_checked"] = 0
     conflicts = {
         app_label: names
-        for app_label, names in migration_loader.detect_conflicts().items()
+        for app_label, names in summary.conflicts.items()
         if app_label in app_labels
     }
     if conflicts:
+        # Only report the global conflict check from the first shard.
+        if shard is not None and shard[0] != 1:
+            return errors
         conflict_msg = "".join(
             f"\n* {app_label}: {', '.join(sorted(names))}"
             for app_label, names in conflicts.items()
         )
         errors.append(
-            Error(
+            LinearMigrationsError(
                 id="dlm.E005",
                 msg=(
                     "Conflicting migrations detected - multiple leaf nodes "
@@ -153,85 +330,97 @@ def check_max_migration_files(
                     "Fix the conflict, e.g. with "
                     + "'./manage.py makemigrations --merge --skip-checks'."
                 ),
+                conflicts=conflicts,
             )
         )
         return errors
 
-    graph_plan = get_graph_plan(loader=migration_loader, app_labels=app_labels)
+    max_migrations = summary.max_migrations
+    store = get_max_migration_store()
     for app_config in first_party_app_configs():
         # When only checking certain apps, skip the others
         if app_configs is not None and app_config not in app_config_set:
             continue
+        if not in_shard(app_config.label, shard):
+            continue
         app_label = app_config.label
         migration_details = MigrationDetails(app_label)
 
         if not migration_details.has_migrations:
             continue
+        stats["apps_checked"] += 1
 
-        max_migration_txt = migration_details.dir / "max_migration.txt"
-        if not max_migration_txt.exists():
+        location = store.describe(app_label)
+        max_migration_txt_lines = store.read_lines(app_label, migration_details.dir)
+        if max_migration_txt_lines is None:
             errors.append(
-                Error(
+                LinearMigrationsError(
                     id="dlm.E001",
-                    msg=f"{app_label}'s max_migration.txt does not exist.",
+                    msg=f"{app_label}'s {location} does not exist.",
                     hint=(
                         "If you just installed django-linear-migrations, run"
                         + " 'python manage.py create_max_migration_files'."
                         + " Otherwise, check how it has gone missing."
                     ),
+                    app_label=app_label,
                 )
             )
             continue
 
-        max_migration_txt_lines = max_migration_txt.read_text().strip().splitlines()
         if len(max_migration_txt_lines) > 1:
             errors.append(
-                Error(
+                LinearMigrationsError(
                     id="dlm.E002",
-                    msg=f"{app_label}'s max_migration.txt contains multiple lines.",
+                    msg=f"{app_label}'s {location} contains multiple lines.",
                     hint=(
                         "This may be the result of a git merge. Fix the file"
                         + " to contain only the name of the latest migration,"
                         + " or maybe use the 'rebase-migration' command."
                     ),
+                    app_label=app_label,
                 )
             )
             continue
 
-        max_migration_name = max_migration_txt_lines[0]
+        max_migration_name = (
+            max_migration_txt_lines[0] if max_migration_txt_lines else ""
+        )
         if max_migration_name not in migration_details.names:
             errors.append(
-                Error(
+                LinearMigrationsError(
                     id="dlm.E003",
                     msg=(
-                        f"{app_label}'s max_migration.txt points to"
+                        f"{app_label}'s {location} points to"
                         + f" non-existent migration {max_migration_name!r}."
                     ),
                     hint=(
-                        "Edit the max_migration.txt to contain the latest"
+                        f"Edit the {location} to contain the latest"
                         + " migration's name."
                     ),
+                    app_label=app_label,
+                    max_migration_name=max_migration_name,
                 )
             )
             continue
 
-        real_max_migration_name = [
-            name for gp_app_label, name in graph_plan if gp_app_label == app_label
-        ][-1]
+        real_max_migration_name = max_migrations[app_label]
         if max_migration_name != real_max_migration_name:
             errors.append(
-                Error(
+                LinearMigrationsError(
                     id="dlm.E004",
                     msg=(
-                        f"{app_label}'s max_migration.txt contains"
+                        f"{app_label}'s {location} contains"
                         + f" {max_migration_name!r}, but the latest migration"
                         + f" is {real_max_migration_name!r}."
                     ),
                     hint=(
-                        "Edit max_migration.txt to contain"
+                        f"Edit {location} to contain"
                         + f" {real_max_migration_name!r} or rearrange the"
                         + " migrations into the correct order."
                     ),
+                    app_label=app_label,
+                    max_migration_name=max_migration_name,
+                    real_max_migration_name=real_max_migration_name,
                 )
             )
 
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import sys
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from django_linear_migrations.apps import MigrationDetails
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.snapshot import GraphSummary
+from django_linear_migrations.static import StaticMigration, load_static_migrations
+
+# Roughly how many bytes a MigrationLoader holds per byte of migration
+# source, measured on Django’s contrib apps.
+LOADER_BYTES_PER_SOURCE_BYTE = 8
+
+
+def get_memory_budget() -> int | None:
+    # The budget in bytes, configured in megabytes.
+    value = getattr(
+        settings, "LINEAR_MIGRATIONS_MEMORY_BUDGET", None
+    ) or os.environ.get("LINEAR_MIGRATIONS_MEMORY_BUDGET")
+    if not value:
+        return None
+    try:
+        megabytes = int(value)
+    except ValueError:
+        megabytes = 0
+    if megabytes < 1:
+        raise ImproperlyConfigured(
+            f"Invalid memory budget {value!r}, should be a positive number of"
+            + " megabytes."
+        )
+    return megabytes * 1024 * 1024
+
+
+class AppMigrations:
+    __slots__ = ("app_label", "details", "names", "source_size")
+
+    def __init__(self, details: MigrationDetails) -> None:
+        self.app_label = details.app_label
+        self.details = details
+        self.names = sorted(details.names)
+        source_size = 0
+        for name in self.names:
+            try:
+                source_size += (details.dir / f"{name}.py").stat().st_size
+            except OSError:
+                # Sourceless migration, or in a zip file
+                pass
+        self.source_size = source_size
+
+    @property
+    def memory_estimate(self) -> int:
+        return self.source_size * LOADER_BYTES_PER_SOURCE_BYTE
+
+    def load(self) -> list[StaticMigration]:
+        # Statically parse the migrations, or import them if that's not
+        # possible.
+        migrations_dir = self.details.dir
+        if all((migrations_dir / f"{name}.py").exists() for name in self.names):
+            try:
+                migrations = load_static_migrations(
+                    self.app_label, migrations_dir, self.names
+                )
+            except ValueError:
+                pass
+            else:
+                if not any(migration.dynamic for migration in migrations):
+                    return migrations
+
+        migrations_module_name = self.details.migrations_module_name
+        assert migrations_module_name is not None
+        migrations = []
+        for name in self.names:
+            module_name = f"{migrations_module_name}.{name}"
+            already_imported = module_name in sys.modules
+            module = import_module(module_name)
+            migration_class = module.Migration
+            migrations.append(
+                StaticMigration(
+                    self.app_label,
+                    name,
+                    dependencies=list(migration_class.dependencies),
+                    replaces=list(migration_class.replaces),
+                    run_before=list(migration_class.run_before),
+                )
+            )
+            if not already_imported:
+                # Drop the module, so nothing references it once its
+                # attributes are read, and a later MigrationLoader imports
+                # it afresh, as if this hadn't.
+                del sys.modules[module_name]
+                package = sys.modules.get(migrations_module_name)
+                if getattr(package, name, None) is module:
+                    delattr(package, name)
+            del module, migration_class
+        return migrations
+
+
+def find_app_migrations() -> list[AppMigrations]:
+    result = []
+    for app_config in apps.get_app_configs():
+        details = MigrationDetails(app_config.label)
+        if details.has_migrations:
+            result.append(AppMigrations(details))
+    return result
+
+
+def chunked_summary(
+    app_labels: list[str], budget: int, stats: dict[str, float]
+) -> GraphSummary | None:
+    """
+    Summarize the migration graph one app at a time, parsing each app’s
+    migrations statically and keeping only its leaves. An app’s leaves only
+    depend on its own migrations, since leaves are nodes without children in
+    their own app, so no other graph state needs keeping between apps.
+    Only the given first-party apps are summarized, since the checks need
+    no other apps’ leaves.
+
+    Returns None if the whole migration loader would fit in the budget. The
+    budget only chooses between the loader and this, rather than being a
+    limit on memory use.
+    """
+    app_migrations = find_app_migrations()
+    # Estimate for all apps, since the loader would load them all.
+    estimate = sum(app.memory_estimate for app in app_migrations)
+    stats["memory_estimate"] = float(estimate)
+    if estimate <= budget:
+        return None
+
+    first_party = set(app_labels)
+    chunks = [app for app in app_migrations if app.app_label in first_party]
+    leaves: dict[str, list[str]] = {}
+    max_migrations: dict[str, str] = {}
+    migration_count = 0
+    for app in chunks:
+        graph = CompactGraph.from_static(app.load())
+        migration_count += len(graph)
+        app_leaves = [name for _, name in graph.leaf_nodes()]
+        leaves[app.app_label] = app_leaves
+        if len(app_leaves) == 1:
+            # With a single leaf, the rest of the app's migrations precede
+            # it in the plan.
+            max_migrations[app.app_label] = app_leaves[0]
+    stats["chunks"] = float(len(chunks))
+
+    return GraphSummary(
+        leaves=leaves,
+        conflicts={
+            app_label: names for app_label, names in leaves.items() if len(names) > 1
+        },
+        max_migrations=max_migrations,
+        migrations=migration_count,
+    )
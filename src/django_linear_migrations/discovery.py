@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import time
+from importlib.machinery import all_suffixes
+from types import ModuleType
+
+# Longest first, so e.g. '.cpython-313-x86_64-linux-gnu.so' wins over '.so'.
+_suffixes = sorted(all_suffixes(), key=len, reverse=True)
+
+# Directory listings by path, with the modification time they were made at.
+_listing_cache: dict[str, tuple[int, dict[str, str]]] = {}
+
+# Directories modified this recently may change again within the same
+# timestamp tick, so their listings aren't cached, as in Git's "racy
+# timestamp" handling.
+RACY_NANOSECONDS = 2_000_000_000
+
+
+def module_name(filename: str) -> tuple[str, str] | None:
+    for suffix in _suffixes:
+        if filename.endswith(suffix):
+            name = filename[: -len(suffix)]
+            if name and "." not in name:
+                return name, suffix
+            return None
+    return None
+
+
+def scan_directory(path: str) -> dict[str, str]:
+    """
+    Map the names of the modules directly in a directory to their file
+    suffixes, preferring source files. Listings are cached until the
+    directory's modification time changes.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _listing_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    scan_start = time.time_ns()
+    modules: dict[str, str] = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                continue
+            parsed = module_name(entry.name)
+            if parsed is None:
+                continue
+            name, suffix = parsed
+            if modules.get(name) != ".py":
+                modules[name] = suffix
+
+    if scan_start - mtime > RACY_NANOSECONDS:
+        _listing_cache[path] = (mtime, modules)
+    return modules
+
+
+def find_module_names(package: ModuleType) -> set[str]:
+    """
+    Find the names of the non-package modules in a package, like
+    pkgutil.iter_modules(), with a single cached listing of each directory
+    for packages on the filesystem, and importlib.resources for others,
+    such as packages in zip files.
+    """
+    paths = list(package.__path__)
+    if paths and all(os.path.isdir(path) for path in paths):
+        names: set[str] = set()
+        for path in paths:
+            names.update(scan_directory(path))
+        return names
+
+    from importlib.resources import files
+
+    try:
+        resources = list(files(package).iterdir())
+    except (TypeError, ValueError, OSError):  # pragma: no cover
+        # No resource reader, e.g. some frozen packages
+        import pkgutil
+
+        return {name for _, name, is_pkg in pkgutil.iter_modules(paths) if not is_pkg}
+
+    names = set()
+    for resource in resources:
+        if not resource.is_file():
+            continue
+        parsed = module_name(resource.name)
+        if parsed is not None:
+            names.add(parsed[0])
+    return names
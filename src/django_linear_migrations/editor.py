@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import ast
+import re
+from array import array
+
+_newline_re = re.compile(rb"\r\n|\r|\n")
+
+
+class SourceEditor:
+    """
+    Applies non-overlapping replacements of AST nodes to Python source in a
+    single pass, locating nodes with a precomputed table of line offsets.
+    """
+
+    def __init__(self, source: bytes) -> None:
+        self.source = source
+        # Byte offset of the start of each line. AST column offsets count
+        # UTF-8 bytes, so working in bytes keeps them valid for non-ASCII
+        # source.
+        self.line_offsets = array("q", [0])
+        self.line_offsets.extend(match.end() for match in _newline_re.finditer(source))
+        self.edits: list[tuple[int, int, bytes]] = []
+
+    def offset(self, lineno: int, col_offset: int) -> int:
+        return self.line_offsets[lineno - 1] + col_offset
+
+    def span(self, node: ast.expr) -> tuple[int, int]:
+        assert node.end_lineno is not None
+        assert node.end_col_offset is not None
+        return (
+            self.offset(node.lineno, node.col_offset),
+            self.offset(node.end_lineno, node.end_col_offset),
+        )
+
+    def segment(self, node: ast.expr) -> bytes:
+        start, end = self.span(node)
+        return self.source[start:end]
+
+    def replace(self, node: ast.expr, text: str | bytes) -> None:
+        if isinstance(text, str):
+            text = text.encode()
+        start, end = self.span(node)
+        self.edits.append((start, end, text))
+
+    def apply(self) -> bytes:
+        edits = sorted(self.edits)
+        parts = []
+        position = 0
+        for start, end, text in edits:
+            if start < position:
+                raise ValueError("Cannot apply overlapping edits.")
+            parts.append(self.source[position:start])
+            parts.append(text)
+            position = end
+        parts.append(self.source[position:])
+        return b"".join(parts)
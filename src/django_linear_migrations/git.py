@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+
+
+class GitError(Exception):
+    pass
+
+
+def get_repo_dir(path: Path) -> Path:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=path,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError) as exc:
+        raise GitError(f"Could not find a git repository containing {path}.") from exc
+    return Path(result.stdout.strip())
+
+
+class GitObjectReader:
+    """
+    Reads files at given revisions through a single 'git cat-file --batch'
+    process, rather than checking them out or running git once per file.
+    """
+
+    def __init__(self, repo_dir: Path) -> None:
+        self.repo_dir = repo_dir
+        self._process: subprocess.Popen[bytes] | None = None
+
+    def __enter__(self) -> GitObjectReader:
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._process is not None
+        assert self._process.stdin is not None
+        assert self._process.stdout is not None
+        self._process.stdin.close()
+        self._process.stdout.close()
+        self._process.wait()
+        self._process = None
+
+    def resolve(self, revision: str) -> str:
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"],
+                cwd=self.repo_dir,
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as exc:
+            raise GitError(f"Unknown revision {revision!r}.") from exc
+        return result.stdout.strip()
+
+    def merge_base(self, revision: str, other: str) -> str | None:
+        # The best common ancestor, or None for unrelated histories.
+        result = subprocess.run(
+            ["git", "merge-base", revision, other],
+            cwd=self.repo_dir,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip()
+
+    def list_dirs(
+        self, revision: str, dirs: list[PurePosixPath]
+    ) -> dict[PurePosixPath, list[str]]:
+        # One 'git ls-tree' call lists the direct contents of every directory.
+        files: dict[PurePosixPath, list[str]] = {path: [] for path in dirs}
+        if not dirs:
+            return files
+        result = subprocess.run(
+            [
+                "git",
+                "ls-tree",
+                "--name-only",
+                "-z",
+                revision,
+                "--",
+                *(f"{path}/" for path in dirs),
+            ],
+            cwd=self.repo_dir,
+            capture_output=True,
+            check=True,
+        )
+        for entry in result.stdout.decode().split("\0"):
+            if not entry:
+                continue
+            path = PurePosixPath(entry)
+            if path.parent in files:
+                files[path.parent].append(path.name)
+        return files
+
+    def read(self, revision: str, path: PurePosixPath) -> bytes | None:
+        process = self._process
+        assert process is not None, "Use GitObjectReader as a context manager."
+        assert process.stdin is not None
+        assert process.stdout is not None
+        process.stdin.write(f"{revision}:{path}\n".encode())
+        process.stdin.flush()
+        header = process.stdout.readline()
+        if not header or header.endswith(b" missing\n"):
+            return None
+        _oid, object_type, size = header.split()
+        content = process.stdout.read(int(size))
+        # Trailing newline after each object
+        process.stdout.read(1)
+        if object_type != b"blob":
+            return None
+        return content
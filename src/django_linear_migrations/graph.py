@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from django_linear_migrations.static import StaticMigration
+
+if TYPE_CHECKING:
+    from django.db.migrations.loader import MigrationLoader
+
+Key = tuple[str, str]
+
+
+class CompactGraph:
+    """
+    A compact, read-only migration graph, for computing orderings and
+    conflicts.
+
+    Compared to Django’s MigrationGraph, which uses a Node object with parent
+    and child sets per migration, this stores app labels once, numbers nodes
+    with integer IDs, and stores adjacency lists in flat integer arrays. Node
+    IDs are assigned in sorted key order, so sorting IDs matches Django’s
+    sorting of nodes.
+    """
+
+    def __init__(self, keys: Iterable[Key], edges: Iterable[tuple[Key, Key]]) -> None:
+        # edges are (child, parent) pairs, ignored if either node is missing.
+        sorted_keys = sorted(set(keys))
+        self.app_labels: list[str] = sorted({app_label for app_label, _ in sorted_keys})
+        app_ids = {app_label: i for i, app_label in enumerate(self.app_labels)}
+        self.node_apps = array(
+            "i", (app_ids[app_label] for app_label, _ in sorted_keys)
+        )
+        self.node_names: list[str] = [sys.intern(name) for _, name in sorted_keys]
+        self.node_ids: dict[Key, int] = {key: i for i, key in enumerate(sorted_keys)}
+
+        size = len(sorted_keys)
+        parent_lists: list[list[int]] = [[] for _ in range(size)]
+        child_lists: list[list[int]] = [[] for _ in range(size)]
+        for child, parent in edges:
+            child_id = self.node_ids.get(child)
+            parent_id = self.node_ids.get(parent)
+            if child_id is None or parent_id is None:
+                continue
+            parent_lists[child_id].append(parent_id)
+            child_lists[parent_id].append(child_id)
+
+        self.parent_offsets, self.parent_ids = _pack(parent_lists)
+        self.child_offsets, self.child_ids = _pack(child_lists)
+
+    @classmethod
+    def from_loader(cls, loader: MigrationLoader) -> CompactGraph:
+        node_map = loader.graph.node_map
+        return cls(
+            node_map.keys(),
+            (
+                (key, parent.key)
+                for key, node in node_map.items()
+                for parent in node.parents
+            ),
+        )
+
+    @classmethod
+    def from_static(cls, migrations: Iterable[StaticMigration]) -> CompactGraph:
+        # Replicate MigrationLoader.build_graph() for a loader without a
+        # database connection, so all replacing migrations are used.
+        by_key = {migration.key: migration for migration in migrations}
+        parents: dict[Key, set[Key]] = {key: set() for key in by_key}
+
+        # Internal dependencies first, so __first__ and __latest__ can be
+        # resolved.
+        for key, migration in by_key.items():
+            for parent in migration.dependencies:
+                if parent[0] == key[0] and parent[1] != "__first__":
+                    parents[key].add(parent)
+
+        roots: dict[str, list[str]] = {}
+        leaves: dict[str, list[str]] = {}
+        has_children: set[Key] = set()
+        for key_parents in parents.values():
+            has_children.update(key_parents)
+        for key in sorted(parents):
+            app_label, name = key
+            if not any(parent[0] == app_label for parent in parents[key]):
+                roots.setdefault(app_label, []).append(name)
+            if key not in has_children:
+                leaves.setdefault(app_label, []).append(name)
+
+        def resolve(target: Key, current_app: str) -> Key | None:
+            if target[1] == "__first__" or target[1] == "__latest__":
+                if target in parents or target[0] == current_app:
+                    return None
+                candidates = (roots if target[1] == "__first__" else leaves).get(
+                    target[0]
+                )
+                if not candidates:
+                    return None
+                return (target[0], candidates[0])
+            return target
+
+        for key, migration in by_key.items():
+            for parent in migration.dependencies:
+                if parent[0] == key[0]:
+                    continue
+                resolved = resolve(parent, key[0])
+                if resolved is not None:
+                    parents[key].add(resolved)
+            for child in migration.run_before:
+                resolved = resolve(child, key[0])
+                if resolved is not None:
+                    parents.setdefault(resolved, set()).add(key)
+
+        replacements = [
+            migration for migration in by_key.values() if migration.replaces
+        ]
+        if replacements:
+            children: dict[Key, set[Key]] = {}
+            for key, key_parents in parents.items():
+                for parent in key_parents:
+                    children.setdefault(parent, set()).add(key)
+            for migration in replacements:
+                _remove_replaced_nodes(
+                    parents, children, migration.key, migration.replaces
+                )
+
+        return cls(
+            by_key.keys() & parents.keys(),
+            (
+                (key, parent)
+                for key, key_parents in parents.items()
+                for parent in key_parents
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.node_names)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.node_ids
+
+    def key(self, node_id: int) -> Key:
+        return (self.app_labels[self.node_apps[node_id]], self.node_names[node_id])
+
+    def parents(self, node_id: int) -> array[int]:
+        return self.parent_ids[
+            self.parent_offsets[node_id] : self.parent_offsets[node_id + 1]
+        ]
+
+    def children(self, node_id: int) -> array[int]:
+        return self.child_ids[
+            self.child_offsets[node_id] : self.child_offsets[node_id + 1]
+        ]
+
+    def leaf_ids(self) -> list[int]:
+        # Like MigrationGraph.leaf_nodes(), nodes without children in their
+        # own app.
+        node_apps = self.node_apps
+        child_offsets = self.child_offsets
+        child_ids = self.child_ids
+        leaves = []
+        for node_id, app_id in enumerate(node_apps):
+            for i in range(child_offsets[node_id], child_offsets[node_id + 1]):
+                if node_apps[child_ids[i]] == app_id:
+                    break
+            else:
+                leaves.append(node_id)
+        return leaves
+
+    def leaf_nodes(self) -> list[Key]:
+        return [self.key(node_id) for node_id in self.leaf_ids()]
+
+    def detect_conflicts(self) -> dict[str, list[str]]:
+        # Like MigrationLoader.detect_conflicts().
+        seen: dict[int, list[str]] = {}
+        for node_id in self.leaf_ids():
+            seen.setdefault(self.node_apps[node_id], []).append(
+                self.node_names[node_id]
+            )
+        return {
+            self.app_labels[app_id]: names
+            for app_id, names in seen.items()
+            if len(names) > 1
+        }
+
+    def plan_ids(self, app_labels: Iterable[str] | None = None) -> list[int]:
+        # Like MigrationGraph._generate_plan() with at_end=True, on the leaf
+        # nodes, or those of the given apps.
+        leaves = self.leaf_ids()
+        if app_labels:
+            app_label_set = set(app_labels)
+            leaves = [
+                node_id
+                for node_id in leaves
+                if self.app_labels[self.node_apps[node_id]] in app_label_set
+            ]
+
+        parent_offsets = self.parent_offsets
+        parent_ids = self.parent_ids
+        # 0 = unvisited, 1 = expanded, 2 = added to plan
+        state = bytearray(len(self))
+        plan = []
+        for leaf in leaves:
+            stack = [(leaf, False)]
+            while stack:
+                node_id, processed = stack.pop()
+                if state[node_id] == 2:
+                    continue
+                if processed:
+                    state[node_id] = 2
+                    plan.append(node_id)
+                elif state[node_id] == 0:
+                    state[node_id] = 1
+                    stack.append((node_id, True))
+                    stack.extend(
+                        (parent_ids[i], False)
+                        for i in range(
+                            parent_offsets[node_id], parent_offsets[node_id + 1]
+                        )
+                    )
+        return plan
+
+    def plan(self, app_labels: Iterable[str] | None = None) -> list[Key]:
+        return [self.key(node_id) for node_id in self.plan_ids(app_labels)]
+
+    def max_migrations(self, app_labels: Iterable[str] | None = None) -> dict[str, str]:
+        # The last migration of each app in the plan.
+        result = {}
+        for node_id in self.plan_ids(app_labels):
+            result[self.app_labels[self.node_apps[node_id]]] = self.node_names[node_id]
+        return result
+
+
+def _pack(lists: list[list[int]]) -> tuple[array[int], array[int]]:
+    offsets = array("i", [0])
+    ids = array("i")
+    for values in lists:
+        ids.extend(sorted(values))
+        offsets.append(len(ids))
+    return offsets, ids
+
+
+def _remove_replaced_nodes(
+    parents: dict[Key, set[Key]],
+    children: dict[Key, set[Key]],
+    replacement: Key,
+    replaced: Iterable[Key],
+) -> None:
+    # Like MigrationGraph.remove_replaced_nodes().
+    if replacement not in parents:
+        return
+    replaced_set = set(replaced)
+    for replaced_key in replaced_set:
+        # The replaced node may be missing, if it was skipped or deleted, but
+        # dependencies on it still need remapping.
+        replaced_parents = parents.pop(replaced_key, set())
+        for child in children.pop(replaced_key, set()):
+            child_parents = parents.get(child)
+            if child_parents is None:
+                continue
+            child_parents.discard(replaced_key)
+            if child not in replaced_set:
+                child_parents.add(replacement)
+                children.setdefault(replacement, set()).add(child)
+        for parent in replaced_parents:
+            parent_children = children.get(parent)
+            if parent_children is not None:
+                parent_children.discard(replaced_key)
+            if parent not in replaced_set:
+                parents[replacement].add(parent)
+                children.setdefault(parent, set()).add(replacement)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.storage import get_lock_file_path
+
+if sys.platform != "win32":
+    import fcntl
+
+
+def get_write_lock_path() -> Path:
+    # Key by the project's lock file, or its first-party apps, so processes
+    # for the same project share a lock, without creating files in it.
+    sha = hashlib.sha256()
+    lock_file_path = get_lock_file_path()
+    if lock_file_path is not None:
+        sha.update(str(lock_file_path.resolve()).encode())
+    else:
+        for path in sorted(app_config.path for app_config in first_party_app_configs()):
+            sha.update(path.encode() + b"\0")
+    return (
+        Path(tempfile.gettempdir())
+        / f"django-linear-migrations-{sha.hexdigest()[:16]}.lock"
+    )
+
+
+@contextmanager
+def max_migration_write_lock() -> Generator[None]:
+    """
+    Hold an exclusive lock while reading the migration graph and writing max
+    migrations, so parallel processes don't overwrite each other's changes.
+    A no-op where fcntl is unavailable.
+    """
+    if sys.platform == "win32":  # pragma: no cover
+        # fcntl is unavailable
+        yield
+        return
+
+    fd = os.open(get_write_lock_path(), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
@@ -1,20 +1,55 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import argparse
+import sys
+from collections import defaultdict
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
-from typing import Any
+from pathlib import Path
+from typing import Any, NamedTuple
 
+from django.apps import AppConfig, apps
+from django.core.management import BaseCommand
 from django.db.migrations.writer import MigrationWriter
 
+from django_linear_migrations.apps import parse_shard
+
+
+def get_app_configs(command: BaseCommand, app_labels: Iterable[str]) -> list[AppConfig]:
+    # Copied check from makemigrations: report every unknown label, then
+    # exit.
+    app_configs = []
+    has_bad_labels = False
+    for app_label in app_labels:
+        try:
+            app_configs.append(apps.get_app_config(app_label))
+        except LookupError as err:
+            command.stderr.write(str(err))
+            has_bad_labels = True
+    if has_bad_labels:
+        sys.exit(2)
+    return app_configs
+
+
+class WrittenMigration(NamedTuple):
+    name: str
+    migrations_dir: Path
+
 
 @contextmanager
-def spy_on_migration_writers() -> Generator[dict[str, str]]:
-    written_migrations = {}
+def spy_on_migration_writers() -> Generator[dict[str, list[WrittenMigration]]]:
+    # Mapping of app labels to the migrations written for them, in order.
+    written_migrations: dict[str, list[WrittenMigration]] = defaultdict(list)
 
     orig_as_string = MigrationWriter.as_string
 
     def wrapped_as_string(self: MigrationWriter, *args: Any, **kwargs: Any) -> str:
-        written_migrations[self.migration.app_label] = self.migration.name
+        # The writer knows where the migration goes, even for an app's
+        # initial migration, so there's no need to import the migrations
+        # package afterwards.
+        written_migrations[self.migration.app_label].append(
+            WrittenMigration(self.migration.name, Path(self.basedir))
+        )
         return orig_as_string(self, *args, **kwargs)
 
     MigrationWriter.as_string = wrapped_as_string  # type: ignore [method-assign]
@@ -22,3 +57,10 @@ def spy_on_migration_writers() -> Generator[dict[str, str]]:
         yield written_migrations
     finally:
         MigrationWriter.as_string = orig_as_string  # type: ignore [method-assign]
+
+
+def shard_type(value: str) -> tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from django_linear_migrations.apps import check_max_migration_files
+from django_linear_migrations.management.commands import get_app_configs, shard_type
+
+
+class Command(BaseCommand):
+    help = (
+        "Run django-linear-migrations' checks, optionally outputting"
+        + " machine-readable results."
+    )
+
+    # Checks disabled because we run the django-linear-migrations' checks
+    # ourselves
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "args",
+            metavar="app_label",
+            nargs="*",
+            help="Specify the app label(s) to check.",
+        )
+        parser.add_argument(
+            "--format",
+            dest="output_format",
+            choices=["text", "json", "jsonl"],
+            default="text",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--shard",
+            type=shard_type,
+            help=(
+                "Only check the i-th of n deterministic partitions of the"
+                + " first-party apps, in the form 'i/n'."
+            ),
+        )
+
+    def handle(
+        self,
+        *app_labels: str,
+        output_format: str,
+        shard: tuple[int, int] | None,
+        **options: Any,
+    ) -> None:
+        app_configs = get_app_configs(self, app_labels)
+
+        stats: dict[str, float] = {}
+        start = time.perf_counter()
+        errors = check_max_migration_files(
+            app_configs=(app_configs if app_labels else None),
+            stats=stats,
+            shard=shard,
+        )
+        stats["total_seconds"] = time.perf_counter() - start
+        stats["errors"] = len(errors)
+
+        results = [error.as_dict() for error in errors]
+        if output_format == "json":
+            self.stdout.write(json.dumps({"errors": results, "stats": stats}))
+        elif output_format == "jsonl":
+            for result in results:
+                self.stdout.write(json.dumps({"type": "error", **result}))
+            self.stdout.write(json.dumps({"type": "stats", **stats}))
+        else:
+            for error in errors:
+                self.stdout.write(str(error))
+            if not errors:
+                self.stdout.write("No problems found.")
+
+        if errors:
+            sys.exit(1)
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterable
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+
+from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.git import GitError, GitObjectReader, get_repo_dir
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.numbering import MigrationNumbers, migration_number
+from django_linear_migrations.static import StaticMigration, parse_static_migrations
+from django_linear_migrations.storage import (
+    get_lock_file_path,
+    get_max_migration_store,
+    parse_lock_file,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the migrations of two git revisions, without checking them"
+        + " out, and report the conflicts that merging them would cause."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "base",
+            help="The revision being merged into, e.g. 'main'.",
+        )
+        parser.add_argument(
+            "branch",
+            nargs="?",
+            default="HEAD",
+            help="The revision being merged. Defaults to HEAD.",
+        )
+
+    def handle(self, *args: Any, base: str, branch: str, **options: Any) -> None:
+        app_dirs: dict[str, Path] = {}
+        for app_config in first_party_app_configs():
+            migration_details = MigrationDetails(app_config.label)
+            if migration_details.has_migrations:
+                app_dirs[app_config.label] = migration_details.dir.resolve()
+        if not app_dirs:
+            self.stdout.write("No first-party apps with migrations.")
+            return
+
+        try:
+            repo_dir = get_repo_dir(next(iter(app_dirs.values())))
+        except GitError as exc:
+            raise CommandError(str(exc)) from None
+        repo_app_dirs = {}
+        for app_label, path in app_dirs.items():
+            try:
+                relative_path = path.relative_to(repo_dir.resolve())
+            except ValueError:
+                # Outside the repository
+                continue
+            repo_app_dirs[app_label] = PurePosixPath(relative_path.as_posix())
+
+        lock_file_path = get_lock_file_path()
+        repo_lock_file_path = None
+        if lock_file_path is not None:
+            try:
+                repo_lock_file_path = PurePosixPath(
+                    lock_file_path.resolve().relative_to(repo_dir.resolve()).as_posix()
+                )
+            except ValueError:
+                # Outside the repository
+                pass
+
+        with GitObjectReader(repo_dir) as reader:
+            try:
+                base_commit = reader.resolve(base)
+                branch_commit = reader.resolve(branch)
+                ancestor_commit = reader.merge_base(base_commit, branch_commit)
+                base_names = list_migration_names(reader, base_commit, repo_app_dirs)
+                branch_names = list_migration_names(
+                    reader, branch_commit, repo_app_dirs
+                )
+                ancestor_names = (
+                    None
+                    if ancestor_commit is None
+                    else list_migration_names(reader, ancestor_commit, repo_app_dirs)
+                )
+                base_migrations = load_revision(
+                    reader, base, base_commit, repo_app_dirs, base_names
+                )
+                branch_migrations = load_revision(
+                    reader, branch, branch_commit, repo_app_dirs, branch_names
+                )
+                max_migration_lines = [
+                    (
+                        {}
+                        if commit is None
+                        else read_max_migrations(
+                            reader, commit, repo_app_dirs, repo_lock_file_path
+                        )
+                    )
+                    for commit in (ancestor_commit, base_commit, branch_commit)
+                ]
+            except GitError as exc:
+                raise CommandError(str(exc)) from None
+
+        base_graph = CompactGraph.from_static(base_migrations.values())
+        branch_graph = CompactGraph.from_static(branch_migrations.values())
+        merged_graph = CompactGraph.from_static(
+            merge_migrations(
+                base_migrations,
+                branch_migrations,
+                migration_keys(base_names),
+                migration_keys(branch_names),
+                None if ancestor_names is None else migration_keys(ancestor_names),
+            )
+        )
+        conflicts = {
+            app_label: names
+            for app_label, names in merged_graph.detect_conflicts().items()
+            if app_label in repo_app_dirs
+        }
+        max_migration_problems = self.check_merged_max_migrations(
+            base,
+            branch,
+            [app_label for app_label in repo_app_dirs if app_label not in conflicts],
+            merged_graph,
+            *max_migration_lines,
+        )
+        if not conflicts and not max_migration_problems:
+            self.stdout.write(f"No migration conflicts between {base} and {branch}.")
+            return
+
+        base_max_migrations = base_graph.max_migrations(conflicts)
+        for app_label, leaves in conflicts.items():
+            base_leaves = [
+                name for name in leaves if (app_label, name) in base_migrations
+            ]
+            branch_leaves = [
+                name for name in leaves if (app_label, name) not in base_migrations
+            ]
+            # All the leaves are on one side if it conflicts by itself.
+            sides = [
+                f"{', '.join(side_leaves)} ({revision})"
+                for revision, side_leaves in (
+                    (base, base_leaves),
+                    (branch, branch_leaves),
+                )
+                if side_leaves
+            ]
+            self.stdout.write(f"{app_label}: conflict between {' and '.join(sides)}.")
+            base_max_migration = base_max_migrations.get(app_label)
+            if base_max_migration is None:
+                self.stdout.write(
+                    f"  Rebasing would not apply, since {app_label} has no"
+                    + f" migrations at {base}."
+                )
+                continue
+            branch_only = [
+                name
+                for plan_app_label, name in branch_graph.plan([app_label])
+                if plan_app_label == app_label
+                and (app_label, name) not in base_migrations
+            ]
+            for old_name, new_name in rebased_names(
+                base_names[app_label], base_max_migration, branch_only
+            ):
+                if new_name is None:
+                    self.stdout.write(
+                        f"  Rebasing could not rename {old_name}, since its name"
+                        + " has no number prefix."
+                    )
+                else:
+                    self.stdout.write(
+                        f"  Rebasing would rename {old_name} to {new_name}."
+                    )
+
+        for problem in max_migration_problems:
+            self.stdout.write(problem)
+
+        sys.exit(1)
+
+    def check_merged_max_migrations(
+        self,
+        base: str,
+        branch: str,
+        app_labels: list[str],
+        merged_graph: CompactGraph,
+        ancestor_lines: dict[str, list[str] | None],
+        base_lines: dict[str, list[str] | None],
+        branch_lines: dict[str, list[str] | None],
+    ) -> list[str]:
+        # Apps whose max_migration.txt files, or lock file entries, would
+        # conflict or be stale after the merge, even though their migrations
+        # merge cleanly.
+        store = get_max_migration_store()
+        merged_max_migrations = merged_graph.max_migrations(app_labels)
+        problems = []
+        for app_label in app_labels:
+            description = store.describe(app_label)
+            ours = base_lines.get(app_label)
+            theirs = branch_lines.get(app_label)
+            merged = merge_lines(ancestor_lines.get(app_label), ours, theirs)
+            if isinstance(merged, _Conflict):
+                problems.append(
+                    f"{app_label}: {description} would conflict between"
+                    + f" {format_lines(ours)} ({base}) and"
+                    + f" {format_lines(theirs)} ({branch})."
+                )
+                continue
+            max_migration_name = merged_max_migrations.get(app_label)
+            if (
+                merged is not None
+                and max_migration_name is not None
+                and merged != [max_migration_name]
+            ):
+                problems.append(
+                    f"{app_label}: {description} would contain"
+                    + f" {format_lines(merged)}, but the latest migration would"
+                    + f" be {max_migration_name}."
+                )
+        return problems
+
+
+def list_migration_names(
+    reader: GitObjectReader, commit: str, app_dirs: dict[str, PurePosixPath]
+) -> dict[str, list[str]]:
+    # The names of each app's migration files at the commit.
+    dir_files = reader.list_dirs(commit, list(app_dirs.values()))
+    return {
+        app_label: [
+            filename[:-3]
+            for filename in dir_files[app_dir]
+            if filename.endswith(".py") and filename[0] not in "_~"
+        ]
+        for app_label, app_dir in app_dirs.items()
+    }
+
+
+def load_revision(
+    reader: GitObjectReader,
+    revision: str,
+    commit: str,
+    app_dirs: dict[str, PurePosixPath],
+    app_names: dict[str, list[str]],
+) -> dict[tuple[str, str], StaticMigration]:
+    migrations = {}
+    for app_label, app_dir in app_dirs.items():
+        names = app_names[app_label]
+
+        def read_source(name: str, app_dir: PurePosixPath = app_dir) -> bytes | None:
+            return reader.read(commit, app_dir / f"{name}.py")
+
+        try:
+            app_migrations = parse_static_migrations(app_label, names, read_source)
+        except ValueError as exc:
+            raise GitError(f"{exc.args[0][:-1]} at {revision}.") from exc
+        for migration in app_migrations:
+            migrations[migration.key] = migration
+    return migrations
+
+
+def migration_keys(app_names: dict[str, list[str]]) -> set[tuple[str, str]]:
+    return {
+        (app_label, name) for app_label, names in app_names.items() for name in names
+    }
+
+
+def merge_migrations(
+    base_migrations: dict[tuple[str, str], StaticMigration],
+    branch_migrations: dict[tuple[str, str], StaticMigration],
+    base_keys: set[tuple[str, str]],
+    branch_keys: set[tuple[str, str]],
+    ancestor_keys: set[tuple[str, str]] | None,
+) -> list[StaticMigration]:
+    # The migrations a merge would have: those on both sides, and those
+    # added on either side, but not those deleted on either side, such as
+    # after squashing. Without a common ancestor, all migrations from both.
+    merged = []
+    for key, migration in {**base_migrations, **branch_migrations}.items():
+        if (
+            ancestor_keys is not None
+            and key in ancestor_keys
+            and not (key in base_keys and key in branch_keys)
+        ):
+            continue
+        merged.append(migration)
+    return merged
+
+
+def read_max_migrations(
+    reader: GitObjectReader,
+    commit: str,
+    app_dirs: dict[str, PurePosixPath],
+    lock_file_path: PurePosixPath | None,
+) -> dict[str, list[str] | None]:
+    # Each app's max_migration.txt lines, or lock file entry, at the commit,
+    # or None if missing.
+    if lock_file_path is not None:
+        content = reader.read(commit, lock_file_path)
+        entries = parse_lock_file(content.decode() if content is not None else "")
+        return {app_label: entries.get(app_label) for app_label in app_dirs}
+
+    result: dict[str, list[str] | None] = {}
+    for app_label, app_dir in app_dirs.items():
+        content = reader.read(commit, app_dir / "max_migration.txt")
+        result[app_label] = (
+            None if content is None else content.decode().strip().splitlines()
+        )
+    return result
+
+
+class _Conflict:
+    pass
+
+
+CONFLICT = _Conflict()
+
+
+def merge_lines(
+    ancestor: list[str] | None, ours: list[str] | None, theirs: list[str] | None
+) -> list[str] | None | _Conflict:
+    # Three-way merge of a max_migration.txt file or lock file entry, as git
+    # would for a single line.
+    if ours == theirs or ancestor == theirs:
+        return ours
+    if ancestor == ours:
+        return theirs
+    return CONFLICT
+
+
+def format_lines(lines: list[str] | None) -> str:
+    if not lines:
+        return "nothing"
+    return ", ".join(lines)
+
+
+def rebased_names(
+    base_names: Iterable[str], max_migration_name: str, names: list[str]
+) -> list[tuple[str, str | None]]:
+    # Renumber after the base's latest migration, skipping used numbers, like
+    # rebase_migration does. Names without a number prefix can't be renamed,
+    # nor can any names if the base's latest migration has none.
+    numbers = MigrationNumbers(base_names)
+    after = migration_number(max_migration_name)
+    renames: list[tuple[str, str | None]] = []
+    for name in names:
+        if after is None or migration_number(name) is None:
+            renames.append((name, None))
+            continue
+        _number, rest = name.split("_", 1)
+        after = numbers.next_free(after)
+        renames.append((name, str(after).zfill(4) + "_" + rest))
+    return renames
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+
+from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.storage import (
+    LockFileStore,
+    MaxMigrationStore,
+    get_lock_file_path,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert between per-app max_migration.txt files and a project-level"
+        + " lock file."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--to",
+            dest="layout",
+            choices=["lock-file", "app-files"],
+            required=True,
+            help="The layout to convert to.",
+        )
+
+    def handle(self, *args: Any, layout: str, **options: Any) -> None:
+        lock_file_path = get_lock_file_path()
+        if lock_file_path is None:
+            raise CommandError(
+                "Set the LINEAR_MIGRATIONS_LOCK_FILE setting to the lock file's"
+                + " path."
+            )
+
+        source: MaxMigrationStore
+        target: MaxMigrationStore
+        if layout == "lock-file":
+            source = MaxMigrationStore()
+            target = LockFileStore(lock_file_path)
+        else:
+            source = LockFileStore(lock_file_path)
+            target = MaxMigrationStore()
+
+        names: dict[str, tuple[Path, str]] = {}
+        for app_config in first_party_app_configs():
+            app_label = app_config.label
+            migration_details = MigrationDetails(app_label)
+            if not migration_details.has_migrations:
+                continue
+
+            lines = source.read_lines(app_label, migration_details.dir)
+            if lines is None:
+                continue
+            if not lines or lines == [""]:
+                raise CommandError(
+                    f"{app_label}'s {source.describe(app_label)} is empty. Fix"
+                    + " it before converting."
+                )
+            if len(lines) != 1:
+                raise CommandError(
+                    f"{app_label}'s {source.describe(app_label)} contains"
+                    + " multiple lines. Fix it before converting."
+                )
+            names[app_label] = (migration_details.dir, lines[0])
+
+        if not names:
+            self.stdout.write("No max migrations to convert.")
+            return
+
+        target.write_many(names)
+        source.delete_many(
+            {
+                app_label: migrations_dir
+                for app_label, (migrations_dir, _) in names.items()
+            }
+        )
+
+        for app_label in names:
+            self.stdout.write(
+                f"Converted {app_label}'s {source.describe(app_label)} to"
+                + f" {target.describe(app_label)}."
+            )
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import argparse
-import sys
 from typing import Any
 
-from django.apps import apps
 from django.core.management.commands.makemigrations import Command as BaseCommand
 from django.db.migrations.loader import MigrationLoader
 
 from django_linear_migrations.apps import (
     MigrationDetails,
+    check_max_migration_files,
     first_party_app_configs,
-    get_graph_plan,
+    get_shard,
+    in_shard,
 )
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.locking import max_migration_write_lock
+from django_linear_migrations.management.commands import get_app_configs, shard_type
+from django_linear_migrations.stamp import get_stamp_path, write_stamp
+from django_linear_migrations.storage import get_max_migration_store
 
 
 class Command(BaseCommand):
@@ -44,40 +49,66 @@ class Command(BaseCommand):
                 + " will be created."
             ),
         )
+        parser.add_argument(
+            "--shard",
+            type=shard_type,
+            help=(
+                "Only handle the i-th of n deterministic partitions of the"
+                + " first-party apps, in the form 'i/n'."
+            ),
+        )
 
     def handle(
-        self, *app_labels: str, dry_run: bool, recreate: bool, **options: Any
+        self,
+        *app_labels: str,
+        dry_run: bool,
+        recreate: bool,
+        shard: tuple[int, int] | None,
+        **options: Any,
     ) -> None:
-        # Copied check from makemigrations
         labels = set(app_labels)
-        has_bad_labels = False
-        for app_label in labels:
-            try:
-                apps.get_app_config(app_label)
-            except LookupError as err:
-                self.stderr.write(str(err))
-                has_bad_labels = True
-        if has_bad_labels:
-            sys.exit(2)
+        get_app_configs(self, labels)
+
+        if shard is None:
+            shard = get_shard()
+
+        if dry_run:
+            self.create(labels, dry_run, recreate, shard)
+        else:
+            with max_migration_write_lock():
+                self.create(labels, dry_run, recreate, shard)
 
+    def create(
+        self,
+        labels: set[str],
+        dry_run: bool,
+        recreate: bool,
+        shard: tuple[int, int] | None,
+    ) -> None:
         any_created = False
+        store = get_max_migration_store()
+        to_write = {}
         migration_loader = MigrationLoader(None, ignore_no_migrations=True)
-        graph_plan = get_graph_plan(loader=migration_loader, app_labels=labels)
+        max_migrations = CompactGraph.from_loader(migration_loader).max_migrations(
+            labels
+        )
         for app_config in first_party_app_configs():
             if labels and app_config.label not in labels:
                 continue
+            if not in_shard(app_config.label, shard):
+                continue
 
             migration_details = MigrationDetails(app_config.label)
             if not migration_details.has_migrations:
                 continue
 
-            max_migration_txt = migration_details.dir / "max_migration.txt"
-            if recreate or not max_migration_txt.exists():
+            existing_lines = store.read_lines(app_config.label, migration_details.dir)
+            if recreate or existing_lines is None:
                 if not dry_run:
-                    max_migration_name = [
-                        k[1] for k in graph_plan if k[0] == app_config.label
-                    ][-1]
-                    max_migration_txt.write_text(max_migration_name + "\n")
+                    to_write[app_config.label] = (
+                        migration_details.dir,
+                        max_migrations[app_config.label],
+                    )
                     self.stdout.write(
                         f"Created max_migration.txt for {app_config.label}."
                     )
@@ -87,5 +118,18 @@ class Command(BaseCommand):
                     )
                 any_created = True
 
+        if to_write:
+            store.write_many(to_write)
+
         if not any_created:
             self.stdout.write("No max_migration.txt files need creating.")
+
+        stamp_path = get_stamp_path()
+        if stamp_path is not None and not dry_run and shard is None:
+            if check_max_migration_files(full=True):
+                self.stdout.write(
+                    "Not writing the build stamp, since the checks found problems."
+                )
+            else:
+                write_stamp(stamp_path)
+                self.stdout.write(f"Wrote build stamp to {stamp_path}.")
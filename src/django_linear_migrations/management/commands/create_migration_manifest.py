@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+
+from django_linear_migrations.apps import (
+    MigrationDetails,
+    check_max_migration_files,
+    first_party_app_configs,
+)
+from django_linear_migrations.manifest import get_manifest_path, write_manifest
+from django_linear_migrations.storage import get_max_migration_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the checks, and write a manifest of the verified max migrations"
+        + " that production processes can check against instead."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--output",
+            help=(
+                "The path to write the manifest to. Defaults to the"
+                + " LINEAR_MIGRATIONS_MANIFEST setting."
+            ),
+        )
+
+    def handle(self, *args: Any, output: str | None, **options: Any) -> None:
+        path = Path(output) if output is not None else get_manifest_path()
+        if path is None:
+            raise CommandError(
+                "Pass --output or set the LINEAR_MIGRATIONS_MANIFEST setting."
+            )
+
+        errors = check_max_migration_files(full=True)
+        if errors:
+            raise CommandError(
+                "Cannot create the manifest, since the checks found problems:\n"
+                + "\n".join(str(error) for error in errors)
+            )
+
+        # The checks passed, so the stored max migrations are correct.
+        app_labels = [app_config.label for app_config in first_party_app_configs()]
+        store = get_max_migration_store()
+        max_migrations = {}
+        for app_label in app_labels:
+            migration_details = MigrationDetails(app_label)
+            if not migration_details.has_migrations:
+                continue
+            lines = store.read_lines(app_label, migration_details.dir)
+            assert lines is not None
+            max_migrations[app_label] = lines[0]
+        write_manifest(path, app_labels, max_migrations)
+
+        self.stdout.write(f"Wrote migration manifest to {path}.")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+from django.db.migrations.loader import MigrationLoader
+
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.snapshot import (
+    GraphSummary,
+    get_snapshot_path,
+    write_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a snapshot of the migration graph, which the checks can use"
+        + " instead of loading the graph."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--output",
+            help=(
+                "The path to write the snapshot to. Defaults to the"
+                + " LINEAR_MIGRATIONS_SNAPSHOT setting."
+            ),
+        )
+
+    def handle(self, *args: Any, output: str | None, **options: Any) -> None:
+        path = Path(output) if output is not None else get_snapshot_path()
+        if path is None:
+            raise CommandError(
+                "Pass --output or set the LINEAR_MIGRATIONS_SNAPSHOT setting."
+            )
+
+        app_labels = [app_config.label for app_config in first_party_app_configs()]
+        migration_loader = MigrationLoader(None, ignore_no_migrations=True)
+        graph = CompactGraph.from_loader(migration_loader)
+        write_snapshot(path, GraphSummary.from_graph(graph, app_labels), app_labels)
+
+        self.stdout.write(f"Wrote migration snapshot to {path}.")
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand
+from django.db.migrations.loader import MigrationLoader
+
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.discovery import scan_directory
+from django_linear_migrations.management.commands import get_app_configs
+from django_linear_migrations.numbering import MigrationNumbers
+from django_linear_migrations.static import load_static_migrations
+from django_linear_migrations.storage import get_max_migration_store
+
+_name_re = re.compile(r"^\d{4,}_\w+$")
+
+
+class Command(BaseCommand):
+    help = (
+        "Check first-party apps' migration files from their names alone,"
+        + " without importing them."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "args",
+            metavar="app_label",
+            nargs="*",
+            help="Specify the app label(s) to lint.",
+        )
+
+    def handle(self, *app_labels: str, **options: Any) -> None:
+        get_app_configs(self, app_labels)
+
+        store = get_max_migration_store()
+        errors = []
+        warnings = []
+        for app_config in first_party_app_configs():
+            app_label = app_config.label
+            if app_labels and app_label not in app_labels:
+                continue
+            migrations_dir = find_migrations_dir(app_label)
+            if migrations_dir is None:
+                continue
+            names, compiled_names = scan_migrations_dir(migrations_dir)
+            if not names and not compiled_names:
+                continue
+
+            for name in sorted(compiled_names - names):
+                errors.append(
+                    f"{app_label}: {name}.pyc is a compiled migration without a"
+                    + " source file."
+                )
+            names |= compiled_names
+
+            well_named = set()
+            for name in sorted(names):
+                if _name_re.match(name):
+                    well_named.add(name)
+                else:
+                    errors.append(
+                        f"{app_label}: {name} does not match the migration name"
+                        + " format NNNN_name."
+                    )
+
+            numbers = MigrationNumbers(well_named)
+            duplicates = numbers.duplicates()
+            if duplicates:
+                duplicates = unmerged_duplicates(
+                    app_label, migrations_dir, names, duplicates
+                )
+            for number, duplicate_names in sorted(duplicates.items()):
+                errors.append(
+                    f"{app_label}: duplicate migration number {number:04}:"
+                    + f" {', '.join(duplicate_names)}."
+                )
+            gaps = numbers.gaps()
+            if gaps:
+                warnings.append(
+                    f"{app_label}: gap in migration numbers, missing"
+                    + f" {', '.join(f'{number:04}' for number in gaps)}."
+                )
+
+            location = store.describe(app_label)
+            lines = store.read_lines(app_label, migrations_dir)
+            latest_names = numbers.latest_names()
+            if lines is None:
+                errors.append(f"{app_label}: {location} does not exist.")
+            elif len(lines) > 1:
+                errors.append(f"{app_label}: {location} contains multiple lines.")
+            elif not lines or lines[0] not in names:
+                max_migration_name = lines[0] if lines else ""
+                errors.append(
+                    f"{app_label}: {location} points to non-existent migration"
+                    + f" {max_migration_name!r}."
+                )
+            elif latest_names and lines[0] not in latest_names:
+                errors.append(
+                    f"{app_label}: {location} contains {lines[0]!r}, but"
+                    + f" {latest_names[-1]!r} has a higher number."
+                )
+
+        for message in errors + warnings:
+            self.stdout.write(message)
+        if not errors and not warnings:
+            self.stdout.write("No problems found.")
+        if errors:
+            sys.exit(1)
+
+
+def unmerged_duplicates(
+    app_label: str,
+    migrations_dir: Path,
+    names: set[str],
+    duplicates: dict[int, list[str]],
+) -> dict[int, list[str]]:
+    """
+    Filter out duplicate numbers whose migrations a later migration depends
+    on together, such as a merge migration made by 'makemigrations --merge',
+    or that a squashed migration replaces. Only these migrations’ sources
+    are parsed, without importing them.
+    """
+    try:
+        migrations = load_static_migrations(app_label, migrations_dir, names)
+    except ValueError:
+        # Can't tell, so report them all.
+        return duplicates
+    if any(migration.dynamic for migration in migrations):
+        return duplicates
+
+    children: dict[str, list[str]] = {}
+    for migration in migrations:
+        for parent_app_label, parent_name in migration.dependencies:
+            if parent_app_label == app_label:
+                children.setdefault(parent_name, []).append(migration.name)
+    remaining = {migration.name for migration in migrations}
+
+    result = {}
+    for number, duplicate_names in duplicates.items():
+        # Replaced migrations are never used.
+        unreplaced = [name for name in duplicate_names if name in remaining]
+        if len(unreplaced) < 2:
+            continue
+        common = set.intersection(*(descendants(name, children) for name in unreplaced))
+        if not common:
+            result[number] = duplicate_names
+    return result
+
+
+def descendants(name: str, children: dict[str, list[str]]) -> set[str]:
+    result = set()
+    stack = list(children.get(name, []))
+    while stack:
+        child = stack.pop()
+        if child not in result:
+            result.add(child)
+            stack.extend(children.get(child, []))
+    return result
+
+
+def find_migrations_dir(app_label: str) -> Path | None:
+    # Locate the migrations package without importing it.
+    module_name, _explicit = MigrationLoader.migrations_module(app_label)
+    if module_name is None:
+        return None
+    try:
+        spec = find_spec(module_name)
+    except ModuleNotFoundError:
+        return None
+    if (
+        spec is None
+        # Not namespace or non-package module:
+        or spec.origin is None
+        or spec.submodule_search_locations is None
+    ):
+        return None
+    migrations_dir = Path(spec.origin).parent
+    if not migrations_dir.is_dir():
+        # In a zip file
+        return None
+    return migrations_dir
+
+
+def scan_migrations_dir(migrations_dir: Path) -> tuple[set[str], set[str]]:
+    # Names of migrations with source files, and of compiled migrations
+    # directly in the directory, which Django can load without source.
+    names = set()
+    compiled_names = set()
+    for name, suffix in scan_directory(str(migrations_dir)).items():
+        if name[0] in "_~":
+            continue
+        if suffix == ".py":
+            names.add(name)
+        elif suffix == ".pyc":
+            compiled_names.add(name)
+    return names, compiled_names
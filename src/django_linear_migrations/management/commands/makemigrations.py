@@ -1,30 +1,50 @@
 from __future__ import annotations
 
+import sys
+from importlib import invalidate_caches
 from typing import Any
 
 from django.core.management.commands.makemigrations import Command as BaseCommand
+from django.db.migrations.loader import MigrationLoader
 
-from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.locking import max_migration_write_lock
 from django_linear_migrations.management.commands import spy_on_migration_writers
+from django_linear_migrations.storage import get_max_migration_store
 
 
 class Command(BaseCommand):
     def handle(self, *app_labels: Any, **options: Any) -> None:
-        with spy_on_migration_writers() as written_migrations:
-            super().handle(*app_labels, **options)
-
         if options["dry_run"]:
+            super().handle(*app_labels, **options)
             return
 
+        with max_migration_write_lock():
+            self.handle_locked(*app_labels, **options)
+
+    def handle_locked(self, *app_labels: Any, **options: Any) -> None:
+        with spy_on_migration_writers() as written_migrations:
+            super().handle(*app_labels, **options)
+
         first_party_app_labels = {
             app_config.label for app_config in first_party_app_configs()
         }
-
-        for app_label, migration_name in written_migrations.items():
-            if app_label not in first_party_app_labels:
-                continue
-
-            # Reload required in case of initial migration
-            migration_details = MigrationDetails(app_label, do_reload=True)
-            max_migration_txt = migration_details.dir / "max_migration.txt"
-            max_migration_txt.write_text(f"{migration_name}\n")
+        max_migrations = {
+            # Migrations are written in order, so the last is the latest.
+            app_label: (migrations[-1].migrations_dir, migrations[-1].name)
+            for app_label, migrations in written_migrations.items()
+            if app_label in first_party_app_labels
+        }
+        if max_migrations:
+            get_max_migration_store().write_many(max_migrations)
+
+        # Let later imports in this process find newly created migrations
+        # packages, without importing them now. An app's migrations directory
+        # without an __init__.py may have been imported as a namespace
+        # package, which Django ignores, so forget it.
+        invalidate_caches()
+        for app_label in written_migrations:
+            module_name, _explicit = MigrationLoader.migrations_module(app_label)
+            module = None if module_name is None else sys.modules.get(module_name)
+            if module is not None and getattr(module, "__file__", None) is None:
+                del sys.modules[module.__name__]
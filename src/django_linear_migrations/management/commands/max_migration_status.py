@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.management.commands import get_app_configs
+from django_linear_migrations.snapshot import (
+    GraphSummary,
+    fingerprint_migrations,
+    get_snapshot_path,
+    read_snapshot,
+)
+from django_linear_migrations.storage import get_max_migration_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Show each first-party app's max migration, and whether it's up to"
+        + " date, using the migration snapshot where possible."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "args",
+            metavar="app_label",
+            nargs="*",
+            help="Specify the app label(s) to show.",
+        )
+        parser.add_argument(
+            "--format",
+            dest="output_format",
+            choices=["text", "json"],
+            default="text",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help=(
+                "Load the migration graph to determine the status of apps"
+                + " whose migrations have changed since the snapshot."
+            ),
+        )
+
+    def handle(
+        self,
+        *app_labels: str,
+        output_format: str,
+        verify: bool,
+        **options: Any,
+    ) -> None:
+        get_app_configs(self, app_labels)
+
+        snapshot_path = get_snapshot_path()
+        snapshot = None if snapshot_path is None else read_snapshot(snapshot_path)
+        first_party_app_labels = [
+            app_config.label for app_config in first_party_app_configs()
+        ]
+        summary: GraphSummary | None = None
+
+        store = get_max_migration_store()
+        results = []
+        for app_label in first_party_app_labels:
+            if app_labels and app_label not in app_labels:
+                continue
+            migration_details = MigrationDetails(app_label)
+            if not migration_details.has_migrations:
+                continue
+
+            max_migration_name = None
+            source = None
+            lines = store.read_lines(app_label, migration_details.dir)
+            if lines is None:
+                status = "missing"
+            elif len(lines) > 1:
+                status = "conflicted"
+            else:
+                max_migration_name = lines[0] if lines else ""
+                if snapshot is not None and snapshot["fingerprints"].get(
+                    app_label
+                ) == fingerprint_migrations(
+                    migration_details.dir, migration_details.names
+                ):
+                    # An app's latest migration is its single leaf, which
+                    # only depends on its own migrations.
+                    source = "snapshot"
+                    status = get_status(
+                        max_migration_name,
+                        snapshot["max_migrations"].get(app_label),
+                        app_label in snapshot["conflicts"],
+                    )
+                elif verify:
+                    if summary is None:
+                        summary = load_summary(first_party_app_labels)
+                    source = "graph"
+                    status = get_status(
+                        max_migration_name,
+                        summary.max_migrations.get(app_label),
+                        app_label in summary.conflicts,
+                    )
+                else:
+                    status = "unknown"
+
+            results.append(
+                {
+                    "app_label": app_label,
+                    "max_migration": max_migration_name,
+                    "status": status,
+                    "source": source,
+                }
+            )
+
+        if output_format == "json":
+            self.stdout.write(json.dumps({"apps": results}))
+        else:
+            for result in results:
+                name = result["max_migration"] or "-"
+                self.stdout.write(f"{result['app_label']}: {name} ({result['status']})")
+
+
+def get_status(
+    max_migration_name: str, real_max_migration_name: str | None, conflicted: bool
+) -> str:
+    if conflicted:
+        return "conflicted"
+    if max_migration_name == real_max_migration_name:
+        return "consistent"
+    return "stale"
+
+
+def load_summary(app_labels: list[str]) -> GraphSummary:
+    from django.db.migrations.loader import MigrationLoader
+
+    from django_linear_migrations.graph import CompactGraph
+
+    migration_loader = MigrationLoader(None, ignore_no_migrations=True)
+    graph = CompactGraph.from_loader(migration_loader)
+    return GraphSummary.from_graph(graph, app_labels)
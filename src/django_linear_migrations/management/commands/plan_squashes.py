@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from django.core.management import BaseCommand, call_command
+
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.management.commands import get_app_configs
+from django_linear_migrations.profiling import app_import_times, time_migration_imports
+from django_linear_migrations.squashing import plan_squashes
+
+
+class Command(BaseCommand):
+    help = (
+        "Rank first-party apps by their number of migrations and the time"
+        + " taken to load them, and propose migrations to squash."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "args",
+            metavar="app_label",
+            nargs="*",
+            help="Specify the app label(s) to plan squashes for.",
+        )
+        parser.add_argument(
+            "--min-migrations",
+            type=int,
+            default=10,
+            help="Only propose squashing at least this many migrations.",
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Run squashmigrations for each proposed squash.",
+        )
+
+    def handle(
+        self,
+        *app_labels: str,
+        min_migrations: int,
+        apply: bool,
+        **options: Any,
+    ) -> None:
+        get_app_configs(self, app_labels)
+
+        from django.db.migrations.loader import MigrationLoader
+
+        from django_linear_migrations.graph import CompactGraph
+
+        first_party_app_labels = [
+            app_config.label
+            for app_config in first_party_app_configs()
+            if not app_labels or app_config.label in app_labels
+        ]
+        with time_migration_imports() as timings:
+            migration_loader = MigrationLoader(None, ignore_no_migrations=True)
+        graph = CompactGraph.from_loader(migration_loader)
+        plans = plan_squashes(
+            graph,
+            first_party_app_labels,
+            replacing=migration_loader.replacements,
+            costs=app_import_times(timings, first_party_app_labels),
+            min_migrations=min_migrations,
+        )
+        if not plans:
+            self.stdout.write("No first-party apps with migrations.")
+            return
+
+        for plan in plans:
+            self.stdout.write(
+                f"{plan.app_label}: {plan.migrations} migrations,"
+                + f" {plan.seconds * 1000:.1f}ms to load."
+            )
+            if plan.reason is None:
+                self.stdout.write(
+                    f"  Squash {plan.start} to {plan.end}"
+                    + f" ({plan.squashed} migrations)."
+                )
+            else:
+                self.stdout.write(f"  Not squashing, since {plan.reason}.")
+
+        if not apply:
+            return
+
+        for plan in plans:
+            if plan.reason is not None:
+                continue
+            # Our squashmigrations updates the max migration.
+            call_command(
+                "squashmigrations",
+                plan.app_label,
+                plan.start,
+                plan.end,
+                interactive=False,
+                verbosity=options["verbosity"],
+                stdout=self.stdout,
+                stderr=self.stderr,
+            )
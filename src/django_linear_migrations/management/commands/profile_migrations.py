@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.management.commands import get_app_configs
+from django_linear_migrations.profiling import (
+    app_import_times,
+    migration_import_times,
+    time_migration_imports,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the migration graph, timing the import of each migration, and"
+        + " report the slowest apps and migrations to import."
+    )
+
+    # Checks disabled because the django-linear-migrations' checks would
+    # prevent us continuing
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "args",
+            metavar="app_label",
+            nargs="*",
+            help=(
+                "Specify the app label(s) to report on. Defaults to all"
+                + " first-party apps."
+            ),
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="The number of slowest migrations to report.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the full profile as JSON to this path.",
+        )
+
+    def handle(
+        self,
+        *app_labels: str,
+        top: int,
+        output: Path | None,
+        **options: Any,
+    ) -> None:
+        get_app_configs(self, app_labels)
+
+        from django.db.migrations.loader import MigrationLoader
+
+        if not app_labels:
+            app_labels = tuple(
+                app_config.label for app_config in first_party_app_configs()
+            )
+
+        start = time.perf_counter()
+        with time_migration_imports() as timings:
+            migration_loader = MigrationLoader(None, ignore_no_migrations=True)
+        load_seconds = time.perf_counter() - start
+
+        migration_times = migration_import_times(timings, app_labels)
+        app_times = app_import_times(timings, app_labels)
+        app_counts = dict.fromkeys(app_labels, 0)
+        for app_label, _name in migration_times:
+            app_counts[app_label] += 1
+        import_seconds = sum(app_times.values())
+
+        self.stdout.write(
+            f"Loaded {len(migration_loader.disk_migrations)} migrations in"
+            + f" {load_seconds * 1000:.1f}ms, with {import_seconds * 1000:.1f}ms"
+            + " importing the reported apps' migrations."
+        )
+        ranked_apps = sorted(
+            (app_label for app_label in app_labels if app_counts[app_label]),
+            key=lambda app_label: (-app_times[app_label], app_label),
+        )
+        if ranked_apps:
+            self.stdout.write("Apps:")
+            for app_label in ranked_apps:
+                self.stdout.write(
+                    f"  {app_label}: {app_times[app_label] * 1000:.1f}ms,"
+                    + f" {app_counts[app_label]} migrations"
+                )
+        ranked_migrations = sorted(
+            migration_times.items(), key=lambda item: (-item[1], item[0])
+        )
+        if ranked_migrations and top > 0:
+            self.stdout.write("Slowest migrations:")
+            for (app_label, name), seconds in ranked_migrations[:top]:
+                self.stdout.write(f"  {app_label}.{name}: {seconds * 1000:.1f}ms")
+
+        if output is not None:
+            profile = {
+                "load_seconds": load_seconds,
+                "import_seconds": import_seconds,
+                "apps": {
+                    app_label: {
+                        "seconds": app_times[app_label],
+                        "migrations": app_counts[app_label],
+                    }
+                    for app_label in ranked_apps
+                },
+                "migrations": [
+                    {"app_label": app_label, "name": name, "seconds": seconds}
+                    for (app_label, name), seconds in ranked_migrations
+                ],
+            }
+            output.write_text(json.dumps(profile, indent=2) + "\n")
+            self.stdout.write(f"Wrote profile to {output}.")
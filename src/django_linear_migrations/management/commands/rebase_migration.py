@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import argparse
 import ast
+import difflib
 import shutil
 import subprocess
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +15,12 @@ from django.db import DatabaseError, connections
 from django.db.migrations.recorder import MigrationRecorder
 
 from django_linear_migrations.apps import MigrationDetails, is_first_party_app_config
+from django_linear_migrations.editor import SourceEditor
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.numbering import MigrationNumbers
+from django_linear_migrations.references import ReferenceIndex, rename_references
+from django_linear_migrations.static import load_static_migrations, parse_migration
+from django_linear_migrations.storage import get_max_migration_store
 
 
 class Command(BaseCommand):
@@ -30,36 +38,58 @@ class Command(BaseCommand):
             "app_label",
             help="Specify the app label to rebase the migration for.",
         )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=(
+                "Show the changes as a diff, and check the resulting migration"
+                + " history, without writing anything."
+            ),
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=(
+                "Like --dry-run, but exit with a non-zero status if the"
+                + " resulting migration history has problems."
+            ),
+        )
 
-    def handle(self, *args: Any, app_label: str, **options: Any) -> None:
+    def handle(
+        self,
+        *args: Any,
+        app_label: str,
+        dry_run: bool,
+        check: bool,
+        **options: Any,
+    ) -> None:
         app_config = apps.get_app_config(app_label)
         if not is_first_party_app_config(app_config):
             raise CommandError(f"{app_label!r} is not a first-party app.")
 
         migration_details = MigrationDetails(app_label)
-        max_migration_txt = migration_details.dir / "max_migration.txt"
-        if not max_migration_txt.exists():
-            raise CommandError(f"{app_label} does not have a max_migration.txt.")
+        store = get_max_migration_store()
+        location = store.describe(app_label)
+        max_migration_lines = store.read_lines(app_label, migration_details.dir)
+        if max_migration_lines is None:
+            raise CommandError(f"{app_label} does not have a {location}.")
 
-        migration_names = find_migration_names(
-            max_migration_txt.read_text().splitlines()
-        )
+        migration_names = find_migration_names(max_migration_lines)
         if migration_names is None:
             raise CommandError(
-                f"{app_label}'s max_migration.txt does not seem to contain a"
-                + " merge conflict."
+                f"{app_label}'s {location} does not seem to contain a merge conflict."
             )
         merged_migration_name, rebased_migration_name = migration_names
         if merged_migration_name not in migration_details.names:
             raise CommandError(
                 f"Parsed {merged_migration_name!r} as the already-merged"
-                + f" migration name from {app_label}'s max_migration.txt, but"
+                + f" migration name from {app_label}'s {location}, but"
                 + " this migration does not exist."
             )
         if rebased_migration_name not in migration_details.names:
             raise CommandError(
                 f"Parsed {rebased_migration_name!r} as the rebased migration"
-                + f" name from {app_label}'s max_migration.txt, but this"
+                + f" name from {app_label}'s {location}, but this"
                 + " migration does not exist."
             )
 
@@ -78,7 +108,7 @@ class Command(BaseCommand):
                 + " reverse the migration, and try again."
             )
 
-        content = rebased_migration_path.read_text()
+        content = rebased_migration_path.read_bytes()
 
         try:
             module_def = ast.parse(content)
@@ -124,21 +154,6 @@ class Command(BaseCommand):
         dependencies = dependencies_assignments[0].value
         assert isinstance(dependencies, (ast.List, ast.Tuple))
 
-        lines = content.splitlines(keepends=True)
-        before_deps_len = (
-            sum(len(line) for line in lines[: dependencies.lineno - 1])
-            + dependencies.col_offset
-        )
-        assert dependencies.end_lineno is not None
-        assert dependencies.end_col_offset is not None
-        after_deps_len = (
-            sum(len(line) for line in lines[: dependencies.end_lineno - 1])
-            + dependencies.end_col_offset
-        )
-
-        before_deps = content[:before_deps_len]
-        after_deps = content[after_deps_len:]
-
         if isinstance(dependencies, ast.Tuple):
             new_dependencies: ast.Tuple | ast.List = ast.Tuple(elts=[])
         else:
@@ -183,18 +198,80 @@ class Command(BaseCommand):
                 + f"{app_label}."
             )
 
-        new_content = before_deps + ast.unparse(new_dependencies) + after_deps
+        editor = SourceEditor(content)
+        editor.replace(dependencies, ast.unparse(new_dependencies))
+        new_content = editor.apply()
 
         merged_number, _merged_rest = merged_migration_name.split("_", 1)
         _rebased_number, rebased_rest = rebased_migration_name.split("_", 1)
-        new_number = int(merged_number) + 1
+        # Skip numbers already used, e.g. by a squashed migration or a
+        # migration from another branch.
+        numbers = MigrationNumbers(migration_details.names - {rebased_migration_name})
+        new_number = numbers.next_free(int(merged_number))
         new_name = str(new_number).zfill(4) + "_" + rebased_rest
         new_path_parts = rebased_migration_path.parts[:-1] + (f"{new_name}.py",)
         new_path = Path(*new_path_parts)
 
+        rebased_key = (app_label, rebased_migration_name)
+        rewrites = {}
+        for path, key in ReferenceIndex.build().referencing(rebased_key).items():
+            if path == rebased_migration_path:
+                continue
+            source = path.read_bytes()
+            rewrites[path] = (
+                key,
+                source,
+                rename_references(source, rebased_key, new_name),
+            )
+
+        if dry_run or check:
+            self.stdout.write(
+                f"Would rename {rebased_migration_path.parts[-1]} to"
+                + f" {new_path.parts[-1]}, update its dependencies, and update"
+                + f" {location}."
+            )
+            self.stdout.write(
+                diff_bytes(content, new_content, rebased_migration_path, new_path),
+                ending="",
+            )
+            for path, (_key, source, new_source) in rewrites.items():
+                self.stdout.write(diff_bytes(source, new_source, path, path), ending="")
+            self.stdout.write(
+                unified_diff(
+                    [f"{line}\n" for line in max_migration_lines],
+                    [f"{new_name}\n"],
+                    location,
+                    location,
+                ),
+                ending="",
+            )
+
+            try:
+                problems = simulate_rebase(
+                    app_label,
+                    rebased_migration_name,
+                    new_name,
+                    new_content,
+                    {key: new_source for key, _source, new_source in rewrites.values()},
+                )
+            except ValueError as exc:
+                raise CommandError(f"Could not simulate the rebase: {exc}") from None
+            for problem in problems:
+                self.stdout.write(problem)
+            if not problems:
+                self.stdout.write(
+                    f"After the rebase, {app_label}'s migration history would be"
+                    + f" linear, with {new_name} as its latest migration."
+                )
+            elif check:
+                sys.exit(1)
+            return
+
         rebased_migration_path.rename(new_path)
-        new_path.write_text(new_content)
-        max_migration_txt.write_text(f"{new_name}\n")
+        new_path.write_bytes(new_content)
+        for path, (_key, _source, new_source) in rewrites.items():
+            path.write_bytes(new_source)
+        store.write(app_label, migration_details.dir, new_name)
 
         black_path = shutil.which("black")
         if black_path:  # pragma: no cover
@@ -205,8 +282,13 @@ class Command(BaseCommand):
 
         self.stdout.write(
             f"Renamed {rebased_migration_path.parts[-1]} to {new_path.parts[-1]},"
-            + " updated its dependencies, and updated max_migration.txt."
+            + f" updated its dependencies, and updated {location}."
         )
+        for key, _source, _new_source in sorted(rewrites.values()):
+            self.stdout.write(
+                f"Updated the reference to {rebased_migration_name} in"
+                + f" {key[0]}.{key[1]}."
+            )
 
 
 def find_migration_names(max_migration_lines: list[str]) -> tuple[str, str] | None:
@@ -256,3 +338,65 @@ def migration_applied(app_label: str, migration_name: str) -> bool:
             # django_migrations table does not exist -> no migrations applied
             pass
     return False
+
+
+def diff_bytes(source: bytes, new_source: bytes, path: Path, new_path: Path) -> str:
+    return unified_diff(
+        source.decode().splitlines(keepends=True),
+        new_source.decode().splitlines(keepends=True),
+        path.name,
+        new_path.name,
+    )
+
+
+def unified_diff(
+    lines: list[str], new_lines: list[str], from_file: str, to_file: str
+) -> str:
+    return "".join(difflib.unified_diff(lines, new_lines, from_file, to_file))
+
+
+def simulate_rebase(
+    app_label: str,
+    rebased_migration_name: str,
+    new_name: str,
+    new_content: bytes,
+    rewrites: dict[tuple[str, str], bytes],
+) -> list[str]:
+    """
+    Apply the rebase to an in-memory, statically parsed copy of the migration
+    graph, and return any problems with the result.
+    """
+    migrations = {}
+    for app_config in apps.get_app_configs():
+        migration_details = MigrationDetails(app_config.label)
+        if not migration_details.has_migrations:
+            continue
+        names = migration_details.names
+        if app_config.label == app_label:
+            names = names - {rebased_migration_name}
+        for migration in load_static_migrations(
+            app_config.label, migration_details.dir, names
+        ):
+            migrations[migration.key] = migration
+
+    new_migration = parse_migration(app_label, new_name, new_content)
+    migrations[new_migration.key] = new_migration
+    for key, source in rewrites.items():
+        migrations[key] = parse_migration(key[0], key[1], source)
+
+    graph = CompactGraph.from_static(migrations.values())
+    problems = []
+    conflicts = graph.detect_conflicts().get(app_label)
+    if conflicts:
+        problems.append(
+            f"After the rebase, {app_label} would still have conflicting"
+            + f" migrations: {', '.join(conflicts)}."
+        )
+    else:
+        real_max_migration_name = graph.max_migrations([app_label]).get(app_label)
+        if real_max_migration_name != new_name:
+            problems.append(
+                f"After the rebase, {app_label}'s latest migration would be"
+                + f" {real_max_migration_name}, not {new_name}."
+            )
+    return problems
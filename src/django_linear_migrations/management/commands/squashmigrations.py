@@ -1,27 +1,60 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 from django.core.management.commands.squashmigrations import Command as BaseCommand
 
-from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.apps import first_party_app_configs
+from django_linear_migrations.discovery import scan_directory
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.locking import max_migration_write_lock
 from django_linear_migrations.management.commands import spy_on_migration_writers
+from django_linear_migrations.static import load_static_migrations
+from django_linear_migrations.storage import get_max_migration_store
 
 
 class Command(BaseCommand):
     def handle(self, **options: Any) -> None:
+        with max_migration_write_lock():
+            self.handle_locked(**options)
+
+    def handle_locked(self, **options: Any) -> None:
         with spy_on_migration_writers() as written_migrations:
             super().handle(**options)
 
+        store = get_max_migration_store()
         first_party_app_labels = {
             app_config.label for app_config in first_party_app_configs()
         }
 
-        for app_label, migration_name in written_migrations.items():
+        for app_label, migrations in written_migrations.items():
             if app_label not in first_party_app_labels:
                 continue
 
-            # A squash migration was generated, update max_migration.txt.
-            migration_details = MigrationDetails(app_label)
-            max_migration_txt = migration_details.dir / "max_migration.txt"
-            max_migration_txt.write_text(f"{migration_name}\n")
+            # A squash migration was generated, update max_migration.txt with
+            # the app's leaf, which may be a later migration if the squash
+            # did not cover the whole history.
+            migration_name, migrations_dir = migrations[-1]
+            max_migration_name = find_leaf(app_label, migrations_dir) or migration_name
+            store.write(app_label, migrations_dir, max_migration_name)
+
+
+def find_leaf(app_label: str, migrations_dir: Path) -> str | None:
+    # Statically parse only this app's migrations, rather than rebuilding the
+    # whole graph.
+    names = [
+        name for name in scan_directory(str(migrations_dir)) if name[0] not in "_~"
+    ]
+    try:
+        migrations = load_static_migrations(app_label, migrations_dir, names)
+    except ValueError:
+        return None
+    leaves = [
+        name
+        for leaf_app_label, name in CompactGraph.from_static(migrations).leaf_nodes()
+        if leaf_app_label == app_label
+    ]
+    if len(leaves) != 1:
+        return None
+    return leaves[0]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from django.conf import settings
+
+from django_linear_migrations.apps import LinearMigrationsError, MigrationDetails
+from django_linear_migrations.snapshot import migration_fingerprints
+from django_linear_migrations.storage import get_max_migration_store
+
+MANIFEST_VERSION = 1
+
+
+def get_manifest_path() -> Path | None:
+    path = getattr(settings, "LINEAR_MIGRATIONS_MANIFEST", None)
+    if path is None:
+        return None
+    return Path(path)
+
+
+def content_hash(app_labels: list[str]) -> str:
+    """
+    Hash every app’s migration files, and the first-party apps’ max
+    migrations, so any change that could affect the checks changes it.
+    """
+    sha = hashlib.sha256()
+    for app_label, fingerprint in sorted(migration_fingerprints().items()):
+        sha.update(f"{app_label}\0{fingerprint}\0".encode())
+    store = get_max_migration_store()
+    for app_label in sorted(app_labels):
+        migration_details = MigrationDetails(app_label)
+        if not migration_details.has_migrations:
+            continue
+        lines = store.read_lines(app_label, migration_details.dir)
+        sha.update(f"{app_label}\0{lines}\0".encode())
+    return sha.hexdigest()
+
+
+def write_manifest(
+    path: Path, app_labels: list[str], max_migrations: dict[str, str]
+) -> None:
+    data = {
+        "version": MANIFEST_VERSION,
+        "content_hash": content_hash(app_labels),
+        "max_migrations": max_migrations,
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def check_manifest(path: Path, app_labels: list[str]) -> list[LinearMigrationsError]:
+    try:
+        data = json.loads(path.read_text())
+    except FileNotFoundError:
+        problem = f"The migration manifest {path} does not exist."
+    except ValueError:
+        problem = f"The migration manifest {path} is invalid."
+    else:
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != MANIFEST_VERSION
+            or not isinstance(data.get("content_hash"), str)
+        ):
+            problem = f"The migration manifest {path} is invalid."
+        elif data["content_hash"] != content_hash(app_labels):
+            problem = (
+                "The migration files have changed since the migration manifest"
+                + f" {path} was created."
+            )
+        else:
+            return []
+
+    return [
+        LinearMigrationsError(
+            id="dlm.E006",
+            msg=problem,
+            hint=(
+                "Recreate it with 'python manage.py create_migration_manifest'"
+                + " as part of your build, or unset the"
+                + " LINEAR_MIGRATIONS_MANIFEST setting."
+            ),
+        )
+    ]
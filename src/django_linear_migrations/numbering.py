@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+_number_re = re.compile(r"^(\d+)_")
+_squashed_re = re.compile(r"^(\d+)_squashed_(\d+)_")
+
+
+def migration_number(name: str) -> int | None:
+    match = _number_re.match(name)
+    if match is None:
+        return None
+    return int(match[1])
+
+
+class MigrationNumbers:
+    """
+    Index of an app’s migrations by the number prefixes of their names.
+    Squashed migrations, named like '0001_squashed_0004_...', cover the
+    numbers of the migrations they replace, but don't count as duplicates of
+    them.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: dict[int, list[str]] = {}
+        # Each numbered name's number, or the last replaced number for
+        # squashed migrations.
+        self.numbers: dict[str, int] = {}
+        self.covered: set[int] = set()
+        self.unnumbered: list[str] = []
+        for name in sorted(names):
+            squashed_match = _squashed_re.match(name)
+            if squashed_match is not None:
+                start, end = int(squashed_match[1]), int(squashed_match[2])
+                self.covered.update(range(start, end + 1))
+                self.numbers[name] = end
+                continue
+            number = migration_number(name)
+            if number is None:
+                self.unnumbered.append(name)
+                continue
+            self.names.setdefault(number, []).append(name)
+            self.numbers[name] = number
+            self.covered.add(number)
+
+    @property
+    def max_number(self) -> int:
+        return max(self.covered, default=0)
+
+    def latest_names(self) -> list[str]:
+        max_number = self.max_number
+        return [name for name, number in self.numbers.items() if number == max_number]
+
+    def duplicates(self) -> dict[int, list[str]]:
+        return {number: names for number, names in self.names.items() if len(names) > 1}
+
+    def gaps(self) -> list[int]:
+        return [
+            number
+            for number in range(1, self.max_number + 1)
+            if number not in self.covered
+        ]
+
+    def next_free(self, after: int) -> int:
+        # The lowest number after the given one that no migration uses.
+        number = after + 1
+        while number in self.covered:
+            number += 1
+        return number
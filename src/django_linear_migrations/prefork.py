@@ -0,0 +1,72 @@
+"""
+Run the max migration checks once in a pre-forking server’s master process,
+so its forked workers inherit the result rather than each loading the
+migration graph.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from django.apps import apps
+from django.conf import settings
+
+from django_linear_migrations.apps import (
+    LinearMigrationsError,
+    check_max_migration_files,
+    get_cached_result,
+    set_cached_result,
+)
+
+_fork_hook_installed = False
+
+
+def detect_prefork_server() -> str | None:
+    # The pre-forking server running this process, if any.
+    if "gunicorn" in sys.modules:
+        return "gunicorn"
+    if "uwsgi" in sys.modules or "uwsgi" in sys.builtin_module_names:
+        return "uwsgi"
+    return None
+
+
+def run_checks_before_fork() -> list[LinearMigrationsError]:
+    """
+    Run the checks and cache their result for this process, and any
+    processes forked from it afterwards.
+    """
+    errors = check_max_migration_files()
+    set_cached_result(errors)
+    return errors
+
+
+def _before_fork() -> None:
+    if not apps.ready or get_cached_result() is not None:
+        return
+    try:
+        run_checks_before_fork()
+    except Exception:
+        # Leave the workers to run the checks themselves.
+        pass
+
+
+def install_fork_hook() -> None:
+    """
+    Run the checks before this process first forks, once Django is set up.
+    """
+    global _fork_hook_installed
+
+    if _fork_hook_installed or not hasattr(os, "register_at_fork"):
+        return
+    os.register_at_fork(before=_before_fork)
+    _fork_hook_installed = True
+
+
+def maybe_install_fork_hook() -> None:
+    # Opt-in, since servers don't run the system checks themselves, so
+    # running them in the master only helps projects whose workers do.
+    if not getattr(settings, "LINEAR_MIGRATIONS_PREFORK_CHECKS", False):
+        return
+    if detect_prefork_server() is not None:
+        install_fork_hook()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from types import ModuleType
+
+
+@contextmanager
+def time_migration_imports() -> Generator[dict[str, float]]:
+    """
+    Time the migration loader’s imports, mapping the names of migrations
+    packages and modules to seconds. Modules imported before only cost a
+    sys.modules lookup.
+    """
+    from django.db.migrations import loader as loader_module
+
+    timings: dict[str, float] = {}
+    orig_import_module: Callable[..., ModuleType] = loader_module.import_module  # type: ignore [attr-defined]
+
+    def timed_import_module(name: str, package: str | None = None) -> ModuleType:
+        start = time.perf_counter()
+        try:
+            return orig_import_module(name, package)
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+    loader_module.import_module = timed_import_module  # type: ignore [attr-defined]
+    try:
+        yield timings
+    finally:
+        loader_module.import_module = orig_import_module  # type: ignore [attr-defined]
+
+
+def migration_import_times(
+    timings: dict[str, float], app_labels: Iterable[str]
+) -> dict[tuple[str, str], float]:
+    # Map the timings of the apps' migration modules to their keys.
+    from django.db.migrations.loader import MigrationLoader
+
+    packages = {}
+    for app_label in app_labels:
+        module_name, _explicit = MigrationLoader.migrations_module(app_label)
+        if module_name is not None:
+            packages[module_name] = app_label
+
+    result = {}
+    for name, seconds in timings.items():
+        package_name, _, migration_name = name.rpartition(".")
+        package_app_label = packages.get(package_name)
+        if package_app_label is not None:
+            result[(package_app_label, migration_name)] = seconds
+    return result
+
+
+def app_import_times(
+    timings: dict[str, float], app_labels: Iterable[str]
+) -> dict[str, float]:
+    # Total the timings of each app's migrations package and modules.
+    from django.db.migrations.loader import MigrationLoader
+
+    app_labels = list(app_labels)
+    totals = dict.fromkeys(app_labels, 0.0)
+    for app_label in app_labels:
+        module_name, _explicit = MigrationLoader.migrations_module(app_label)
+        if module_name is not None:
+            totals[app_label] += timings.get(module_name, 0.0)
+    for (app_label, _name), seconds in migration_import_times(
+        timings, app_labels
+    ).items():
+        totals[app_label] += seconds
+    return totals
@@ -0,0 +1,104 @@
+"""
+An opt-in pytest plugin that runs the max migration checks once per test
+session, rather than in every process. Enable it with:
+
+    pytest -p django_linear_migrations.pytest_plugin
+
+With pytest-xdist, the controller runs the checks and shares the result with
+the workers through a temporary file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+RESULT_PATH_KEY = "linear_migrations_result_path"
+RESULT_PATH_ATTRIBUTE = "_linear_migrations_result_path"
+
+
+def django_ready() -> bool:
+    try:
+        from django.apps import apps
+    except ImportError:  # pragma: no cover
+        return False
+    return apps.ready
+
+
+def write_result(path: Path) -> None:
+    from django_linear_migrations.apps import (
+        check_max_migration_files,
+        set_cached_result,
+    )
+
+    errors = check_max_migration_files()
+    set_cached_result(errors)
+    path.write_text(json.dumps([error.as_dict() for error in errors]))
+
+
+def read_result(path: Path) -> None:
+    from django_linear_migrations.apps import LinearMigrationsError, set_cached_result
+
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        # Run the checks as normal
+        return
+    set_cached_result([LinearMigrationsError.from_dict(item) for item in data])
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config: pytest.Config) -> None:
+    if not django_ready():
+        return
+
+    workerinput: dict[str, Any] | None = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        path = workerinput.get(RESULT_PATH_KEY)
+        if path is not None:
+            read_result(Path(path))
+            return
+        # The controller didn't run the checks, such as when it hasn't set up
+        # Django, so the first worker to get here runs them for the others.
+        from django_linear_migrations.locking import max_migration_write_lock
+
+        testrunuid = workerinput.get("testrunuid", "")
+        shared_path = Path(tempfile.gettempdir()) / (
+            f"django-linear-migrations-{testrunuid}.json"
+        )
+        with max_migration_write_lock():
+            if shared_path.exists():
+                read_result(shared_path)
+            else:
+                write_result(shared_path)
+                # pytest-xdist only schedules tests once every worker has
+                # started, so all have read the result before this one ends.
+                setattr(config, RESULT_PATH_ATTRIBUTE, str(shared_path))
+        return
+
+    fd, path = tempfile.mkstemp(prefix="django-linear-migrations-", suffix=".json")
+    os.close(fd)
+    setattr(config, RESULT_PATH_ATTRIBUTE, path)
+    write_result(Path(path))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    # pytest-xdist hook, run in the controller for each worker
+    path = getattr(node.config, RESULT_PATH_ATTRIBUTE, None)
+    if path is not None:
+        node.workerinput[RESULT_PATH_KEY] = path
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    path = getattr(config, RESULT_PATH_ATTRIBUTE, None)
+    if path is not None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
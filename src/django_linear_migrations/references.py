@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+from django_linear_migrations.apps import MigrationDetails, first_party_app_configs
+from django_linear_migrations.editor import SourceEditor
+from django_linear_migrations.static import (
+    StaticMigration,
+    find_migration_class,
+    parse_migration,
+)
+
+Key = tuple[str, str]
+
+REFERENCE_ATTRS = ("dependencies", "replaces", "run_before")
+
+
+def parse_migration_file(app_label: str, path: Path) -> StaticMigration | None:
+    try:
+        return parse_migration(app_label, path.stem, path.read_bytes())
+    except ValueError:
+        # Unparseable files can't be rewritten either.
+        return None
+
+
+class ReferenceIndex:
+    """
+    Maps migration keys to the files of the migrations that reference them,
+    in their dependencies, replaces, or run_before.
+    """
+
+    def __init__(self) -> None:
+        self.references: dict[Key, dict[Path, Key]] = {}
+
+    def add(self, path: Path, migration: StaticMigration) -> None:
+        for attr in REFERENCE_ATTRS:
+            for key in getattr(migration, attr):
+                self.references.setdefault(key, {})[path] = migration.key
+
+    def referencing(self, key: Key) -> dict[Path, Key]:
+        # Mapping of paths to the keys of their migrations.
+        return self.references.get(key, {})
+
+    @classmethod
+    def build(cls) -> ReferenceIndex:
+        # Only first-party apps' migrations, since they're the ones that can
+        # reference unmerged migrations, and the ones we can edit.
+        index = cls()
+        for app_config in first_party_app_configs():
+            migration_details = MigrationDetails(app_config.label)
+            if not migration_details.has_migrations:
+                continue
+            for name in sorted(migration_details.names):
+                path = migration_details.dir / f"{name}.py"
+                if not path.exists():
+                    # Sourceless migration
+                    continue
+                migration = parse_migration_file(app_config.label, path)
+                if migration is not None:
+                    index.add(path, migration)
+        return index
+
+
+def find_reference_nodes(source: bytes, key: Key) -> list[ast.Constant]:
+    # The name constants of the tuples referencing key.
+    module_def = ast.parse(source)
+    class_def = find_migration_class(module_def)
+    if class_def is None:
+        return []
+
+    nodes = []
+    for node in class_def.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+        elif isinstance(node, ast.AnnAssign):
+            target = node.target
+        else:
+            continue
+        if (
+            not isinstance(target, ast.Name)
+            or target.id not in REFERENCE_ATTRS
+            or not isinstance(node.value, (ast.List, ast.Tuple))
+        ):
+            continue
+        for element in node.value.elts:
+            if (
+                isinstance(element, (ast.Tuple, ast.List))
+                and len(element.elts) == 2
+                and all(
+                    isinstance(el, ast.Constant) and el.value == value
+                    for el, value in zip(element.elts, key)
+                )
+            ):
+                name_node = element.elts[1]
+                assert isinstance(name_node, ast.Constant)
+                nodes.append(name_node)
+    return nodes
+
+
+def rename_references(source: bytes, key: Key, new_name: str) -> bytes:
+    """
+    Rewrite references to the migration key in source to use new_name, in a
+    single pass over the source.
+    """
+    nodes = find_reference_nodes(source, key)
+    if not nodes:
+        return source
+
+    editor = SourceEditor(source)
+    for node in nodes:
+        # Keep the literal's quoting style.
+        literal = editor.segment(node)
+        editor.replace(node, literal.replace(key[1].encode(), new_name.encode()))
+    return editor.apply()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+
+from django_linear_migrations.apps import MigrationDetails
+from django_linear_migrations.graph import CompactGraph
+
+SNAPSHOT_VERSION = 1
+
+
+class GraphSummary:
+    """
+    The parts of the migration graph that the checks need: each app’s leaf
+    nodes, the conflicts, and the latest migration of each first-party app in
+    plan order.
+    """
+
+    __slots__ = ("leaves", "conflicts", "max_migrations", "migrations")
+
+    def __init__(
+        self,
+        *,
+        leaves: dict[str, list[str]],
+        conflicts: dict[str, list[str]],
+        max_migrations: dict[str, str],
+        migrations: int,
+    ) -> None:
+        self.leaves = leaves
+        self.conflicts = conflicts
+        self.max_migrations = max_migrations
+        self.migrations = migrations
+
+    @classmethod
+    def from_graph(cls, graph: CompactGraph, app_labels: list[str]) -> GraphSummary:
+        leaves: dict[str, list[str]] = {}
+        for app_label, name in graph.leaf_nodes():
+            leaves.setdefault(app_label, []).append(name)
+        return cls(
+            leaves=leaves,
+            conflicts=graph.detect_conflicts(),
+            max_migrations={
+                app_label: name
+                for app_label, name in graph.max_migrations(app_labels).items()
+                if app_label in app_labels
+            },
+            migrations=len(graph),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "leaves": self.leaves,
+            "conflicts": self.conflicts,
+            "max_migrations": self.max_migrations,
+            "migrations": self.migrations,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GraphSummary:
+        return cls(
+            leaves=data["leaves"],
+            conflicts=data["conflicts"],
+            max_migrations=data["max_migrations"],
+            migrations=data["migrations"],
+        )
+
+
+def get_snapshot_path() -> Path | None:
+    path = getattr(settings, "LINEAR_MIGRATIONS_SNAPSHOT", None)
+    if path is None:
+        return None
+    return Path(path)
+
+
+def fingerprint_migrations(migrations_dir: Path, names: Iterable[str]) -> str:
+    sha = hashlib.sha256()
+    for name in sorted(names):
+        sha.update(name.encode())
+        sha.update(b"\0")
+        try:
+            sha.update((migrations_dir / f"{name}.py").read_bytes())
+        except FileNotFoundError:
+            # Sourceless migration
+            pass
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def migration_fingerprints() -> dict[str, str]:
+    # Fingerprint every app's migrations, since any of them can affect the
+    # graph.
+    fingerprints = {}
+    for app_config in apps.get_app_configs():
+        migration_details = MigrationDetails(app_config.label)
+        if not migration_details.has_migrations:
+            continue
+        fingerprints[app_config.label] = fingerprint_migrations(
+            migration_details.dir, migration_details.names
+        )
+    return fingerprints
+
+
+def write_snapshot(path: Path, summary: GraphSummary, app_labels: list[str]) -> None:
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "first_party_app_labels": sorted(app_labels),
+        "fingerprints": migration_fingerprints(),
+        **summary.as_dict(),
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+# The types of the keys a snapshot needs.
+SNAPSHOT_KEYS = {
+    "first_party_app_labels": list,
+    "fingerprints": dict,
+    "leaves": dict,
+    "conflicts": dict,
+    "max_migrations": dict,
+    "migrations": int,
+}
+
+
+def read_snapshot(path: Path) -> dict[str, Any] | None:
+    # Return None if the snapshot is missing, unreadable, from another
+    # version, or malformed.
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    if not all(
+        isinstance(data.get(key), key_type) for key, key_type in SNAPSHOT_KEYS.items()
+    ):
+        return None
+    return data
+
+
+def load_snapshot(path: Path, app_labels: list[str]) -> GraphSummary | None:
+    # Return None if the snapshot is missing, unreadable, or stale.
+    data = read_snapshot(path)
+    if (
+        data is None
+        or data.get("first_party_app_labels") != sorted(app_labels)
+        or data.get("fingerprints") != migration_fingerprints()
+    ):
+        return None
+    return GraphSummary.from_dict(data)
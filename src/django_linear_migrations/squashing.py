@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django_linear_migrations.graph import CompactGraph, Key
+
+
+class SquashPlan(NamedTuple):
+    app_label: str
+    migrations: int
+    seconds: float
+    start: str | None
+    end: str | None
+    squashed: int
+    reason: str | None
+
+
+def plan_squashes(
+    graph: CompactGraph,
+    app_labels: Iterable[str],
+    *,
+    replacing: Iterable[Key] = (),
+    costs: dict[str, float] | None = None,
+    min_migrations: int = 2,
+) -> list[SquashPlan]:
+    """
+    Propose a range of migrations to squash for each of the given apps,
+    costliest first. Each range starts after the app’s latest squashed
+    migration, and stops before any migration that would make the squashed
+    migration depend on itself through other apps’ migrations, including
+    through the squashes proposed for costlier apps.
+    """
+    if costs is None:
+        costs = {}
+    replacing = set(replacing)
+    min_migrations = max(min_migrations, 2)
+
+    chains: dict[str, list[int]] = {}
+    for node_id in graph.plan_ids():
+        app_label = graph.app_labels[graph.node_apps[node_id]]
+        chains.setdefault(app_label, []).append(node_id)
+    conflicts = graph.detect_conflicts()
+
+    # Node IDs of the proposed squashes, which later apps must treat as
+    # single nodes.
+    groups: dict[int, list[int]] = {}
+
+    plans = []
+    ranked = sorted(
+        (app_label for app_label in app_labels if app_label in chains),
+        key=lambda app_label: (
+            -costs.get(app_label, 0.0),
+            -len(chains[app_label]),
+            app_label,
+        ),
+    )
+    for app_label in ranked:
+        chain = chains[app_label]
+        start = 0
+        for i, node_id in enumerate(chain):
+            if graph.key(node_id) in replacing:
+                start = i + 1
+
+        end = start
+        if app_label not in conflicts:
+            highest = _HighestAncestor(graph, chain, groups)
+            app_id = graph.node_apps[chain[0]]
+            while end < len(chain) and all(
+                highest(parent_id) < start
+                for parent_id in graph.parents(chain[end])
+                if graph.node_apps[parent_id] != app_id
+            ):
+                end += 1
+
+        squashed = end - start
+        if app_label in conflicts:
+            reason = "it has conflicting migrations"
+        elif squashed < min_migrations:
+            if end < len(chain):
+                reason = (
+                    f"{graph.node_names[chain[end]]} depends on its earlier"
+                    + " migrations through another app"
+                )
+            else:
+                reason = f"fewer than {min_migrations} migrations to squash"
+        else:
+            reason = None
+            group = list(chain[start:end])
+            for node_id in group:
+                groups[node_id] = group
+
+        plans.append(
+            SquashPlan(
+                app_label=app_label,
+                migrations=len(chain),
+                seconds=costs.get(app_label, 0.0),
+                start=None if reason else graph.node_names[chain[start]],
+                end=None if reason else graph.node_names[chain[end - 1]],
+                squashed=0 if reason else squashed,
+                reason=reason,
+            )
+        )
+    return plans
+
+
+class _HighestAncestor:
+    # The highest position in an app's chain of a node's ancestors, found
+    # without passing through the app's own migrations, or -1 if none.
+
+    def __init__(
+        self, graph: CompactGraph, chain: list[int], groups: dict[int, list[int]]
+    ) -> None:
+        self.graph = graph
+        self.positions = {node_id: i for i, node_id in enumerate(chain)}
+        self.groups = groups
+        self.memo: dict[int, int] = {}
+
+    def parents(self, node_id: int) -> set[int]:
+        members = self.groups.get(node_id, [node_id])
+        return {
+            parent_id
+            for member_id in members
+            for parent_id in self.graph.parents(member_id)
+        }.difference(members)
+
+    def value(self, node_id: int) -> int:
+        position = self.positions.get(node_id)
+        if position is not None:
+            return position
+        return self.memo[node_id]
+
+    def __call__(self, node_id: int) -> int:
+        positions = self.positions
+        memo = self.memo
+        stack = [node_id]
+        while stack:
+            current = stack[-1]
+            if current in memo or current in positions:
+                stack.pop()
+                continue
+            parents = self.parents(current)
+            pending = [
+                parent_id
+                for parent_id in parents
+                if parent_id not in memo and parent_id not in positions
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            highest = max((self.value(parent_id) for parent_id in parents), default=-1)
+            for member_id in self.groups.get(current, [current]):
+                memo[member_id] = highest
+        return self.value(node_id)
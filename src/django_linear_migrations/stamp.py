@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+
+from django_linear_migrations.apps import MigrationDetails
+from django_linear_migrations.storage import get_lock_file_path
+
+
+def get_stamp_path() -> Path | None:
+    path = getattr(settings, "LINEAR_MIGRATIONS_STAMP", None)
+    if path is None:
+        return None
+    return Path(path)
+
+
+def listing_hash() -> str:
+    """
+    Hash the names and sizes of the files in every app’s migrations
+    directory, and the lock file’s size. Unlike content hashes, this only
+    needs directory listings, not file reads.
+    """
+    sha = hashlib.sha256()
+    for app_config in apps.get_app_configs():
+        migration_details = MigrationDetails(app_config.label)
+        if not migration_details.has_migrations:
+            continue
+        sha.update(f"{app_config.label}\0".encode())
+        try:
+            with os.scandir(migration_details.dir) as entries:
+                files = sorted(
+                    (entry.name, entry.stat().st_size)
+                    for entry in entries
+                    if entry.is_file()
+                )
+        except NotADirectoryError:
+            # Migrations in a zip file, which can't change
+            continue
+        for name, size in files:
+            sha.update(f"{name}\0{size}\0".encode())
+
+    lock_file_path = get_lock_file_path()
+    if lock_file_path is not None:
+        try:
+            size = lock_file_path.stat().st_size
+        except FileNotFoundError:
+            size = -1
+        sha.update(f"\0lock file\0{size}\0".encode())
+    return sha.hexdigest()
+
+
+def write_stamp(path: Path) -> None:
+    path.write_text(listing_hash() + "\n")
+
+
+def stamp_matches(path: Path) -> bool:
+    try:
+        stamp = path.read_text().strip()
+    except FileNotFoundError:
+        return False
+    return stamp == listing_hash()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import ast
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from django.conf import settings
+
+
+class StaticMigration:
+    """
+    The graph-relevant attributes of a migration, parsed from its source code
+    without importing it.
+    """
+
+    __slots__ = (
+        "app_label",
+        "name",
+        "dependencies",
+        "replaces",
+        "run_before",
+        "dynamic",
+    )
+
+    def __init__(
+        self,
+        app_label: str,
+        name: str,
+        *,
+        dependencies: list[tuple[str, str]],
+        replaces: list[tuple[str, str]],
+        run_before: list[tuple[str, str]],
+        dynamic: bool = False,
+    ) -> None:
+        self.app_label = sys.intern(app_label)
+        self.name = sys.intern(name)
+        self.dependencies = dependencies
+        self.replaces = replaces
+        self.run_before = run_before
+        # Whether any attribute contained values that could not be parsed
+        # statically, and were skipped.
+        self.dynamic = dynamic
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.app_label, self.name)
+
+    def __repr__(self) -> str:
+        return f"<StaticMigration {self.app_label}.{self.name}>"
+
+
+def find_migration_class(module_def: ast.Module) -> ast.ClassDef | None:
+    class_defs = [
+        node
+        for node in module_def.body
+        if isinstance(node, ast.ClassDef) and node.name == "Migration"
+    ]
+    if len(class_defs) != 1:
+        return None
+    return class_defs[0]
+
+
+def parse_migration(app_label: str, name: str, source: str | bytes) -> StaticMigration:
+    try:
+        module_def = ast.parse(source)
+    except SyntaxError as exc:
+        raise ValueError(f"Could not parse migration {app_label}.{name}.") from exc
+
+    class_def = find_migration_class(module_def)
+    if class_def is None:
+        raise ValueError(
+            f"Could not find a single Migration class in {app_label}.{name}."
+        )
+
+    values: dict[str, ast.expr] = {}
+    for node in class_def.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+        ):
+            values[node.targets[0].id] = node.value
+        elif (
+            isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and node.value is not None
+        ):
+            values[node.target.id] = node.value
+
+    dynamic = False
+    parsed: dict[str, list[tuple[str, str]]] = {}
+    for attr in ("dependencies", "replaces", "run_before"):
+        keys, attr_dynamic = _parse_keys(values.get(attr))
+        parsed[attr] = keys
+        dynamic = dynamic or attr_dynamic
+
+    return StaticMigration(
+        app_label,
+        name,
+        dependencies=parsed["dependencies"],
+        replaces=parsed["replaces"],
+        run_before=parsed["run_before"],
+        dynamic=dynamic,
+    )
+
+
+def _parse_keys(node: ast.expr | None) -> tuple[list[tuple[str, str]], bool]:
+    if node is None:
+        return [], False
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return [], True
+
+    keys = []
+    dynamic = False
+    for element in node.elts:
+        key = _parse_key(element)
+        if key is None:
+            dynamic = True
+        else:
+            keys.append(key)
+    return keys, dynamic
+
+
+def _parse_key(node: ast.expr) -> tuple[str, str] | None:
+    if isinstance(node, (ast.Tuple, ast.List)):
+        values = [
+            el.value
+            for el in node.elts
+            if isinstance(el, ast.Constant) and isinstance(el.value, str)
+        ]
+        if len(node.elts) == 2 and len(values) == 2:
+            return (sys.intern(values[0]), sys.intern(values[1]))
+        return None
+
+    # migrations.swappable_dependency(settings.AUTH_USER_MODEL)
+    if (
+        isinstance(node, ast.Call)
+        and (
+            (isinstance(node.func, ast.Name) and node.func.id == "swappable_dependency")
+            or (
+                isinstance(node.func, ast.Attribute)
+                and node.func.attr == "swappable_dependency"
+            )
+        )
+        and len(node.args) == 1
+        and not node.keywords
+        and isinstance(node.args[0], ast.Attribute)
+        and isinstance(node.args[0].value, ast.Name)
+        and node.args[0].value.id == "settings"
+    ):
+        value = getattr(settings, node.args[0].attr, None)
+        if isinstance(value, str):
+            return (sys.intern(value.split(".", 1)[0]), "__first__")
+    return None
+
+
+def load_static_migrations(
+    app_label: str, migrations_dir: Path, names: Iterable[str]
+) -> list[StaticMigration]:
+    def read_source(name: str) -> bytes | None:
+        try:
+            return (migrations_dir / f"{name}.py").read_bytes()
+        except FileNotFoundError:
+            # Sourceless migration
+            return None
+
+    return parse_static_migrations(app_label, names, read_source)
+
+
+def parse_static_migrations(
+    app_label: str,
+    names: Iterable[str],
+    read_source: Callable[[str], bytes | None],
+) -> list[StaticMigration]:
+    # Parse likely squashed migrations first, so the sources of the
+    # migrations they replace can be skipped. Without a database connection,
+    # replacing migrations are always used, so the replaced ones never affect
+    # the graph.
+    ordered_names = sorted(names, key=lambda name: ("_squashed_" not in name, name))
+    replaced: set[str] = set()
+    migrations = []
+    for name in ordered_names:
+        if name in replaced:
+            continue
+        source = read_source(name)
+        if source is None:
+            continue
+        migration = parse_migration(app_label, name, source)
+        replaced.update(
+            replaced_name
+            for replaced_app_label, replaced_name in migration.replaces
+            if replaced_app_label == app_label
+        )
+        migrations.append(migration)
+    return migrations
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Container
+from pathlib import Path
+
+from django.conf import settings
+
+
+class MaxMigrationStore:
+    """
+    Reads and writes the names of apps’ latest migrations, in per-app
+    max_migration.txt files.
+    """
+
+    def describe(self, app_label: str) -> str:
+        return "max_migration.txt"
+
+    def read_lines(self, app_label: str, migrations_dir: Path) -> list[str] | None:
+        max_migration_txt = migrations_dir / "max_migration.txt"
+        try:
+            content = max_migration_txt.read_text()
+        except (FileNotFoundError, NotADirectoryError):
+            # NotADirectoryError for migrations in zip files
+            return None
+        return content.strip().splitlines()
+
+    def write(self, app_label: str, migrations_dir: Path, name: str) -> None:
+        (migrations_dir / "max_migration.txt").write_text(f"{name}\n")
+
+    def write_many(self, names: dict[str, tuple[Path, str]]) -> None:
+        # Mapping of app labels to (migrations_dir, name) pairs.
+        for app_label, (migrations_dir, name) in names.items():
+            self.write(app_label, migrations_dir, name)
+
+    def delete(self, app_label: str, migrations_dir: Path) -> None:
+        (migrations_dir / "max_migration.txt").unlink(missing_ok=True)
+
+    def delete_many(self, migrations_dirs: dict[str, Path]) -> None:
+        # Mapping of app labels to migrations_dir.
+        for app_label, migrations_dir in migrations_dirs.items():
+            self.delete(app_label, migrations_dir)
+
+
+class LockFileStore(MaxMigrationStore):
+    """
+    Reads and writes the names of apps’ latest migrations in a single
+    project-level lock file, with one sorted "<app_label>: <migration_name>"
+    line per app. Sorting keeps merge conflicts local to the conflicting
+    apps’ lines.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, list[str]] | None = None
+
+    def describe(self, app_label: str) -> str:
+        return f"{self.path.name} entry"
+
+    def entries(self) -> dict[str, list[str]]:
+        # Cached, so checking all apps reads the file once.
+        if self._entries is None:
+            try:
+                content = self.path.read_text()
+            except FileNotFoundError:
+                content = ""
+            self._entries = parse_lock_file(content)
+        return self._entries
+
+    def read_lines(self, app_label: str, migrations_dir: Path) -> list[str] | None:
+        return self.entries().get(app_label)
+
+    def write(self, app_label: str, migrations_dir: Path, name: str) -> None:
+        self.write_many({app_label: (migrations_dir, name)})
+
+    def write_many(self, names: dict[str, tuple[Path, str]]) -> None:
+        # Rewrite the file once for all apps.
+        try:
+            lines = self.path.read_text().splitlines()
+        except FileNotFoundError:
+            lines = []
+        lines = _remove_entries(lines, names.keys())
+        for app_label, (_migrations_dir, name) in sorted(names.items()):
+            _insert_entry(lines, app_label, name)
+        self.path.write_text("".join(f"{line}\n" for line in lines))
+        self._entries = None
+
+    def delete(self, app_label: str, migrations_dir: Path) -> None:
+        self.delete_many({app_label: migrations_dir})
+
+    def delete_many(self, migrations_dirs: dict[str, Path]) -> None:
+        try:
+            lines = self.path.read_text().splitlines()
+        except FileNotFoundError:
+            return
+        lines = _remove_entries(lines, migrations_dirs.keys())
+        if any(_parse_entry(line) for line in lines):
+            self.path.write_text("".join(f"{line}\n" for line in lines))
+        else:
+            self.path.unlink()
+        self._entries = None
+
+
+def get_lock_file_path() -> Path | None:
+    path = getattr(settings, "LINEAR_MIGRATIONS_LOCK_FILE", None)
+    if path is None:
+        return None
+    return Path(path)
+
+
+def get_max_migration_store() -> MaxMigrationStore:
+    lock_file_path = get_lock_file_path()
+    if lock_file_path is None:
+        return MaxMigrationStore()
+    return LockFileStore(lock_file_path)
+
+
+def parse_lock_file(content: str) -> dict[str, list[str]]:
+    """
+    Parse a lock file into a mapping of app labels to max_migration.txt-style
+    lines. Apps with different entries on each side of a merge conflict get
+    the conflict markers, like a conflicted max_migration.txt would have.
+    """
+    entries: dict[str, list[str]] = {}
+    # Within a conflict, entries from "ours", the base (for diff3 style), and
+    # "theirs".
+    sides: list[dict[str, list[str]]] | None = None
+    start_marker = ""
+    for line in content.splitlines():
+        if line.startswith("<<<<<<<"):
+            sides = [{}]
+            start_marker = line
+        elif sides is not None and line.startswith(("|||||||", "=======")):
+            sides.append({})
+        elif sides is not None and line.startswith(">>>>>>>"):
+            ours, theirs = sides[0], sides[-1]
+            for app_label in sorted(ours.keys() | theirs.keys()):
+                our_names = ours.get(app_label, [])
+                their_names = theirs.get(app_label, [])
+                app_lines = entries.setdefault(app_label, [])
+                if our_names and their_names and our_names != their_names:
+                    app_lines.extend(
+                        [start_marker, *our_names, "=======", *their_names, line]
+                    )
+                else:
+                    app_lines.extend(our_names or their_names)
+            sides = None
+        else:
+            parsed = _parse_entry(line)
+            if parsed is None:
+                continue
+            app_label, name = parsed
+            target = entries if sides is None else sides[-1]
+            target.setdefault(app_label, []).append(name)
+    return entries
+
+
+CONFLICT_MARKERS = ("<<<<<<<", "|||||||", "=======", ">>>>>>>")
+
+
+def _parse_entry(line: str) -> tuple[str, str] | None:
+    if not line.strip() or line.startswith(("#", *CONFLICT_MARKERS)):
+        return None
+    app_label, sep, name = line.partition(":")
+    if not sep:
+        return None
+    return app_label.strip(), name.strip()
+
+
+def _remove_entries(lines: list[str], app_labels: Container[str]) -> list[str]:
+    kept = []
+    for line in lines:
+        parsed = _parse_entry(line)
+        if parsed is not None and parsed[0] in app_labels:
+            continue
+        kept.append(line)
+
+    # Drop any conflict blocks left without entries.
+    result: list[str] = []
+    block: list[str] | None = None
+    for line in kept:
+        if line.startswith("<<<<<<<"):
+            block = [line]
+        elif block is not None:
+            block.append(line)
+            if line.startswith(">>>>>>>"):
+                if any(_parse_entry(block_line) for block_line in block):
+                    result.extend(block)
+                block = None
+        else:
+            result.append(line)
+    if block is not None:
+        result.extend(block)
+    return result
+
+
+def _insert_entry(lines: list[str], app_label: str, name: str) -> None:
+    # Insert in sorted position, before any conflict block that contains a
+    # later entry.
+    block_start: int | None = None
+    index = len(lines)
+    for i, line in enumerate(lines):
+        if line.startswith("<<<<<<<"):
+            block_start = i
+        elif line.startswith(">>>>>>>"):
+            block_start = None
+        parsed = _parse_entry(line)
+        if parsed is not None and parsed[0] > app_label:
+            index = i if block_start is None else block_start
+            break
+    lines.insert(index, f"{app_label}: {name}")
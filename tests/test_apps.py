@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from textwrap import dedent
+from unittest import mock
+
+import pytest
 from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
 from django.test import SimpleTestCase
 from django.test.utils import override_settings
 
-from django_linear_migrations.apps import is_first_party_app_config
+from django_linear_migrations.apps import (
+    get_shard,
+    in_shard,
+    is_first_party_app_config,
+    parse_shard,
+)
 
 
 class IsFirstPartyAppConfigTests(SimpleTestCase):
@@ -31,3 +44,72 @@ class IsFirstPartyAppConfigTests(SimpleTestCase):
         app_config = apps.get_app_config("testapp")
 
         assert is_first_party_app_config(app_config)
+
+
+class ImportTests(SimpleTestCase):
+    def test_setup_does_not_import_migration_loader(self):
+        # Run in a fresh interpreter, since the test process has already
+        # imported the migration loader.
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                dedent(
+                    """\
+                    import sys
+                    import django
+                    django.setup()
+                    assert "django_linear_migrations.apps" in sys.modules
+                    print("django.db.migrations.loader" in sys.modules)
+                    """
+                ),
+            ],
+            capture_output=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "tests.settings"},
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == "False\n"
+
+
+class ShardTests(SimpleTestCase):
+    def test_parse_shard(self):
+        assert parse_shard("1/3") == (1, 3)
+
+    def test_parse_shard_invalid(self):
+        for value in ("", "1", "a/b", "0/2", "3/2"):
+            with pytest.raises(ValueError) as excinfo:
+                parse_shard(value)
+
+            assert excinfo.value.args[0] == (
+                f"Invalid shard {value!r}, should be in the form 'i/n'."
+            )
+
+    def test_get_shard_unset(self):
+        assert get_shard() is None
+
+    @override_settings(LINEAR_MIGRATIONS_SHARD="2/4")
+    def test_get_shard_setting(self):
+        assert get_shard() == (2, 4)
+
+    def test_get_shard_env_var(self):
+        with mock.patch.dict(os.environ, {"LINEAR_MIGRATIONS_SHARD": "1/2"}):
+            assert get_shard() == (1, 2)
+
+    @override_settings(LINEAR_MIGRATIONS_SHARD="nope")
+    def test_get_shard_invalid(self):
+        with pytest.raises(ImproperlyConfigured):
+            get_shard()
+
+    def test_in_shard_partitions(self):
+        labels = [f"app{i}" for i in range(20)]
+
+        shards = [
+            {label for label in labels if in_shard(label, (index, 3))}
+            for index in (1, 2, 3)
+        ]
+
+        assert set().union(*shards) == set(labels)
+        assert sum(len(shard) for shard in shards) == len(labels)
+        assert all(in_shard(label, None) for label in labels)
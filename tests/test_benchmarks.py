@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from collections.abc import Callable
+from pathlib import Path
+from textwrap import dedent
+
+from django.test import TestCase, override_settings
+
+from django_linear_migrations.apps import check_max_migration_files
+
+# Regression benchmarks for import and check times, run in CI by the
+# benchmarks tox environment, or locally with:
+#
+#   DLM_BENCHMARK=1 python -m pytest tests/test_benchmarks.py
+#
+# Times are compared as multiples of a calibration workload, so the
+# baselines carry across machines. After an intentional change, update the
+# baselines by also setting DLM_BENCHMARK_UPDATE=1.
+BASELINES_PATH = Path(__file__).parent / "benchmark_baselines.json"
+
+# How many times slower than the baseline a benchmark may be.
+THRESHOLD = float(os.environ.get("DLM_BENCHMARK_THRESHOLD", "2.0"))
+
+UPDATE = os.environ.get("DLM_BENCHMARK_UPDATE") == "1"
+
+
+def skip_reason() -> str | None:
+    if os.environ.get("DLM_BENCHMARK") != "1":
+        return "Set DLM_BENCHMARK=1 to run benchmarks."
+    # Tracing, as by coverage, slows Python code but not the calibration's C
+    # code, so the timings aren't comparable.
+    if sys.gettrace() is not None or "coverage" in sys.modules:
+        return "Benchmarks can't run with a tracer or coverage active."
+    return None
+
+
+# Modules django_linear_migrations.apps needs anyway, imported first so the
+# import time only covers our own modules and what they add.
+PRELOADED_MODULES = [
+    "django.apps",
+    "django.conf",
+    "django.core.checks",
+    "django.core.exceptions",
+    "django.core.signals",
+    "django.dispatch",
+    "django.utils.functional",
+]
+
+migration_template = dedent(
+    """\
+    from django.db import migrations
+
+
+    class Migration(migrations.Migration):
+        dependencies = {dependencies}
+        operations = []
+    """
+)
+
+
+def best_of(func: Callable[[], float], runs: int = 5) -> float:
+    return min(func() for _ in range(runs))
+
+
+def time_calibration() -> float:
+    source = migration_template.format(dependencies="[('testapp', '0001_initial')]")
+    start = time.perf_counter()
+    for _ in range(500):
+        ast.parse(source)
+    return time.perf_counter() - start
+
+
+def time_import() -> float:
+    code = (
+        f"import {', '.join(PRELOADED_MODULES)}; import django_linear_migrations.apps"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    microseconds = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        # Lines are like "import time: <self> | <cumulative> | <name>", with
+        # names indented by their import depth.
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        top_level = not name[1:].startswith(" ")
+        if top_level and name.strip().startswith("django_linear_migrations"):
+            microseconds += int(cumulative)
+    return microseconds / 1_000_000
+
+
+def write_linear_app(migrations_dir: Path, count: int) -> None:
+    migrations_dir.mkdir()
+    (migrations_dir / "__init__.py").touch()
+    dependencies: list[tuple[str, str]] = []
+    for number in range(1, count + 1):
+        name = f"{number:04}_step"
+        (migrations_dir / f"{name}.py").write_text(
+            migration_template.format(dependencies=dependencies)
+        )
+        dependencies = [("testapp", name)]
+    (migrations_dir / "max_migration.txt").write_text(f"{count:04}_step\n")
+
+
+def time_check(count: int) -> float:
+    # Each run uses a new migrations package, so includes importing the
+    # migrations, as in a new process.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        module_name = "migrations" + str(time.time()).replace(".", "")
+        write_linear_app(Path(tmp_dir) / module_name, count)
+        sys.path.insert(0, tmp_dir)
+        try:
+            with override_settings(MIGRATION_MODULES={"testapp": module_name}):
+                start = time.perf_counter()
+                errors = check_max_migration_files(full=True)
+                seconds = time.perf_counter() - start
+        finally:
+            sys.path.remove(tmp_dir)
+            for name in list(sys.modules):
+                if name == module_name or name.startswith(f"{module_name}."):
+                    del sys.modules[name]
+    assert errors == []
+    return seconds
+
+
+class BenchmarkTests(TestCase):
+    calibration: float
+    baselines: dict[str, float]
+
+    @classmethod
+    def setUpClass(cls):
+        reason = skip_reason()
+        if reason is not None:
+            raise unittest.SkipTest(reason)
+        super().setUpClass()
+        cls.calibration = best_of(time_calibration)
+        try:
+            cls.baselines = json.loads(BASELINES_PATH.read_text())
+        except FileNotFoundError:
+            cls.baselines = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE:
+            BASELINES_PATH.write_text(
+                json.dumps(cls.baselines, indent=2, sort_keys=True) + "\n"
+            )
+        super().tearDownClass()
+
+    def compare(self, name: str, seconds: float) -> None:
+        relative = round(seconds / self.calibration, 3)
+        if UPDATE:
+            self.baselines[name] = relative
+            return
+        baseline = self.baselines[name]
+        assert relative <= baseline * THRESHOLD, (
+            f"{name} took {relative}x the calibration time, over {THRESHOLD}"
+            + f" times its baseline of {baseline}x."
+        )
+
+    def test_import(self):
+        self.compare("import", best_of(time_import))
+
+    def test_check_100(self):
+        self.compare("check_100", best_of(lambda: time_check(100)))
+
+    def test_check_500(self):
+        self.compare("check_500", best_of(lambda: time_check(500), runs=3))
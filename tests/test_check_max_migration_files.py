@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from textwrap import dedent
+
+import pytest
+from django.core.management import CommandError
+from django.test import TestCase
+
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class CheckMaxMigrationFilesTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+
+    call_command = staticmethod(partial(run_command, "check_max_migration_files"))
+
+    def write_migrations(self) -> None:
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_updates.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+
+    def test_bad_app_label(self):
+        out, err, returncode = self.call_command("nonexistent")
+
+        assert out == ""
+        assert err == "No installed app with label 'nonexistent'.\n"
+        assert returncode == 2
+
+    def test_text_okay(self):
+        self.write_migrations()
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert err == ""
+        assert returncode == 0
+
+    def test_text_error(self):
+        self.write_migrations()
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert out.startswith(
+            "?: (dlm.E004) testapp's max_migration.txt contains '0001_initial',"
+        )
+        assert err == ""
+        assert returncode == 1
+
+    def test_json(self):
+        self.write_migrations()
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+        out, err, returncode = self.call_command("--format", "json")
+
+        assert returncode == 1
+        data = json.loads(out)
+        assert data["errors"] == [
+            {
+                "id": "dlm.E004",
+                "app_label": "testapp",
+                "msg": (
+                    "testapp's max_migration.txt contains '0001_initial', but"
+                    + " the latest migration is '0002_updates'."
+                ),
+                "hint": (
+                    "Edit max_migration.txt to contain '0002_updates' or"
+                    + " rearrange the migrations into the correct order."
+                ),
+                "max_migration_name": "0001_initial",
+                "real_max_migration_name": "0002_updates",
+                "conflicts": None,
+            }
+        ]
+        stats = data["stats"]
+        assert stats["apps_checked"] == 1
+        assert stats["errors"] == 1
+        assert stats["migrations"] >= 2
+        assert stats["graph_seconds"] <= stats["total_seconds"]
+
+    def test_jsonl_conflict(self):
+        self.write_migrations()
+        (self.migrations_dir / "0002_other.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+
+        out, err, returncode = self.call_command("--format", "jsonl")
+
+        assert returncode == 1
+        lines = [json.loads(line) for line in out.splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["type"] == "error"
+        assert lines[0]["id"] == "dlm.E005"
+        assert lines[0]["app_label"] is None
+        assert lines[0]["conflicts"] == {"testapp": ["0002_other", "0002_updates"]}
+        assert lines[1]["type"] == "stats"
+        assert lines[1]["errors"] == 1
+
+    def test_shard_invalid(self):
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("--shard", "3/2")
+
+        assert excinfo.value.args[0] == (
+            "Error: argument --shard: Invalid shard '3/2', should be in the form"
+            + " 'i/n'."
+        )
+
+    def test_shard(self):
+        self.write_migrations()
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+        out, err, returncode = self.call_command("--shard", "2/2")
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+        out, err, returncode = self.call_command("--shard", "1/2")
+        assert "dlm.E004" in out
+        assert returncode == 1
+
+    def test_shard_conflict_reported_by_first(self):
+        self.write_migrations()
+        (self.migrations_dir / "0002_other.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+
+        out, err, returncode = self.call_command("--shard", "2/3")
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+        out, err, returncode = self.call_command("--shard", "1/3")
+        assert "dlm.E005" in out
+        assert returncode == 1
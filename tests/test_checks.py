@@ -8,6 +8,7 @@ import pytest
 from django.test import TestCase, override_settings
 
 from django_linear_migrations.apps import check_max_migration_files
+from django_linear_migrations.stamp import write_stamp
 from tests.utils import empty_migration
 
 
@@ -160,3 +161,83 @@ class CheckMaxMigrationFilesTests(TestCase):
         result = check_max_migration_files()
 
         assert result == []
+
+    def test_lock_file_dlm_E001(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        lock_file = self.migrations_dir.parent / "max_migrations.lock"
+        lock_file.write_text("otherapp: 0001_initial\n")
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            result = check_max_migration_files()
+
+        assert len(result) == 1
+        assert result[0].id == "dlm.E001"
+        assert result[0].msg == "testapp's max_migrations.lock entry does not exist."
+
+    def test_lock_file_dlm_E002(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        lock_file = self.migrations_dir.parent / "max_migrations.lock"
+        lock_file.write_text(
+            dedent(
+                """\
+                <<<<<<< HEAD
+                testapp: 0002_author_nicknames
+                =======
+                testapp: 0002_longer_titles
+                >>>>>>> 123456789
+                """
+            )
+        )
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            result = check_max_migration_files()
+
+        assert len(result) == 1
+        assert result[0].id == "dlm.E002"
+        assert result[0].msg == (
+            "testapp's max_migrations.lock entry contains multiple lines."
+        )
+
+    def test_lock_file_okay(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        lock_file = self.migrations_dir.parent / "max_migrations.lock"
+        lock_file.write_text("testapp: 0001_initial\n")
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            result = check_max_migration_files()
+
+        assert result == []
+
+    def test_stamp_skips_check(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+        stamp = self.migrations_dir.parent / "stamp.txt"
+
+        with override_settings(LINEAR_MIGRATIONS_STAMP=stamp):
+            write_stamp(stamp)
+            # Same size, so the stamp still matches
+            (self.migrations_dir / "max_migration.txt").write_text("0001_xxxxxxx\n")
+            stats: dict[str, float] = {}
+            result = check_max_migration_files(stats=stats)
+
+        assert result == []
+        assert stats["stamp_matched"] == 1.0
+
+    def test_stamp_mismatch_runs_check(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+        stamp = self.migrations_dir.parent / "stamp.txt"
+
+        with override_settings(LINEAR_MIGRATIONS_STAMP=stamp):
+            write_stamp(stamp)
+            (self.migrations_dir / "0002_second.py").write_text(empty_migration)
+            stats: dict[str, float] = {}
+            result = check_max_migration_files(stats=stats)
+
+        assert stats["stamp_matched"] == 0.0
+        assert [error.id for error in result] == ["dlm.E005"]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import sys
+from textwrap import dedent
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_linear_migrations import chunked
+from django_linear_migrations.apps import check_max_migration_files
+from django_linear_migrations.chunked import chunked_summary, get_memory_budget
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, temp_migrations_module
+
+
+class GetMemoryBudgetTests(SimpleTestCase):
+    def test_unset(self):
+        assert get_memory_budget() is None
+
+    @override_settings(LINEAR_MIGRATIONS_MEMORY_BUDGET=64)
+    def test_setting(self):
+        assert get_memory_budget() == 64 * 1024 * 1024
+
+    def test_environment(self):
+        with mock.patch.dict(os.environ, {"LINEAR_MIGRATIONS_MEMORY_BUDGET": "2"}):
+            assert get_memory_budget() == 2 * 1024 * 1024
+
+    @override_settings(LINEAR_MIGRATIONS_MEMORY_BUDGET="lots")
+    def test_invalid(self):
+        with pytest.raises(ImproperlyConfigured) as excinfo:
+            get_memory_budget()
+
+        assert str(excinfo.value) == (
+            "Invalid memory budget 'lots', should be a positive number of megabytes."
+        )
+
+
+class ChunkedSummaryTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+
+    def write_migration(self, name: str, dependencies: str) -> None:
+        (self.migrations_dir / f"{name}.py").write_text(
+            dedent(
+                f"""\
+                from django.db import migrations
+
+
+                class Migration(migrations.Migration):
+                    dependencies = {dependencies}
+                """
+            )
+        )
+
+    def test_fits_budget(self):
+        stats: dict[str, float] = {}
+
+        summary = chunked_summary(["testapp"], 10**9, stats)
+
+        assert summary is None
+        assert stats["memory_estimate"] > 0
+
+    def test_linear(self):
+        self.write_migration("0002_second", "[('testapp', '0001_initial')]")
+        stats: dict[str, float] = {}
+
+        summary = chunked_summary(["testapp"], 0, stats)
+
+        assert summary is not None
+        assert summary.leaves["testapp"] == ["0002_second"]
+        assert summary.max_migrations == {"testapp": "0002_second"}
+        assert summary.conflicts == {}
+        # Only first-party apps' migrations
+        assert summary.migrations == 2
+        assert stats["chunks"] == 1.0
+
+    def test_conflict(self):
+        self.write_migration("0002_first", "[('testapp', '0001_initial')]")
+        self.write_migration("0002_second", "[('testapp', '0001_initial')]")
+
+        summary = chunked_summary(["testapp"], 0, {})
+
+        assert summary is not None
+        assert summary.conflicts == {"testapp": ["0002_first", "0002_second"]}
+        assert "testapp" not in summary.max_migrations
+
+    def test_dynamic_dependencies_imported(self):
+        self.write_migration("0002_second", "[('testapp', '0001_' + 'initial')]")
+        self.write_migration("0003_third", "[('testapp', '0002_second')]")
+
+        summary = chunked_summary(["testapp"], 0, {})
+
+        assert summary is not None
+        assert summary.conflicts == {}
+        assert summary.max_migrations == {"testapp": "0003_third"}
+        module_name = self.migrations_dir.name
+        assert f"{module_name}.0002_second" not in sys.modules
+        assert not hasattr(sys.modules[module_name], "0002_second")
+
+    def test_squashed(self):
+        self.write_migration("0002_second", "[('testapp', '0001_initial')]")
+        (self.migrations_dir / "0001_squashed_0002_second.py").write_text(
+            dedent(
+                """\
+                from django.db import migrations
+
+
+                class Migration(migrations.Migration):
+                    replaces = [
+                        ('testapp', '0001_initial'),
+                        ('testapp', '0002_second'),
+                    ]
+                """
+            )
+        )
+        self.write_migration("0003_third", "[('testapp', '0002_second')]")
+
+        summary = chunked_summary(["testapp"], 0, {})
+
+        assert summary is not None
+        assert summary.max_migrations == {"testapp": "0003_third"}
+
+    @override_settings(LINEAR_MIGRATIONS_MEMORY_BUDGET=1)
+    def test_check(self):
+        self.write_migration("0002_second", "[('testapp', '0001_initial')]")
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+        stats: dict[str, float] = {}
+
+        with mock.patch.object(chunked, "LOADER_BYTES_PER_SOURCE_BYTE", 10**9):
+            errors = check_max_migration_files(stats=stats)
+
+        assert stats["chunked"] == 1.0
+        assert [error.id for error in errors] == ["dlm.E004"]
+        assert errors[0].real_max_migration_name == "0002_second"
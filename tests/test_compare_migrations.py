@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import subprocess
+from functools import partial
+from textwrap import dedent
+
+import pytest
+from django.core.management import CommandError
+from django.test import TestCase, override_settings
+
+from django_linear_migrations.management.commands.compare_migrations import (
+    rebased_names,
+)
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class CompareMigrationsTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        self.repo_dir = self.migrations_dir.parent
+        self.git("init", "--quiet")
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        self.commit("start")
+
+    call_command = staticmethod(partial(run_command, "compare_migrations"))
+
+    def git(self, *args: str) -> None:
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=Test",
+                "-c",
+                "user.email=test@example.com",
+                "-c",
+                "commit.gpgsign=false",
+                *args,
+            ],
+            cwd=self.repo_dir,
+            check=True,
+            capture_output=True,
+        )
+
+    def commit(self, tag: str) -> None:
+        self.git("add", "--all")
+        self.git("commit", "--quiet", "--allow-empty", "--message", tag)
+        self.git("tag", tag)
+
+    def write_migration(self, name: str, parent: str) -> None:
+        (self.migrations_dir / f"{name}.py").write_text(
+            dedent(
+                f"""\
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', {parent!r})]
+                """
+            )
+        )
+
+    def branch_off(self) -> None:
+        self.write_migration("0002_base", "0001_initial")
+        self.commit("base")
+        self.git("checkout", "--quiet", "start")
+        (self.migrations_dir / "0002_base.py").unlink(missing_ok=True)
+
+    def test_no_conflict(self):
+        self.branch_off()
+        self.write_migration("0003_branch", "0002_base")
+        self.write_migration("0002_base", "0001_initial")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == "No migration conflicts between base and branch.\n"
+        assert err == ""
+        assert returncode == 0
+
+    def test_conflict(self):
+        self.branch_off()
+        self.write_migration("0002_branch", "0001_initial")
+        self.write_migration("0003_branch_more", "0002_branch")
+        self.commit("branch")
+        # The working tree doesn't matter
+        (self.migrations_dir / "0002_branch.py").unlink()
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: conflict between 0002_base (base) and 0003_branch_more"
+            + " (branch).\n"
+            + "  Rebasing would rename 0002_branch to 0003_branch.\n"
+            + "  Rebasing would rename 0003_branch_more to 0004_branch_more.\n"
+        )
+        assert returncode == 1
+
+    def test_conflict_unnumbered(self):
+        self.branch_off()
+        self.write_migration("branchy", "0001_initial")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: conflict between 0002_base (base) and branchy (branch).\n"
+            + "  Rebasing could not rename branchy, since its name has no number"
+            + " prefix.\n"
+        )
+        assert returncode == 1
+
+    def test_conflict_without_base_migrations(self):
+        (self.migrations_dir / "0001_initial.py").unlink()
+        self.commit("base")
+        self.git("checkout", "--quiet", "start")
+        self.write_migration("0002_a", "0001_initial")
+        self.write_migration("0002_b", "0001_initial")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: conflict between 0002_a, 0002_b (branch).\n"
+            + "  Rebasing would not apply, since testapp has no migrations at"
+            + " base.\n"
+        )
+        assert returncode == 1
+
+    def test_deleted_on_branch(self):
+        self.write_migration("0002_old", "0001_initial")
+        self.commit("base")
+        (self.migrations_dir / "0002_old.py").unlink()
+        self.write_migration("0002_new", "0001_initial")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == "No migration conflicts between base and branch.\n"
+        assert returncode == 0
+
+    def test_squashed_on_branch(self):
+        self.write_migration("0002_second", "0001_initial")
+        self.commit("base")
+        (self.migrations_dir / "0001_initial.py").unlink()
+        (self.migrations_dir / "0002_second.py").unlink()
+        (self.migrations_dir / "0001_squashed_0002_second.py").write_text(
+            dedent(
+                """\
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    replaces = [
+                        ('testapp', '0001_initial'),
+                        ('testapp', '0002_second'),
+                    ]
+                """
+            )
+        )
+        self.write_migration("0003_third", "0001_squashed_0002_second")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == "No migration conflicts between base and branch.\n"
+        assert returncode == 0
+
+    def write_max_migration(self, name: str) -> None:
+        (self.migrations_dir / "max_migration.txt").write_text(f"{name}\n")
+
+    def test_max_migration_no_conflict(self):
+        self.write_migration("0002_base", "0001_initial")
+        self.write_max_migration("0002_base")
+        self.commit("base")
+        self.write_migration("0003_branch", "0002_base")
+        self.write_max_migration("0003_branch")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == "No migration conflicts between base and branch.\n"
+        assert returncode == 0
+
+    def test_max_migration_conflict(self):
+        self.write_max_migration("0001_initial")
+        self.commit("ancestor")
+        self.write_migration("0002_base", "0001_initial")
+        self.write_max_migration("0002_base")
+        self.commit("base")
+        self.git("checkout", "--quiet", "ancestor")
+        # The base's migration, cherry-picked
+        self.write_migration("0002_base", "0001_initial")
+        self.write_migration("0003_branch", "0002_base")
+        self.write_max_migration("0003_branch")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: max_migration.txt would conflict between 0002_base (base)"
+            + " and 0003_branch (branch).\n"
+        )
+        assert returncode == 1
+
+    def test_max_migration_stale(self):
+        self.write_max_migration("0001_initial")
+        self.commit("ancestor")
+        self.write_migration("0002_base", "0001_initial")
+        self.write_max_migration("0002_base")
+        self.commit("base")
+        self.git("checkout", "--quiet", "ancestor")
+        self.write_migration("0003_branch", "0002_base")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: max_migration.txt would contain 0002_base, but the latest"
+            + " migration would be 0003_branch.\n"
+        )
+        assert returncode == 1
+
+    def test_lock_file_conflict(self):
+        lock_file = self.repo_dir / "max_migrations.lock"
+        lock_file.write_text("testapp: 0001_initial\n")
+        self.commit("ancestor")
+        self.write_migration("0002_base", "0001_initial")
+        lock_file.write_text("testapp: 0002_base\n")
+        self.commit("base")
+        self.git("checkout", "--quiet", "ancestor")
+        self.write_migration("0003_branch", "0002_base")
+        lock_file.write_text("testapp: 0003_branch\n")
+        self.commit("branch")
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            out, err, returncode = self.call_command("base", "branch")
+
+        assert out == (
+            "testapp: max_migrations.lock entry would conflict between 0002_base"
+            + " (base) and 0003_branch (branch).\n"
+        )
+        assert returncode == 1
+
+    def test_branch_defaults_to_head(self):
+        self.branch_off()
+        self.write_migration("0002_branch", "0001_initial")
+        self.commit("branch")
+
+        out, err, returncode = self.call_command("base")
+
+        assert out.startswith(
+            "testapp: conflict between 0002_base (base) and 0002_branch (HEAD).\n"
+        )
+        assert returncode == 1
+
+    def test_unknown_revision(self):
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("nonexistent")
+
+        assert excinfo.value.args[0] == "Unknown revision 'nonexistent'."
+
+    def test_unparseable_migration(self):
+        self.branch_off()
+        (self.migrations_dir / "0002_branch.py").write_text("def (")
+        self.commit("branch")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("base", "branch")
+
+        assert excinfo.value.args[0] == (
+            "Could not parse migration testapp.0002_branch at branch."
+        )
+
+
+class RebasedNamesTests(TestCase):
+    def test_renumbers_in_order(self):
+        assert rebased_names(["0009_base"], "0009_base", ["0008_a", "0009_b"]) == [
+            ("0008_a", "0010_a"),
+            ("0009_b", "0011_b"),
+        ]
+
+    def test_skips_used_numbers(self):
+        base_names = ["0009_base", "0010_squashed_0011_other"]
+
+        assert rebased_names(base_names, "0009_base", ["0010_a"]) == [
+            ("0010_a", "0012_a"),
+        ]
+
+    def test_unnumbered(self):
+        assert rebased_names(["0009_base"], "0009_base", ["branchy", "0010_b"]) == [
+            ("branchy", None),
+            ("0010_b", "0010_b"),
+        ]
+
+    def test_unnumbered_max_migration(self):
+        assert rebased_names(["based"], "based", ["0001_a"]) == [("0001_a", None)]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+from django.core.management import CommandError
+from django.test import TestCase, override_settings
+
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class ConvertMaxMigrationFilesTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        self.lock_file = self.migrations_dir.parent / "max_migrations.lock"
+        self.enterContext(
+            override_settings(LINEAR_MIGRATIONS_LOCK_FILE=str(self.lock_file))
+        )
+
+    call_command = staticmethod(partial(run_command, "convert_max_migration_files"))
+
+    def test_no_setting(self):
+        with (
+            override_settings(LINEAR_MIGRATIONS_LOCK_FILE=None),
+            pytest.raises(CommandError) as excinfo,
+        ):
+            self.call_command("--to", "lock-file")
+
+        assert excinfo.value.args[0] == (
+            "Set the LINEAR_MIGRATIONS_LOCK_FILE setting to the lock file's path."
+        )
+
+    def test_nothing_to_convert(self):
+        out, err, returncode = self.call_command("--to", "lock-file")
+
+        assert out == "No max migrations to convert.\n"
+        assert err == ""
+        assert returncode == 0
+        assert not self.lock_file.exists()
+
+    def test_to_lock_file(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+        out, err, returncode = self.call_command("--to", "lock-file")
+
+        assert out == (
+            "Converted testapp's max_migration.txt to max_migrations.lock entry.\n"
+        )
+        assert err == ""
+        assert returncode == 0
+        assert self.lock_file.read_text() == "testapp: 0001_initial\n"
+        assert not (self.migrations_dir / "max_migration.txt").exists()
+
+    def test_to_app_files(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        self.lock_file.write_text("testapp: 0001_initial\n")
+
+        out, err, returncode = self.call_command("--to", "app-files")
+
+        assert out == (
+            "Converted testapp's max_migrations.lock entry to max_migration.txt.\n"
+        )
+        assert err == ""
+        assert returncode == 0
+        max_migration_txt = self.migrations_dir / "max_migration.txt"
+        assert max_migration_txt.read_text() == "0001_initial\n"
+        assert not self.lock_file.exists()
+
+    def test_conflicted(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("line1\nline2\n")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("--to", "lock-file")
+
+        assert excinfo.value.args[0] == (
+            "testapp's max_migration.txt contains multiple lines. Fix it before"
+            + " converting."
+        )
+
+    def test_empty(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("\n")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("--to", "lock-file")
+
+        assert excinfo.value.args[0] == (
+            "testapp's max_migration.txt is empty. Fix it before converting."
+        )
+
+    def test_empty_entry(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        self.lock_file.write_text("testapp:\n")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("--to", "app-files")
+
+        assert excinfo.value.args[0] == (
+            "testapp's max_migrations.lock entry is empty. Fix it before converting."
+        )
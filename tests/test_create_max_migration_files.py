@@ -99,6 +99,20 @@ class CreateMaxMigrationFilesTests(TestCase):
         max_migration_txt = self.migrations_dir / "max_migration.txt"
         assert not max_migration_txt.exists()
 
+    def test_success_dry_run_shard(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+
+        out, err, returncode = self.call_command("--dry-run", "--shard", "2/2")
+
+        assert out == "No max_migration.txt files need creating.\n"
+        assert err == ""
+        assert returncode == 0
+
+        out, err, returncode = self.call_command("--dry-run", "--shard", "1/2")
+
+        assert out == "Would create max_migration.txt for testapp.\n"
+
     def test_success(self):
         (self.migrations_dir / "__init__.py").touch()
         (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
@@ -111,6 +125,36 @@ class CreateMaxMigrationFilesTests(TestCase):
         max_migration_txt = self.migrations_dir / "max_migration.txt"
         assert max_migration_txt.read_text() == "0001_initial\n"
 
+    def test_success_stamp(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        stamp = self.migrations_dir.parent / "stamp.txt"
+
+        with override_settings(LINEAR_MIGRATIONS_STAMP=stamp):
+            out, err, returncode = self.call_command()
+
+        assert out == (
+            "Created max_migration.txt for testapp.\n"
+            + f"Wrote build stamp to {stamp}.\n"
+        )
+        assert returncode == 0
+        assert len(stamp.read_text()) == 65
+
+    def test_success_stamp_check_errors(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "max_migration.txt").write_text("0002_nonexistent\n")
+        stamp = self.migrations_dir.parent / "stamp.txt"
+
+        with override_settings(LINEAR_MIGRATIONS_STAMP=stamp):
+            out, err, returncode = self.call_command()
+
+        assert out == (
+            "No max_migration.txt files need creating.\n"
+            + "Not writing the build stamp, since the checks found problems.\n"
+        )
+        assert not stamp.exists()
+
     def test_success_already_exists(self):
         (self.migrations_dir / "__init__.py").touch()
         (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from textwrap import dedent
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError
+from django.test import TestCase, override_settings
+
+from django_linear_migrations.apps import check_max_migration_files
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class CreateMigrationManifestTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        self.manifest = self.migrations_dir.parent / "manifest.json"
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_updates.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+
+    call_command = staticmethod(partial(run_command, "create_migration_manifest"))
+
+    def test_no_path(self):
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command()
+
+        assert excinfo.value.args[0] == (
+            "Pass --output or set the LINEAR_MIGRATIONS_MANIFEST setting."
+        )
+
+    def test_check_errors(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("--output", str(self.manifest))
+
+        assert excinfo.value.args[0].startswith(
+            "Cannot create the manifest, since the checks found problems:\n"
+            + "?: (dlm.E004) testapp's max_migration.txt contains '0001_initial',"
+        )
+        assert not self.manifest.exists()
+
+    def test_success(self):
+        out, err, returncode = self.call_command("--output", str(self.manifest))
+
+        assert out == f"Wrote migration manifest to {self.manifest}.\n"
+        assert returncode == 0
+        data = json.loads(self.manifest.read_text())
+        assert data["version"] == 1
+        assert data["max_migrations"] == {"testapp": "0002_updates"}
+        assert len(data["content_hash"]) == 64
+
+    def test_check_uses_manifest(self):
+        with override_settings(LINEAR_MIGRATIONS_MANIFEST=str(self.manifest)):
+            self.call_command()
+            stats: dict[str, float] = {}
+
+            with mock.patch(
+                "django_linear_migrations.apps.get_graph_summary"
+            ) as mock_summary:
+                result = check_max_migration_files(stats=stats)
+
+        assert result == []
+        assert stats["manifest_used"] == 1.0
+        mock_summary.assert_not_called()
+
+    def test_check_manifest_missing(self):
+        with override_settings(LINEAR_MIGRATIONS_MANIFEST=str(self.manifest)):
+            result = check_max_migration_files()
+
+        assert len(result) == 1
+        assert result[0].id == "dlm.E006"
+        assert result[0].msg == (
+            f"The migration manifest {self.manifest} does not exist."
+        )
+
+    def test_check_manifest_invalid(self):
+        self.manifest.write_text("{}")
+
+        with override_settings(LINEAR_MIGRATIONS_MANIFEST=str(self.manifest)):
+            result = check_max_migration_files()
+
+        assert len(result) == 1
+        assert result[0].msg == f"The migration manifest {self.manifest} is invalid."
+
+    def test_check_manifest_changed(self):
+        with override_settings(LINEAR_MIGRATIONS_MANIFEST=str(self.manifest)):
+            self.call_command()
+            (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+
+            result = check_max_migration_files()
+
+        assert len(result) == 1
+        assert result[0].id == "dlm.E006"
+        assert result[0].msg == (
+            "The migration files have changed since the migration manifest"
+            + f" {self.manifest} was created."
+        )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from textwrap import dedent
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError
+from django.test import TestCase, override_settings
+
+from django_linear_migrations.apps import check_max_migration_files
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class CreateMigrationSnapshotTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        self.snapshot = self.migrations_dir.parent / "snapshot.json"
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_updates.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+
+    call_command = staticmethod(partial(run_command, "create_migration_snapshot"))
+
+    def test_no_path(self):
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command()
+
+        assert excinfo.value.args[0] == (
+            "Pass --output or set the LINEAR_MIGRATIONS_SNAPSHOT setting."
+        )
+
+    def test_success(self):
+        out, err, returncode = self.call_command("--output", str(self.snapshot))
+
+        assert out == f"Wrote migration snapshot to {self.snapshot}.\n"
+        assert err == ""
+        assert returncode == 0
+        data = json.loads(self.snapshot.read_text())
+        assert data["version"] == 1
+        assert data["leaves"]["testapp"] == ["0002_updates"]
+        assert data["max_migrations"] == {"testapp": "0002_updates"}
+        assert data["conflicts"] == {}
+        assert set(data["fingerprints"]) == {"testapp", "contenttypes"}
+
+    def test_check_uses_snapshot(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+        with override_settings(LINEAR_MIGRATIONS_SNAPSHOT=self.snapshot):
+            self.call_command()
+            stats: dict[str, float] = {}
+
+            with mock.patch(
+                "django.db.migrations.loader.MigrationLoader.build_graph"
+            ) as mock_build_graph:
+                result = check_max_migration_files(stats=stats)
+
+        assert result == []
+        assert stats["snapshot_used"] == 1.0
+        mock_build_graph.assert_not_called()
+
+    def test_check_rejects_stale_snapshot(self):
+        with override_settings(LINEAR_MIGRATIONS_SNAPSHOT=self.snapshot):
+            self.call_command()
+            (self.migrations_dir / "0003_more.py").write_text(
+                dedent(
+                    """
+                    from django.db import migrations
+                    class Migration(migrations.Migration):
+                        dependencies = [('testapp', '0002_updates')]
+                    """
+                )
+            )
+            (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+            stats: dict[str, float] = {}
+
+            result = check_max_migration_files(stats=stats)
+
+        assert stats["snapshot_used"] == 0.0
+        assert len(result) == 1
+        assert result[0].id == "dlm.E004"
+        assert result[0].real_max_migration_name == "0003_more"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from importlib import import_module
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from django_linear_migrations.apps import MigrationDetails
+from django_linear_migrations.discovery import (
+    find_module_names,
+    module_name,
+    scan_directory,
+)
+from tests.compat import EnterContextMixin
+
+
+class ModuleNameTests(SimpleTestCase):
+    def test_source(self):
+        assert module_name("0001_initial.py") == ("0001_initial", ".py")
+
+    def test_compiled(self):
+        assert module_name("0001_initial.pyc") == ("0001_initial", ".pyc")
+
+    def test_not_module(self):
+        assert module_name("max_migration.txt") is None
+        assert module_name("a.b.py") is None
+
+
+class ScanDirectoryTests(EnterContextMixin, SimpleTestCase):
+    def setUp(self):
+        self.path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.old_mtime = time.time_ns() - 60_000_000_000
+
+    def set_old_mtime(self, offset: int = 0) -> None:
+        mtime = self.old_mtime + offset
+        os.utime(self.path, ns=(mtime, mtime))
+
+    def test_prefers_source(self):
+        (self.path / "0001_initial.pyc").touch()
+        (self.path / "0001_initial.py").touch()
+        (self.path / "0002_second.pyc").touch()
+        (self.path / "package.py").mkdir()
+
+        assert scan_directory(str(self.path)) == {
+            "0001_initial": ".py",
+            "0002_second": ".pyc",
+        }
+
+    def test_cached_by_mtime(self):
+        (self.path / "0001_initial.py").touch()
+        self.set_old_mtime()
+        assert scan_directory(str(self.path)) == {"0001_initial": ".py"}
+
+        (self.path / "0002_second.py").touch()
+        self.set_old_mtime()
+        assert scan_directory(str(self.path)) == {"0001_initial": ".py"}
+
+        self.set_old_mtime(offset=1)
+        assert scan_directory(str(self.path)) == {
+            "0001_initial": ".py",
+            "0002_second": ".py",
+        }
+
+    def test_recently_modified_not_cached(self):
+        (self.path / "0001_initial.py").touch()
+        assert scan_directory(str(self.path)) == {"0001_initial": ".py"}
+
+        (self.path / "0002_second.py").touch()
+        # Simulate the same timestamp tick
+        mtime = self.path.stat().st_mtime_ns
+        os.utime(self.path, ns=(mtime, mtime))
+        assert scan_directory(str(self.path)) == {
+            "0001_initial": ".py",
+            "0002_second": ".py",
+        }
+
+
+class ZipPackageTests(EnterContextMixin, SimpleTestCase):
+    def setUp(self):
+        tmp_path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.package_name = "zipped" + str(time.time()).replace(".", "")
+        zip_path = tmp_path / "app.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr(f"{self.package_name}/__init__.py", "")
+            zf.writestr(f"{self.package_name}/0001_initial.py", "")
+            zf.writestr(f"{self.package_name}/0002_second.pyc", "")
+            zf.writestr(f"{self.package_name}/max_migration.txt", "0001_initial\n")
+            zf.writestr(f"{self.package_name}/sub/__init__.py", "")
+        sys.path.insert(0, str(zip_path))
+        self.addCleanup(sys.path.remove, str(zip_path))
+        self.addCleanup(sys.modules.pop, self.package_name, None)
+
+    def test_find_module_names(self):
+        package = import_module(self.package_name)
+
+        assert find_module_names(package) == {
+            "__init__",
+            "0001_initial",
+            "0002_second",
+        }
+
+    def test_migration_details(self):
+        with override_settings(MIGRATION_MODULES={"testapp": self.package_name}):
+            migration_details = MigrationDetails("testapp")
+
+        assert migration_details.has_migrations
+        assert migration_details.names == {"0001_initial", "0002_second"}
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import ast
+
+import pytest
+from django.test import SimpleTestCase
+
+from django_linear_migrations.editor import SourceEditor
+
+
+def assigned_values(source: bytes) -> dict[str, ast.expr]:
+    module_def = ast.parse(source)
+    return {
+        node.targets[0].id: node.value
+        for node in ast.walk(module_def)
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name)
+    }
+
+
+class SourceEditorTests(SimpleTestCase):
+    def test_multiple_edits(self):
+        source = b"a = [1]\nb = (\n    2,\n)\nc = 3\n"
+        values = assigned_values(source)
+        editor = SourceEditor(source)
+
+        editor.replace(values["c"], "30")
+        editor.replace(values["a"], b"[10]")
+        editor.replace(values["b"], "(20,)")
+
+        assert editor.apply() == b"a = [10]\nb = (20,)\nc = 30\n"
+
+    def test_no_edits(self):
+        source = b"a = 1\n"
+
+        assert SourceEditor(source).apply() == source
+
+    def test_overlapping_edits(self):
+        source = b"a = [1, 2]\n"
+        values = assigned_values(source)
+        editor = SourceEditor(source)
+        editor.replace(values["a"], "[]")
+        list_value = values["a"]
+        assert isinstance(list_value, ast.List)
+        editor.replace(list_value.elts[0], "3")
+
+        with pytest.raises(ValueError) as excinfo:
+            editor.apply()
+
+        assert str(excinfo.value) == "Cannot apply overlapping edits."
+
+    def test_non_ascii_and_crlf(self):
+        source = "x = 'é'; a = 1\r\ny = 'ü'\rb = 2\n".encode()
+        values = assigned_values(source)
+        editor = SourceEditor(source)
+
+        assert editor.segment(values["a"]) == b"1"
+        assert editor.segment(values["b"]) == b"2"
+        editor.replace(values["a"], "'ä'")
+        editor.replace(values["b"], "3")
+
+        assert editor.apply() == "x = 'é'; a = 'ä'\r\ny = 'ü'\rb = 3\n".encode()
+
+    def test_large_literal(self):
+        source = b"data = '" + b"x" * 5_000_000 + b"'\nb = 1\n"
+        values = assigned_values(source)
+        editor = SourceEditor(source)
+
+        editor.replace(values["b"], "2")
+
+        assert editor.apply().endswith(b"'\nb = 2\n")
+        assert len(editor.line_offsets) == 3
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import random
+from textwrap import dedent, indent
+from types import SimpleNamespace
+
+from django.db.migrations.graph import MigrationGraph
+from django.db.migrations.loader import MigrationLoader
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_linear_migrations.graph import CompactGraph
+from django_linear_migrations.static import (
+    StaticMigration,
+    load_static_migrations,
+    parse_migration,
+)
+from tests.compat import EnterContextMixin
+from tests.utils import temp_migrations_module
+
+
+def random_graph(seed: int) -> MigrationGraph:
+    rand = random.Random(seed)
+    graph = MigrationGraph()
+    keys: list[tuple[str, str]] = []
+    for app_label in ("alpha", "beta", "gamma"):
+        for number in range(1, rand.randint(2, 12)):
+            key = (app_label, f"{number:04}_{rand.choice('abc')}")
+            if key in graph.node_map:
+                continue
+            graph.add_node(key, None)
+            for parent in rand.sample(keys, k=min(len(keys), rand.randint(0, 3))):
+                graph.add_dependency(None, key, parent)
+            keys.append(key)
+    return graph
+
+
+class CompactGraphTests(SimpleTestCase):
+    def test_matches_django(self):
+        for seed in range(50):
+            graph = random_graph(seed)
+            loader = SimpleNamespace(graph=graph)
+
+            compact = CompactGraph.from_loader(loader)  # type: ignore [arg-type]
+
+            assert len(compact) == len(graph.nodes)
+            assert compact.leaf_nodes() == graph.leaf_nodes()
+            leaves = graph.leaf_nodes()
+            assert compact.plan() == graph._generate_plan(  # type: ignore [attr-defined]
+                leaves, at_end=True
+            )
+            beta_leaves = [key for key in leaves if key[0] == "beta"]
+            assert compact.plan(["beta"]) == graph._generate_plan(  # type: ignore [attr-defined]
+                beta_leaves, at_end=True
+            )
+
+    def test_detect_conflicts(self):
+        compact = CompactGraph(
+            [("a", "0001"), ("a", "0002_x"), ("a", "0002_y"), ("b", "0001")],
+            [
+                (("a", "0002_x"), ("a", "0001")),
+                (("a", "0002_y"), ("a", "0001")),
+                (("b", "0001"), ("a", "0002_x")),
+            ],
+        )
+
+        assert compact.detect_conflicts() == {"a": ["0002_x", "0002_y"]}
+
+    def test_max_migrations(self):
+        compact = CompactGraph(
+            [("a", "0001"), ("a", "0002"), ("b", "0001")],
+            [
+                (("a", "0002"), ("a", "0001")),
+                (("b", "0001"), ("a", "0001")),
+            ],
+        )
+
+        assert compact.max_migrations() == {"a": "0002", "b": "0001"}
+        assert compact.max_migrations(["b"]) == {"a": "0001", "b": "0001"}
+
+    def test_missing_nodes_ignored(self):
+        compact = CompactGraph([("a", "0001")], [(("a", "0001"), ("b", "0001"))])
+
+        assert len(compact) == 1
+        assert list(compact.parents(0)) == []
+
+    def test_cycle_terminates(self):
+        compact = CompactGraph(
+            [("a", "0001"), ("b", "0001")],
+            [
+                (("a", "0001"), ("b", "0001")),
+                (("b", "0001"), ("a", "0001")),
+            ],
+        )
+
+        assert compact.plan() == [("b", "0001"), ("a", "0001")]
+
+    def test_from_static_special_keys(self):
+        migrations = [
+            StaticMigration("a", "0001", dependencies=[], replaces=[], run_before=[]),
+            StaticMigration(
+                "a", "0002", dependencies=[("a", "0001")], replaces=[], run_before=[]
+            ),
+            StaticMigration(
+                "b",
+                "0001",
+                dependencies=[("a", "__latest__"), ("b", "__first__")],
+                replaces=[],
+                run_before=[("c", "0001")],
+            ),
+            StaticMigration(
+                "c",
+                "0001",
+                dependencies=[("a", "__first__")],
+                replaces=[],
+                run_before=[],
+            ),
+        ]
+
+        compact = CompactGraph.from_static(migrations)
+
+        assert compact.plan() == [
+            ("a", "0001"),
+            ("a", "0002"),
+            ("b", "0001"),
+            ("c", "0001"),
+        ]
+
+
+class FromStaticTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+
+    def write(self, name: str, body: str) -> None:
+        (self.migrations_dir / f"{name}.py").write_text(
+            "from django.conf import settings\n"
+            + "from django.db import migrations\n"
+            + "class Migration(migrations.Migration):\n"
+            + indent(dedent(body), "    ")
+        )
+
+    def static_graph(self) -> CompactGraph:
+        return CompactGraph.from_static(
+            parse_migration("testapp", path.stem, path.read_text())
+            for path in self.migrations_dir.glob("0*.py")
+        )
+
+    @override_settings(AUTH_USER_MODEL="testapp.User")
+    def test_matches_loader_with_squash(self):
+        self.write("0001_initial", "pass\n")
+        self.write(
+            "0002_second",
+            """\
+                dependencies = [
+                    ('testapp', '0001_initial'),
+                    migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+                ]
+            """,
+        )
+        self.write(
+            "0003_third",
+            """\
+                dependencies = [('testapp', '0002_second')]
+            """,
+        )
+        self.write(
+            "0001_squashed_0002_second",
+            """\
+                replaces = [('testapp', '0001_initial'), ('testapp', '0002_second')]
+            """,
+        )
+        self.write(
+            "0004_fourth",
+            """\
+                dependencies: list = [('testapp', '0003_third')]
+            """,
+        )
+
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        expected = CompactGraph.from_loader(loader)
+        compact = self.static_graph()
+
+        assert compact.plan(["testapp"]) == [
+            key for key in expected.plan(["testapp"]) if key[0] == "testapp"
+        ]
+        assert compact.plan(["testapp"]) == [
+            ("testapp", "0001_squashed_0002_second"),
+            ("testapp", "0003_third"),
+            ("testapp", "0004_fourth"),
+        ]
+
+    def test_parse_dynamic(self):
+        migration = parse_migration(
+            "testapp",
+            "0002_second",
+            dedent(
+                """\
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial'), get_dep()]
+                    run_before = compute()
+                """
+            ),
+        )
+
+        assert migration.dependencies == [("testapp", "0001_initial")]
+        assert migration.run_before == []
+        assert migration.dynamic
+
+    def test_load_static_skips_replaced(self):
+        self.write("0001_initial", "pass\n")
+        (self.migrations_dir / "0002_second.py").write_text("this is not python")
+        self.write(
+            "0001_squashed_0002_second",
+            """\
+                replaces = [('testapp', '0001_initial'), ('testapp', '0002_second')]
+            """,
+        )
+        self.write(
+            "0003_third",
+            """\
+                dependencies = [('testapp', '0002_second')]
+            """,
+        )
+
+        migrations = load_static_migrations(
+            "testapp",
+            self.migrations_dir,
+            ["0001_initial", "0002_second", "0001_squashed_0002_second", "0003_third"],
+        )
+
+        assert [migration.name for migration in migrations] == [
+            "0001_squashed_0002_second",
+            "0003_third",
+        ]
+        compact = CompactGraph.from_static(migrations)
+        assert compact.plan() == [
+            ("testapp", "0001_squashed_0002_second"),
+            ("testapp", "0003_third"),
+        ]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import zipfile
+from functools import partial
+from pathlib import Path
+from textwrap import dedent
+
+from django.test import TestCase, override_settings
+
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class LintMigrationsTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+
+    call_command = staticmethod(partial(run_command, "lint_migrations"))
+
+    def write(self, *names: str, max_migration: str | None = None) -> None:
+        for name in names:
+            (self.migrations_dir / f"{name}.py").write_text(empty_migration)
+        if max_migration is None:
+            max_migration = names[-1]
+        (self.migrations_dir / "max_migration.txt").write_text(f"{max_migration}\n")
+
+    def write_migration(
+        self, name: str, dependencies: str, replaces: str = "[]"
+    ) -> None:
+        (self.migrations_dir / f"{name}.py").write_text(
+            dedent(
+                f"""\
+                from django.db import migrations
+
+
+                class Migration(migrations.Migration):
+                    dependencies = {dependencies}
+                    replaces = {replaces}
+                """
+            )
+        )
+        (self.migrations_dir / "max_migration.txt").write_text(f"{name}\n")
+
+    def test_bad_app_label(self):
+        out, err, returncode = self.call_command("nonexistent")
+
+        assert out == ""
+        assert err == "No installed app with label 'nonexistent'.\n"
+        assert returncode == 2
+
+    def test_okay(self):
+        self.write("0001_initial", "0002_second")
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_does_not_import(self):
+        self.write("0001_initial")
+
+        self.call_command()
+
+        assert self.migrations_dir.name not in sys.modules
+
+    def test_no_migrations(self):
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_duplicates(self):
+        self.write("0001_initial", "0002_a", "0002_b")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: duplicate migration number 0002: 0002_a, 0002_b.\n"
+        assert returncode == 1
+
+    def test_duplicates_merged(self):
+        self.write("0001_initial", "0002_a", "0002_b")
+        self.write_migration(
+            "0003_merge_0002_a_0002_b",
+            "[('testapp', '0002_a'), ('testapp', '0002_b')]",
+        )
+        self.write_migration("0004_after", "[('testapp', '0003_merge_0002_a_0002_b')]")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_duplicates_merged_later(self):
+        self.write("0001_initial", "0002_a", "0002_b")
+        self.write_migration("0003_c", "[('testapp', '0002_a')]")
+        self.write_migration(
+            "0004_merge", "[('testapp', '0003_c'), ('testapp', '0002_b')]"
+        )
+
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_duplicates_not_merged(self):
+        self.write("0001_initial", "0002_a", "0002_b")
+        self.write_migration("0003_c", "[('testapp', '0002_a')]")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: duplicate migration number 0002: 0002_a, 0002_b.\n"
+        assert returncode == 1
+
+    def test_duplicates_squashed(self):
+        self.write("0001_initial", "0002_a", "0002_b")
+        self.write_migration(
+            "0001_squashed_0002_b",
+            "[]",
+            replaces=(
+                "[('testapp', '0001_initial'), ('testapp', '0002_a'),"
+                + " ('testapp', '0002_b')]"
+            ),
+        )
+
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_gaps(self):
+        self.write("0001_initial", "0004_d")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: gap in migration numbers, missing 0002, 0003.\n"
+        assert returncode == 0
+
+    def test_bad_name(self):
+        self.write("0001_initial", "2_second", max_migration="0001_initial")
+
+        out, err, returncode = self.call_command()
+
+        assert out == (
+            "testapp: 2_second does not match the migration name format"
+            + " NNNN_name.\n"
+        )
+        assert returncode == 1
+
+    def test_compiled_without_source(self):
+        self.write("0001_initial")
+        (self.migrations_dir / "0002_second.pyc").write_bytes(b"")
+        (self.migrations_dir / "max_migration.txt").write_text("0002_second\n")
+
+        out, err, returncode = self.call_command()
+
+        assert out == (
+            "testapp: 0002_second.pyc is a compiled migration without a source"
+            + " file.\n"
+        )
+        assert returncode == 1
+
+    def test_max_migration_missing(self):
+        self.write("0001_initial")
+        (self.migrations_dir / "max_migration.txt").unlink()
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: max_migration.txt does not exist.\n"
+        assert returncode == 1
+
+    def test_max_migration_multiple_lines(self):
+        self.write("0001_initial")
+        (self.migrations_dir / "max_migration.txt").write_text("a\nb\n")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: max_migration.txt contains multiple lines.\n"
+        assert returncode == 1
+
+    def test_max_migration_non_existent(self):
+        self.write("0001_initial", max_migration="0002_second")
+
+        out, err, returncode = self.call_command()
+
+        assert out == (
+            "testapp: max_migration.txt points to non-existent migration"
+            + " '0002_second'.\n"
+        )
+        assert returncode == 1
+
+    def test_max_migration_not_latest(self):
+        self.write("0001_initial", "0002_second", max_migration="0001_initial")
+
+        out, err, returncode = self.call_command()
+
+        assert out == (
+            "testapp: max_migration.txt contains '0001_initial', but"
+            + " '0002_second' has a higher number.\n"
+        )
+        assert returncode == 1
+
+    def test_max_migration_squashed(self):
+        self.write("0001_initial", "0002_second", "0001_squashed_0002_second")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
+
+    def test_zip_skipped(self):
+        tmp_path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        package_name = "zipped" + str(time.time()).replace(".", "")
+        zip_path = tmp_path / "app.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr(f"{package_name}/__init__.py", "")
+            zf.writestr(f"{package_name}/0001_initial.py", empty_migration)
+            zf.writestr(f"{package_name}/0001_duplicate.py", empty_migration)
+        sys.path.insert(0, str(zip_path))
+        self.addCleanup(sys.path.remove, str(zip_path))
+
+        with override_settings(MIGRATION_MODULES={"testapp": package_name}):
+            out, err, returncode = self.call_command()
+
+        assert out == "No problems found.\n"
+        assert returncode == 0
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import fcntl
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from django.test import SimpleTestCase, override_settings
+
+from django_linear_migrations.locking import (
+    get_write_lock_path,
+    max_migration_write_lock,
+)
+from tests.compat import EnterContextMixin
+
+
+class GetWriteLockPathTests(SimpleTestCase):
+    def test_lock_file(self):
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE="/project/max.lock"):
+            path = get_write_lock_path()
+        with override_settings(
+            LINEAR_MIGRATIONS_LOCK_FILE="/project/subdir/../max.lock"
+        ):
+            same_path = get_write_lock_path()
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE="/other/max.lock"):
+            other_path = get_write_lock_path()
+
+        assert path.parent == Path(tempfile.gettempdir())
+        assert path.name.startswith("django-linear-migrations-")
+        assert same_path == path
+        assert other_path != path
+        assert other_path != get_write_lock_path()
+
+    def test_default(self):
+        path = get_write_lock_path()
+
+        assert path.parent == Path(tempfile.gettempdir())
+        assert path.name.startswith("django-linear-migrations-")
+        assert get_write_lock_path() == path
+
+    def test_default_keyed_by_project(self):
+        path = get_write_lock_path()
+
+        with override_settings(FIRST_PARTY_APPS=[]):
+            other_path = get_write_lock_path()
+
+        assert other_path != path
+
+
+class MaxMigrationWriteLockTests(EnterContextMixin, SimpleTestCase):
+    def setUp(self):
+        tmp_path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(
+            override_settings(
+                LINEAR_MIGRATIONS_LOCK_FILE=tmp_path / "max_migrations.lock"
+            )
+        )
+        self.lock_path = get_write_lock_path()
+        self.addCleanup(self.lock_path.unlink, missing_ok=True)
+
+    def try_lock(self) -> None:
+        fd = os.open(self.lock_path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+
+    def test_exclusive(self):
+        with max_migration_write_lock(), pytest.raises(BlockingIOError):
+            self.try_lock()
+
+        self.try_lock()
+
+    def test_released_on_error(self):
+        with pytest.raises(ValueError), max_migration_write_lock():
+            raise ValueError()
+
+        self.try_lock()
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import sys
 from functools import partial
 from textwrap import dedent
+from unittest import mock
 
-from django.db import models
+from django.db import migrations, models
+from django.db.migrations.writer import MigrationWriter
 from django.test import TestCase, override_settings
 
+from django_linear_migrations.locking import max_migration_write_lock
+from django_linear_migrations.management.commands import (
+    WrittenMigration,
+    spy_on_migration_writers,
+)
+from django_linear_migrations.management.commands import makemigrations as module
 from tests.compat import EnterContextMixin
 from tests.utils import run_command, temp_migrations_module
 
@@ -30,6 +39,39 @@ class MakeMigrationsTests(EnterContextMixin, TestCase):
         max_migration_txt = self.migrations_dir / "max_migration.txt"
         assert max_migration_txt.read_text() == "0001_initial\n"
 
+    def test_does_not_import_migrations(self):
+        migrations_module_name = self.migrations_dir.name
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert returncode == 0
+        assert migrations_module_name not in sys.modules
+
+    def test_locks(self):
+        with mock.patch.object(
+            module, "max_migration_write_lock", wraps=max_migration_write_lock
+        ) as mock_lock:
+            out, err, returncode = self.call_command("testapp")
+
+        assert returncode == 0
+        mock_lock.assert_called_once_with()
+
+    def test_dry_run_does_not_lock(self):
+        with mock.patch.object(module, "max_migration_write_lock") as mock_lock:
+            self.call_command("--dry-run", "testapp")
+
+        mock_lock.assert_not_called()
+
+    def test_creates_lock_file_entry(self):
+        lock_file = self.migrations_dir.parent / "max_migrations.lock"
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            out, err, returncode = self.call_command("testapp")
+
+        assert returncode == 0
+        assert lock_file.read_text() == "testapp: 0001_initial\n"
+        assert not (self.migrations_dir / "max_migration.txt").exists()
+
     def test_update(self):
         self.call_command("testapp")
         max_migration_txt = self.migrations_dir / "max_migration.txt"
@@ -137,3 +179,23 @@ class MakeMigrationsTests(EnterContextMixin, TestCase):
             max_migration_txt.read_text()
             == "0003_merge_0002_first_branch_0002_second_branch\n"
         )
+
+
+class SpyOnMigrationWritersTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+
+    def test_multiple_migrations_for_app(self):
+        first = migrations.Migration("0001_initial", "testapp")
+        second = migrations.Migration("0002_second", "testapp")
+
+        with spy_on_migration_writers() as written_migrations:
+            for migration in (first, second):
+                MigrationWriter(migration).as_string()
+
+        assert written_migrations == {
+            "testapp": [
+                WrittenMigration("0001_initial", self.migrations_dir),
+                WrittenMigration("0002_second", self.migrations_dir),
+            ]
+        }
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from textwrap import dedent
+
+from django.test import TestCase, override_settings
+
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class MaxMigrationStatusTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        self.snapshot = self.migrations_dir.parent / "snapshot.json"
+        self.enterContext(override_settings(LINEAR_MIGRATIONS_SNAPSHOT=self.snapshot))
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_updates.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+            )
+        )
+
+    call_command = staticmethod(partial(run_command, "max_migration_status"))
+    create_snapshot = staticmethod(partial(run_command, "create_migration_snapshot"))
+
+    def test_bad_app_label(self):
+        out, err, returncode = self.call_command("nonexistent")
+
+        assert out == ""
+        assert err == "No installed app with label 'nonexistent'.\n"
+        assert returncode == 2
+
+    def test_missing(self):
+        out, err, returncode = self.call_command("testapp")
+
+        assert out == "testapp: - (missing)\n"
+        assert returncode == 0
+
+    def test_conflicted(self):
+        (self.migrations_dir / "max_migration.txt").write_text(
+            "<<<<<<< HEAD\n0002_updates\n=======\n0002_other\n>>>>>>> 123\n"
+        )
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: - (conflicted)\n"
+
+    def test_unknown_without_snapshot(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: 0002_updates (unknown)\n"
+
+    def test_snapshot_consistent(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+        self.create_snapshot()
+
+        out, err, returncode = self.call_command("--format", "json")
+
+        assert json.loads(out) == {
+            "apps": [
+                {
+                    "app_label": "testapp",
+                    "max_migration": "0002_updates",
+                    "status": "consistent",
+                    "source": "snapshot",
+                }
+            ]
+        }
+
+    def test_snapshot_malformed(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+        self.create_snapshot()
+        data = json.loads(self.snapshot.read_text())
+        del data["fingerprints"]
+        self.snapshot.write_text(json.dumps(data))
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: 0002_updates (unknown)\n"
+
+    def test_snapshot_stale_value(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0001_initial\n")
+        self.create_snapshot()
+
+        out, err, returncode = self.call_command()
+
+        assert out == "testapp: 0001_initial (stale)\n"
+
+    def test_snapshot_outdated(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+        self.create_snapshot()
+        (self.migrations_dir / "0003_more.py").write_text(
+            dedent(
+                """
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0002_updates')]
+                """
+            )
+        )
+
+        out, err, returncode = self.call_command()
+        assert out == "testapp: 0002_updates (unknown)\n"
+
+        out, err, returncode = self.call_command("--verify", "--format", "json")
+        assert json.loads(out)["apps"][0] == {
+            "app_label": "testapp",
+            "max_migration": "0002_updates",
+            "status": "stale",
+            "source": "graph",
+        }
+
+    def test_verify_conflicted_graph(self):
+        (self.migrations_dir / "max_migration.txt").write_text("0002_updates\n")
+        (self.migrations_dir / "0002_other.py").write_text(
+            (self.migrations_dir / "0002_updates.py").read_text()
+        )
+
+        out, err, returncode = self.call_command("--verify")
+
+        assert out == "testapp: 0002_updates (conflicted)\n"
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+
+from django_linear_migrations.numbering import MigrationNumbers, migration_number
+
+
+class MigrationNumberTests(SimpleTestCase):
+    def test_numbered(self):
+        assert migration_number("0012_books") == 12
+
+    def test_unnumbered(self):
+        assert migration_number("initial") is None
+        assert migration_number("0012") is None
+
+
+class MigrationNumbersTests(SimpleTestCase):
+    def test_duplicates(self):
+        numbers = MigrationNumbers(["0001_initial", "0002_b", "0002_a", "0003_c"])
+
+        assert numbers.duplicates() == {2: ["0002_a", "0002_b"]}
+        assert numbers.gaps() == []
+
+    def test_gaps(self):
+        numbers = MigrationNumbers(["0001_initial", "0004_d", "custom"])
+
+        assert numbers.gaps() == [2, 3]
+        assert numbers.unnumbered == ["custom"]
+        assert numbers.max_number == 4
+
+    def test_squashed(self):
+        numbers = MigrationNumbers(
+            ["0001_initial", "0001_squashed_0003_c", "0004_d", "0007_squashed_0008_e"]
+        )
+
+        assert numbers.duplicates() == {}
+        assert numbers.gaps() == [5, 6]
+        assert numbers.max_number == 8
+
+    def test_next_free(self):
+        numbers = MigrationNumbers(["0001_initial", "0003_c", "0004_d"])
+
+        assert numbers.next_free(1) == 2
+        assert numbers.next_free(2) == 5
+        assert numbers.next_free(4) == 5
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from functools import partial
+from textwrap import dedent
+
+from django.test import TestCase, override_settings
+
+from tests.compat import EnterContextMixin
+from tests.utils import run_command, temp_migrations_module
+
+
+class PlanSquashesTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+
+    call_command = staticmethod(partial(run_command, "plan_squashes"))
+
+    def write_migrations(self, count: int) -> None:
+        (self.migrations_dir / "__init__.py").touch()
+        for number in range(1, count + 1):
+            dependencies = (
+                f"[('testapp', '{number - 1:04}_step')]" if number > 1 else "[]"
+            )
+            (self.migrations_dir / f"{number:04}_step.py").write_text(
+                dedent(
+                    f"""\
+                    from django.db import migrations
+
+
+                    class Migration(migrations.Migration):
+                        dependencies = {dependencies}
+                        operations = []
+                    """
+                )
+            )
+
+    def test_bad_app_label(self):
+        out, err, returncode = self.call_command("nonexistent")
+
+        assert out == ""
+        assert err == "No installed app with label 'nonexistent'.\n"
+        assert returncode == 2
+
+    @override_settings(FIRST_PARTY_APPS=[])
+    def test_no_first_party_apps(self):
+        out, err, returncode = self.call_command()
+
+        assert returncode == 0
+        assert out == "No first-party apps with migrations.\n"
+
+    def test_proposes(self):
+        self.write_migrations(3)
+
+        out, err, returncode = self.call_command("--min-migrations", "2")
+
+        assert returncode == 0
+        lines = out.splitlines()
+        assert lines[0].startswith("testapp: 3 migrations, ")
+        assert lines[0].endswith("ms to load.")
+        assert lines[1] == "  Squash 0001_step to 0003_step (3 migrations)."
+        assert not (self.migrations_dir / "0001_step_squashed_0003_step.py").exists()
+
+    def test_too_few(self):
+        self.write_migrations(3)
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert returncode == 0
+        assert out.splitlines()[1] == (
+            "  Not squashing, since fewer than 10 migrations to squash."
+        )
+
+    def test_apply(self):
+        self.write_migrations(3)
+        (self.migrations_dir / "max_migration.txt").write_text("0003_step\n")
+
+        out, err, returncode = self.call_command("--min-migrations", "2", "--apply")
+
+        assert returncode == 0
+        assert (self.migrations_dir / "0001_step_squashed_0003_step.py").exists()
+        max_migration_txt = self.migrations_dir / "max_migration.txt"
+        assert max_migration_txt.read_text() == "0001_step_squashed_0003_step\n"
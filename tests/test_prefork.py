@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import sys
+from types import ModuleType
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from django_linear_migrations import prefork
+from django_linear_migrations.apps import (
+    LinearMigrationsError,
+    get_cached_result,
+    set_cached_result,
+)
+from django_linear_migrations.prefork import (
+    detect_prefork_server,
+    install_fork_hook,
+    maybe_install_fork_hook,
+    run_checks_before_fork,
+)
+from tests.compat import EnterContextMixin
+
+error = LinearMigrationsError("Something is wrong.", id="dlm.E001")
+
+
+class DetectPreforkServerTests(SimpleTestCase):
+    def test_none(self):
+        assert detect_prefork_server() is None
+
+    def test_gunicorn(self):
+        with mock.patch.dict(sys.modules, {"gunicorn": ModuleType("gunicorn")}):
+            assert detect_prefork_server() == "gunicorn"
+
+    def test_uwsgi(self):
+        with mock.patch.dict(sys.modules, {"uwsgi": ModuleType("uwsgi")}):
+            assert detect_prefork_server() == "uwsgi"
+
+
+class RunChecksBeforeForkTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(set_cached_result, None)
+
+    def test_caches(self):
+        with mock.patch.object(
+            prefork, "check_max_migration_files", return_value=[error]
+        ):
+            result = run_checks_before_fork()
+
+        assert result == [error]
+        assert get_cached_result() == [error]
+
+    def test_before_fork(self):
+        with mock.patch.object(
+            prefork, "check_max_migration_files", return_value=[]
+        ) as mock_check:
+            prefork._before_fork()
+            prefork._before_fork()
+
+        mock_check.assert_called_once_with()
+        assert get_cached_result() == []
+
+    def test_before_fork_error(self):
+        with mock.patch.object(
+            prefork, "check_max_migration_files", side_effect=RuntimeError
+        ):
+            prefork._before_fork()
+
+        assert get_cached_result() is None
+
+
+class InstallForkHookTests(EnterContextMixin, SimpleTestCase):
+    def setUp(self):
+        self.enterContext(mock.patch.object(prefork, "_fork_hook_installed", False))
+        self.mock_register = self.enterContext(
+            mock.patch.object(os, "register_at_fork")
+        )
+
+    def test_install_once(self):
+        install_fork_hook()
+        install_fork_hook()
+
+        self.mock_register.assert_called_once_with(before=prefork._before_fork)
+
+    @override_settings(LINEAR_MIGRATIONS_PREFORK_CHECKS=True)
+    def test_maybe_install_not_detected(self):
+        maybe_install_fork_hook()
+
+        self.mock_register.assert_not_called()
+
+    def test_maybe_install_not_enabled(self):
+        with mock.patch.dict(sys.modules, {"gunicorn": ModuleType("gunicorn")}):
+            maybe_install_fork_hook()
+
+        self.mock_register.assert_not_called()
+
+    @override_settings(LINEAR_MIGRATIONS_PREFORK_CHECKS=True)
+    def test_maybe_install_detected(self):
+        with mock.patch.dict(sys.modules, {"gunicorn": ModuleType("gunicorn")}):
+            maybe_install_fork_hook()
+
+        self.mock_register.assert_called_once_with(before=prefork._before_fork)
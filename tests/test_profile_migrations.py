@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from django.test import TestCase
+
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, run_command, temp_migrations_module
+
+
+class ProfileMigrationsTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_second.py").write_text(empty_migration)
+
+    call_command = staticmethod(partial(run_command, "profile_migrations"))
+
+    def test_bad_app_label(self):
+        out, err, returncode = self.call_command("nonexistent")
+
+        assert out == ""
+        assert err == "No installed app with label 'nonexistent'.\n"
+        assert returncode == 2
+
+    def test_report(self):
+        out, err, returncode = self.call_command("testapp")
+
+        assert returncode == 0
+        lines = out.splitlines()
+        assert lines[0].startswith("Loaded ")
+        assert lines[1] == "Apps:"
+        assert lines[2].startswith("  testapp: ")
+        assert lines[2].endswith("ms, 2 migrations")
+        assert lines[3] == "Slowest migrations:"
+        assert sorted(line.split(":")[0] for line in lines[4:]) == [
+            "  testapp.0001_initial",
+            "  testapp.0002_second",
+        ]
+
+    def test_top(self):
+        out, err, returncode = self.call_command("testapp", "--top", "1")
+
+        assert returncode == 0
+        assert len(out.splitlines()) == 5
+
+    def test_output(self):
+        tmp_path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        output = tmp_path / "profile.json"
+
+        out, err, returncode = self.call_command("testapp", "--output", str(output))
+
+        assert returncode == 0
+        assert out.endswith(f"Wrote profile to {output}.\n")
+        profile = json.loads(output.read_text())
+        assert profile["apps"]["testapp"]["migrations"] == 2
+        assert sorted(item["name"] for item in profile["migrations"]) == [
+            "0001_initial",
+            "0002_second",
+        ]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+from django_linear_migrations.profiling import app_import_times, time_migration_imports
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, temp_migrations_module
+
+
+class TimeMigrationImportsTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+
+    def test_times_imports(self):
+        package_name = self.migrations_dir.name
+
+        with time_migration_imports() as timings:
+            MigrationLoader(None, ignore_no_migrations=True)
+
+        assert package_name in timings
+        assert f"{package_name}.0001_initial" in timings
+
+        totals = app_import_times(timings, ["testapp", "django_linear_migrations"])
+        assert totals == {
+            "testapp": (
+                timings[package_name] + timings[f"{package_name}.0001_initial"]
+            ),
+            "django_linear_migrations": timings["django_linear_migrations.migrations"],
+        }
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+from django.test import SimpleTestCase, override_settings
+
+from django_linear_migrations import apps as dlm_apps
+from django_linear_migrations.apps import (
+    LinearMigrationsError,
+    check_max_migration_files,
+    set_cached_result,
+)
+from django_linear_migrations.pytest_plugin import (
+    RESULT_PATH_KEY,
+    pytest_configure,
+    pytest_configure_node,
+    pytest_unconfigure,
+)
+from tests.compat import EnterContextMixin
+
+error = LinearMigrationsError(
+    "testapp's max_migration.txt points to non-existent migration '0002_b'.",
+    hint="Edit the max_migration.txt to contain the latest migration's name.",
+    id="dlm.E003",
+    app_label="testapp",
+    max_migration_name="0002_b",
+)
+
+
+def make_config(**attrs: Any) -> pytest.Config:
+    return cast(pytest.Config, SimpleNamespace(**attrs))
+
+
+class PytestPluginTests(EnterContextMixin, SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(set_cached_result, None)
+        self.tmp_path = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def test_controller(self):
+        config = make_config()
+
+        pytest_configure(config)
+
+        path = Path(config._linear_migrations_result_path)  # type: ignore [attr-defined]
+        assert json.loads(path.read_text()) == []
+        assert dlm_apps._cached_result == []
+
+        node = SimpleNamespace(config=config, workerinput={})
+        pytest_configure_node(node)
+        assert node.workerinput == {RESULT_PATH_KEY: str(path)}
+
+        pytest_unconfigure(config)
+        assert not path.exists()
+
+    def test_worker(self):
+        path = self.tmp_path / "result.json"
+        path.write_text(json.dumps([error.as_dict()]))
+        config = make_config(workerinput={RESULT_PATH_KEY: str(path)})
+
+        pytest_configure(config)
+
+        result = check_max_migration_files()
+        assert result == [error]
+        assert result[0].as_dict() == error.as_dict()
+
+    def test_worker_unreadable_result(self):
+        config = make_config(
+            workerinput={RESULT_PATH_KEY: str(self.tmp_path / "missing.json")}
+        )
+
+        pytest_configure(config)
+
+        assert dlm_apps._cached_result is None
+
+    def test_first_worker(self):
+        uid = f"test-{id(self)}"
+        shared_path = (
+            Path(tempfile.gettempdir()) / f"django-linear-migrations-{uid}.json"
+        )
+        first = make_config(workerinput={"testrunuid": uid})
+        self.addCleanup(pytest_unconfigure, first)
+        lock_file = self.tmp_path / "max.lock"
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=lock_file):
+            pytest_configure(first)
+            assert json.loads(shared_path.read_text()) == []
+
+            shared_path.write_text(json.dumps([error.as_dict()]))
+            pytest_configure(make_config(workerinput={"testrunuid": uid}))
+
+            assert dlm_apps._cached_result == [error]
+
+    def test_full_check_ignores_cached_result(self):
+        set_cached_result([error])
+
+        assert check_max_migration_files(full=True) == []
+
+    def test_setting_change_resets_cached_result(self):
+        set_cached_result([error])
+
+        with override_settings(LINEAR_MIGRATIONS_SHARD=None):
+            assert dlm_apps._cached_result is None
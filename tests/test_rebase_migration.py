@@ -478,6 +478,202 @@ class RebaseMigrationsTests(TestCase):
             """
         )
 
+    def test_success_updates_references(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_longer_titles.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations
+
+            class Migration(migrations.Migration):
+                dependencies = [('testapp', '0001_initial')]
+            """
+            )
+        )
+        (self.migrations_dir / "0002_author_nicknames.py").touch()
+        (self.migrations_dir / "more_titles.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations
+
+            class Migration(migrations.Migration):
+                dependencies = [("testapp", "0002_longer_titles")]
+                operations = []
+            """
+            )
+        )
+        (self.migrations_dir / "max_migration.txt").write_text(
+            dedent(
+                """\
+            <<<<<<< HEAD
+            0002_author_nicknames
+            =======
+            0002_longer_titles
+            >>>>>>> 123456789 (Increase Book title length)
+            """
+            )
+        )
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert out == (
+            "Renamed 0002_longer_titles.py to 0003_longer_titles.py,"
+            + " updated its dependencies, and updated max_migration.txt.\n"
+            + "Updated the reference to 0002_longer_titles in"
+            + " testapp.more_titles.\n"
+        )
+        assert returncode == 0
+        assert (self.migrations_dir / "more_titles.py").read_text() == dedent(
+            """\
+            from django.db import migrations
+
+            class Migration(migrations.Migration):
+                dependencies = [("testapp", "0003_longer_titles")]
+                operations = []
+            """
+        )
+
+    def write_dry_run_migrations(self) -> None:
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        for name in ("0002_author_nicknames", "0002_longer_titles"):
+            (self.migrations_dir / f"{name}.py").write_text(
+                dedent(
+                    """\
+                from django.db import migrations
+
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', '0001_initial')]
+                """
+                )
+            )
+        (self.migrations_dir / "max_migration.txt").write_text(
+            dedent(
+                """\
+            <<<<<<< HEAD
+            0002_author_nicknames
+            =======
+            0002_longer_titles
+            >>>>>>> 123456789 (Increase Book title length)
+            """
+            )
+        )
+
+    def test_success_skips_used_number(self):
+        self.write_dry_run_migrations()
+        # From a third branch, already merged
+        (self.migrations_dir / "0003_other.py").write_text(empty_migration)
+
+        out, err, returncode = self.call_command("testapp")
+
+        assert out.startswith("Renamed 0002_longer_titles.py to 0004_longer_titles.py,")
+        assert returncode == 0
+        assert (self.migrations_dir / "0004_longer_titles.py").exists()
+
+    def test_dry_run(self):
+        self.write_dry_run_migrations()
+
+        out, err, returncode = self.call_command("testapp", "--dry-run")
+
+        assert out.splitlines() == [
+            "Would rename 0002_longer_titles.py to 0003_longer_titles.py,"
+            + " update its dependencies, and update max_migration.txt.",
+            "--- 0002_longer_titles.py",
+            "+++ 0003_longer_titles.py",
+            "@@ -1,4 +1,4 @@",
+            " from django.db import migrations",
+            " ",
+            " class Migration(migrations.Migration):",
+            "-    dependencies = [('testapp', '0001_initial')]",
+            "+    dependencies = [('testapp', '0002_author_nicknames')]",
+            "--- max_migration.txt",
+            "+++ max_migration.txt",
+            "@@ -1,5 +1 @@",
+            "-<<<<<<< HEAD",
+            "-0002_author_nicknames",
+            "-=======",
+            "-0002_longer_titles",
+            "->>>>>>> 123456789 (Increase Book title length)",
+            "+0003_longer_titles",
+            "After the rebase, testapp's migration history would be linear, with"
+            + " 0003_longer_titles as its latest migration.",
+        ]
+        assert returncode == 0
+        assert (self.migrations_dir / "0002_longer_titles.py").exists()
+        assert not (self.migrations_dir / "0003_longer_titles.py").exists()
+        assert "<<<<<<<" in (self.migrations_dir / "max_migration.txt").read_text()
+
+    def test_check_problem(self):
+        self.write_dry_run_migrations()
+        # Another conflicting migration, which the rebase won't fix
+        (self.migrations_dir / "0002_other.py").write_text(
+            (self.migrations_dir / "0002_author_nicknames.py").read_text()
+        )
+
+        out, err, returncode = self.call_command("testapp", "--check")
+
+        assert out.endswith(
+            "After the rebase, testapp would still have conflicting migrations:"
+            + " 0002_other, 0003_longer_titles.\n"
+        )
+        assert returncode == 1
+        assert (self.migrations_dir / "0002_longer_titles.py").exists()
+
+    def test_check_unparseable(self):
+        self.write_dry_run_migrations()
+        (self.migrations_dir / "0002_other.py").write_text("def (")
+
+        with pytest.raises(CommandError) as excinfo:
+            self.call_command("testapp", "--check")
+
+        assert excinfo.value.args[0] == (
+            "Could not simulate the rebase: Could not parse migration"
+            + " testapp.0002_other."
+        )
+
+    def test_success_lock_file(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+        (self.migrations_dir / "0002_longer_titles.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations
+
+            class Migration(migrations.Migration):
+                dependencies = [
+                    ('testapp', '0001_initial'),
+                ]
+                operations = []
+            """
+            )
+        )
+        (self.migrations_dir / "0002_author_nicknames.py").touch()
+        lock_file = self.migrations_dir.parent / "max_migrations.lock"
+        lock_file.write_text(
+            dedent(
+                """\
+            <<<<<<< HEAD
+            testapp: 0002_author_nicknames
+            =======
+            testapp: 0002_longer_titles
+            >>>>>>> 123456789 (Increase Book title length)
+            """
+            )
+        )
+
+        with override_settings(LINEAR_MIGRATIONS_LOCK_FILE=str(lock_file)):
+            out, err, returncode = self.call_command("testapp")
+
+        assert out == (
+            "Renamed 0002_longer_titles.py to 0003_longer_titles.py,"
+            + " updated its dependencies, and updated max_migrations.lock entry.\n"
+        )
+        assert err == ""
+        assert returncode == 0
+        assert lock_file.read_text() == "testapp: 0003_longer_titles\n"
+        assert not (self.migrations_dir / "max_migration.txt").exists()
+
     def test_success_dependencies_tuple(self):
         (self.migrations_dir / "__init__.py").touch()
         (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+from django.test import SimpleTestCase, TestCase
+
+from django_linear_migrations.references import (
+    ReferenceIndex,
+    rename_references,
+)
+from tests.compat import EnterContextMixin
+from tests.utils import empty_migration, temp_migrations_module
+
+
+class RenameReferencesTests(SimpleTestCase):
+    def test_all_attributes(self):
+        source = dedent(
+            """\
+            from django.db import migrations
+            class Migration(migrations.Migration):
+                dependencies = [('books', '0002_titles'), ("authors", "0002_titles")]
+                replaces: list = [("books", "0002_titles")]
+                run_before = (
+                    ["books", "0002_titles"],
+                )
+            """
+        ).encode()
+
+        result = rename_references(source, ("books", "0002_titles"), "0003_titles")
+
+        assert (
+            result
+            == dedent(
+                """\
+            from django.db import migrations
+            class Migration(migrations.Migration):
+                dependencies = [('books', '0003_titles'), ("authors", "0002_titles")]
+                replaces: list = [("books", "0003_titles")]
+                run_before = (
+                    ["books", "0003_titles"],
+                )
+            """
+            ).encode()
+        )
+
+    def test_non_ascii(self):
+        source = dedent(
+            """\
+            from django.db import migrations
+            class Migration(migrations.Migration):
+                dependencies = ["é", ('books', '0002_titles')]; x = "ü"
+            """
+        ).encode()
+
+        result = rename_references(source, ("books", "0002_titles"), "0003_titles")
+
+        assert result == source.replace(b"0002_titles", b"0003_titles")
+
+    def test_no_references(self):
+        source = empty_migration.encode()
+
+        result = rename_references(source, ("books", "0002_titles"), "0003_titles")
+
+        assert result is source
+
+
+class ReferenceIndexTests(EnterContextMixin, TestCase):
+    def setUp(self):
+        self.migrations_dir = self.enterContext(temp_migrations_module())
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(empty_migration)
+
+    def write_second(self, dependency: str) -> None:
+        (self.migrations_dir / "0002_second.py").write_text(
+            dedent(
+                f"""\
+                from django.db import migrations
+                class Migration(migrations.Migration):
+                    dependencies = [('testapp', {dependency!r})]
+                """
+            )
+        )
+
+    def test_build(self):
+        self.write_second("0001_initial")
+        (self.migrations_dir / "0003_broken.py").write_text("def (")
+
+        index = ReferenceIndex.build()
+
+        assert index.referencing(("testapp", "0001_initial")) == {
+            self.migrations_dir / "0002_second.py": ("testapp", "0002_second")
+        }
+        assert index.referencing(("testapp", "0002_second")) == {}
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+
+from django_linear_migrations.graph import CompactGraph, Key
+from django_linear_migrations.squashing import SquashPlan, plan_squashes
+
+
+def chain(app_label: str, count: int) -> list[Key]:
+    return [(app_label, f"{number:04}_m") for number in range(1, count + 1)]
+
+
+def chain_edges(keys: list[Key]) -> list[tuple[Key, Key]]:
+    return list(zip(keys[1:], keys[:-1]))
+
+
+class PlanSquashesTests(SimpleTestCase):
+    def test_whole_app(self):
+        keys = chain("alpha", 4)
+        graph = CompactGraph(keys, chain_edges(keys))
+
+        plans = plan_squashes(graph, ["alpha"])
+
+        assert plans == [
+            SquashPlan(
+                app_label="alpha",
+                migrations=4,
+                seconds=0.0,
+                start="0001_m",
+                end="0004_m",
+                squashed=4,
+                reason=None,
+            )
+        ]
+
+    def test_after_squashed(self):
+        keys = [("alpha", "0001_squashed_0002_m"), *chain("alpha", 5)[2:]]
+        graph = CompactGraph(keys, chain_edges(keys))
+
+        plans = plan_squashes(
+            graph, ["alpha"], replacing=[("alpha", "0001_squashed_0002_m")]
+        )
+
+        assert plans[0].start == "0003_m"
+        assert plans[0].end == "0005_m"
+        assert plans[0].squashed == 3
+
+    def test_min_migrations(self):
+        keys = chain("alpha", 3)
+        graph = CompactGraph(keys, chain_edges(keys))
+
+        plans = plan_squashes(graph, ["alpha"], min_migrations=4)
+
+        assert plans[0].start is None
+        assert plans[0].reason == "fewer than 4 migrations to squash"
+
+    def test_conflicts(self):
+        keys = [("alpha", "0001_m"), ("alpha", "0002_a"), ("alpha", "0002_b")]
+        graph = CompactGraph(
+            keys,
+            [(("alpha", "0002_a"), keys[0]), (("alpha", "0002_b"), keys[0])],
+        )
+
+        plans = plan_squashes(graph, ["alpha"])
+
+        assert plans[0].reason == "it has conflicting migrations"
+
+    def test_stops_before_cross_app_cycle(self):
+        alpha = chain("alpha", 4)
+        beta = chain("beta", 1)
+        # alpha 0003 depends on beta 0001, which depends on alpha 0001.
+        edges = [
+            *chain_edges(alpha),
+            (alpha[2], beta[0]),
+            (beta[0], alpha[0]),
+        ]
+        graph = CompactGraph(alpha + beta, edges)
+
+        plans = plan_squashes(graph, ["alpha"])
+
+        assert plans[0].start == "0001_m"
+        assert plans[0].end == "0002_m"
+
+    def test_cross_app_dependency_reason(self):
+        alpha = chain("alpha", 2)
+        beta = chain("beta", 1)
+        edges = [*chain_edges(alpha), (alpha[1], beta[0]), (beta[0], alpha[0])]
+        graph = CompactGraph(alpha + beta, edges)
+
+        plans = plan_squashes(graph, ["alpha"])
+
+        assert plans[0].reason == (
+            "0002_m depends on its earlier migrations through another app"
+        )
+
+    def test_ranked_by_cost(self):
+        alpha = chain("alpha", 2)
+        beta = chain("beta", 3)
+        graph = CompactGraph(alpha + beta, chain_edges(alpha) + chain_edges(beta))
+
+        plans = plan_squashes(
+            graph, ["alpha", "beta"], costs={"alpha": 0.5, "beta": 0.1}
+        )
+
+        assert [plan.app_label for plan in plans] == ["alpha", "beta"]
+        assert plans[0].seconds == 0.5
+
+    def test_ranked_by_count(self):
+        alpha = chain("alpha", 2)
+        beta = chain("beta", 3)
+        graph = CompactGraph(alpha + beta, chain_edges(alpha) + chain_edges(beta))
+
+        plans = plan_squashes(graph, ["alpha", "beta"])
+
+        assert [plan.app_label for plan in plans] == ["beta", "alpha"]
+
+    def test_respects_earlier_squashes(self):
+        alpha = chain("alpha", 2)
+        beta = chain("beta", 2)
+        # Squashing both apps would make the squashes depend on each other.
+        edges = [
+            *chain_edges(alpha),
+            *chain_edges(beta),
+            (alpha[1], beta[0]),
+            (beta[1], alpha[0]),
+        ]
+        graph = CompactGraph(alpha + beta, edges)
+
+        plans = plan_squashes(graph, ["alpha", "beta"], costs={"alpha": 1.0})
+
+        assert plans[0].app_label == "alpha"
+        assert plans[0].squashed == 2
+        assert plans[1].app_label == "beta"
+        assert plans[1].reason == (
+            "0002_m depends on its earlier migrations through another app"
+        )
+
+    def test_unknown_app(self):
+        keys = chain("alpha", 2)
+        graph = CompactGraph(keys, chain_edges(keys))
+
+        assert plan_squashes(graph, ["beta"]) == []
@@ -105,6 +105,58 @@ class SquashMigrationsTests(EnterContextMixin, TestCase):
         assert returncode == 0
         assert max_migration_txt.read_text() == "0001_squashed_0002_second\n"
 
+    def test_success_partial(self):
+        (self.migrations_dir / "__init__.py").touch()
+        (self.migrations_dir / "0001_initial.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations, models
+
+
+            class Migration(migrations.Migration):
+                initial = True
+                dependencies = []
+                operations = []
+            """
+            )
+        )
+        (self.migrations_dir / "0002_second.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations, models
+
+
+            class Migration(migrations.Migration):
+                dependencies = [
+                    ('testapp', '0001_initial'),
+                ]
+                operations = []
+            """
+            )
+        )
+        (self.migrations_dir / "0003_third.py").write_text(
+            dedent(
+                """\
+            from django.db import migrations, models
+
+
+            class Migration(migrations.Migration):
+                dependencies = [
+                    ('testapp', '0002_second'),
+                ]
+                operations = []
+            """
+            )
+        )
+        max_migration_txt = self.migrations_dir / "max_migration.txt"
+        max_migration_txt.write_text("0003_third\n")
+
+        out, err, returncode = self.call_command("testapp", "0002", "--no-input")
+
+        assert returncode == 0
+        assert (self.migrations_dir / "0001_squashed_0002_second.py").exists()
+        assert max_migration_txt.read_text() == "0003_third\n"
+
     @override_settings(FIRST_PARTY_APPS=[])
     def test_skip_non_first_party_app(self):
         (self.migrations_dir / "__init__.py").touch()
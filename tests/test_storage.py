@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from textwrap import dedent
+
+from django.test import SimpleTestCase
+
+from django_linear_migrations.storage import LockFileStore, parse_lock_file
+
+
+class ParseLockFileTests(SimpleTestCase):
+    def test_empty(self):
+        assert parse_lock_file("") == {}
+
+    def test_entries(self):
+        content = dedent(
+            """\
+            # Comment
+            authors: 0001_initial
+            books: 0002_author_nicknames
+
+            """
+        )
+
+        assert parse_lock_file(content) == {
+            "authors": ["0001_initial"],
+            "books": ["0002_author_nicknames"],
+        }
+
+    def test_conflict(self):
+        content = dedent(
+            """\
+            authors: 0001_initial
+            <<<<<<< HEAD
+            books: 0002_author_nicknames
+            =======
+            books: 0002_longer_titles
+            >>>>>>> 123456789 (Increase Book title length)
+            """
+        )
+
+        assert parse_lock_file(content) == {
+            "authors": ["0001_initial"],
+            "books": [
+                "<<<<<<< HEAD",
+                "0002_author_nicknames",
+                "=======",
+                "0002_longer_titles",
+                ">>>>>>> 123456789 (Increase Book title length)",
+            ],
+        }
+
+    def test_conflict_diff3_one_side_only(self):
+        content = dedent(
+            """\
+            <<<<<<< HEAD
+            authors: 0002_pen_names
+            books: 0001_initial
+            ||||||| base
+            authors: 0001_initial
+            =======
+            authors: 0002_birthdays
+            >>>>>>> 123456789
+            """
+        )
+
+        assert parse_lock_file(content) == {
+            "authors": [
+                "<<<<<<< HEAD",
+                "0002_pen_names",
+                "=======",
+                "0002_birthdays",
+                ">>>>>>> 123456789",
+            ],
+            "books": ["0001_initial"],
+        }
+
+
+class LockFileStoreTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "max_migrations.lock"
+        self.store = LockFileStore(self.path)
+
+    def test_write_creates_sorted(self):
+        self.store.write_many(
+            {
+                "books": (self.path.parent, "0001_initial"),
+                "authors": (self.path.parent, "0003_pen_names"),
+            }
+        )
+        self.store.write("comments", self.path.parent, "0001_initial")
+
+        assert self.path.read_text() == (
+            "authors: 0003_pen_names\nbooks: 0001_initial\ncomments: 0001_initial\n"
+        )
+        assert self.store.read_lines("books", self.path.parent) == ["0001_initial"]
+        assert self.store.read_lines("missing", self.path.parent) is None
+
+    def test_write_resolves_conflict(self):
+        self.path.write_text(
+            dedent(
+                """\
+                authors: 0001_initial
+                <<<<<<< HEAD
+                books: 0002_author_nicknames
+                =======
+                books: 0002_longer_titles
+                >>>>>>> 123456789
+                comments: 0001_initial
+                """
+            )
+        )
+
+        self.store.write("books", self.path.parent, "0003_longer_titles")
+
+        assert self.path.read_text() == (
+            "authors: 0001_initial\nbooks: 0003_longer_titles\ncomments: 0001_initial\n"
+        )
+
+    def test_write_keeps_other_conflicts(self):
+        content = dedent(
+            """\
+            <<<<<<< HEAD
+            authors: 0002_a
+            books: 0002_b
+            =======
+            authors: 0002_c
+            books: 0002_d
+            >>>>>>> 123456789
+            """
+        )
+        self.path.write_text(content)
+
+        self.store.write("books", self.path.parent, "0003_d")
+
+        assert self.path.read_text() == dedent(
+            """\
+            <<<<<<< HEAD
+            authors: 0002_a
+            =======
+            authors: 0002_c
+            >>>>>>> 123456789
+            books: 0003_d
+            """
+        )
+
+    def test_write_before_conflict(self):
+        self.path.write_text(
+            dedent(
+                """\
+                <<<<<<< HEAD
+                books: 0002_b
+                =======
+                books: 0002_d
+                >>>>>>> 123456789
+                """
+            )
+        )
+
+        self.store.write("authors", self.path.parent, "0001_initial")
+
+        assert self.path.read_text().startswith("authors: 0001_initial\n<<<<<<<")
+
+    def test_delete_last_removes_file(self):
+        self.store.write("books", self.path.parent, "0001_initial")
+
+        self.store.delete("books", self.path.parent)
+
+        assert not self.path.exists()